@@ -2,12 +2,108 @@
 AI-powered job matching and resume optimization
 Uses machine learning to match jobs with user profile and optimize applications
 """
+import os
 import re
 import json
-from typing import List, Dict, Any, Tuple, Optional
+import heapq
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Iterator, FrozenSet, Union, TypeVar
 from dataclasses import dataclass
 import logging
-from datetime import datetime
+
+from database import canonical_job_key
+from keyword_automaton import KeywordAutomaton, tokenize
+from requirements_cache import RequirementsCache
+from relevance_model import BM25RelevanceModel
+from skill_taxonomy import SkillTaxonomy, TaxonomySource, DEFAULT_TAXONOMY_PATH
+
+
+# Bump when extract_job_requirements output changes so cached parses are not reused
+REQUIREMENTS_PARSER_VERSION = 4
+
+# Requirement patterns, compiled once and fused so each field is a single
+# scan of the lower-cased description
+EXPERIENCE_PATTERN = re.compile(r"""
+    (?:minimum|at\s*least)\s*(?P<bounded>\d+)\s*years?             # minimum 3 years, at least 3 years
+  | (?P<years>\d+)\+?\s*years?\s*(?:(?:of\s*)?experience|in)       # 3+ years of experience, 3 years in
+""", re.VERBOSE)
+
+LOCATION_PATTERN = re.compile(r"""
+    (?:located\s+in|based\s+in|headquartered\s+in|in|at)\s+
+    (?P<location>[a-zA-Z\s,]+?)(?:\s|,|\.|$)
+""", re.VERBOSE)
+
+_SALARY_AMOUNT = r"\d+(?:,\d{3})*(?:\.\d+)?k?\+?"
+# Anchored on '$' so the scan can skip ahead to candidate amounts
+SALARY_PATTERN = re.compile(rf"""
+    \$(?P<low>{_SALARY_AMOUNT})
+    (?:\s*(?:-|to|–)\s*\$(?P<high>{_SALARY_AMOUNT}))?
+    (?:\s*(?:/\s*|per\s+|an?\s+)(?P<unit>hour|hr|year|yr|annum|month|mo)\b
+      |\s*(?P<adverb>hourly|annually|yearly|monthly))?
+""", re.VERBOSE)
+# A label directly before an amount ("salary: $95,000"), matched against the preceding text
+SALARY_LABEL_PATTERN = re.compile(r"(?P<label>salary|compensation)[:\s]*$")
+SALARY_LABEL_WINDOW = 40
+
+# Salary periods and how many of each make a working year
+SALARY_PERIODS = {
+    'hour': 2080, 'hr': 2080, 'hourly': 2080,
+    'month': 12, 'mo': 12, 'monthly': 12,
+    'year': 1, 'yr': 1, 'annum': 1, 'annually': 1, 'yearly': 1
+}
+# Unlabelled amounts below this are taken to be hourly rates
+HOURLY_RATE_CEILING = 500
+
+
+def _salary_amount(text: str) -> float:
+    """'85,000' -> 85000.0, '120k' -> 120000.0"""
+    text = text.rstrip('+')
+    multiplier = 1000 if text.endswith('k') else 1
+    return float(text.rstrip('k').replace(',', '')) * multiplier
+
+
+def salary_label(match: 're.Match') -> Optional['re.Match']:
+    """The 'salary'/'compensation' label right before a SALARY_PATTERN match, if any"""
+    window_start = max(match.start() - SALARY_LABEL_WINDOW, 0)
+    return SALARY_LABEL_PATTERN.search(match.string, window_start, match.start())
+
+
+def parse_salary(match: 're.Match', label: Optional['re.Match'] = None) -> Dict[str, Any]:
+    """Normalise a SALARY_PATTERN match to yearly numbers.
+    
+    Returns the matched text as salary_range (from its label, if given,
+    through the last amount, without the pay period) plus salary_min and
+    salary_max per year and the stated or inferred pay period; an
+    open-ended amount ('120k+', '$120,000+') has no max.
+    """
+    low = _salary_amount(match.group('low'))
+    high_text = match.group('high')
+    high = _salary_amount(high_text) if high_text else None
+    if high is None and not match.group('low').endswith('+'):
+        high = low
+    
+    unit = match.group('unit') or match.group('adverb')
+    if unit:
+        per_year = SALARY_PERIODS[unit]
+    else:
+        per_year = SALARY_PERIODS['hour'] if max(low, high or 0) < HOURLY_RATE_CEILING else 1
+    period = {2080: 'hour', 12: 'month', 1: 'year'}[per_year]
+    
+    start = label.start() if label is not None else match.start()
+    end = match.end('high') if high_text else match.end('low')
+    return {
+        'salary_range': match.string[start:end].strip(),
+        'salary_min': round(low * per_year),
+        'salary_max': round(high * per_year) if high is not None else None,
+        'salary_period': period
+    }
+
+
+# 'weighted': share of required skills the profile has (default)
+# 'bm25': share of the description's BM25 skill weight the profile covers
+SCORING_MODES = ('weighted', 'bm25')
 
 
 @dataclass
@@ -34,141 +130,280 @@ class UserProfile:
     company_size_preference: str  # startup, medium, large, enterprise
 
 
+@dataclass(frozen=True)
+class CompiledProfile:
+    """Lookup-ready form of a UserProfile, built once and reused for every job.
+    
+    Skills are a lower-cased set so each required skill is an O(1) lookup,
+    locations and industries are lower-cased and education is pre-joined,
+    so scoring never re-lowers profile fields.
+    """
+    __slots__ = ('profile', 'skills', 'education_text', 'locations', 'industries',
+                 'experience_years', 'remote_preference')
+    
+    profile: UserProfile
+    skills: FrozenSet[str]
+    education_text: str
+    locations: Tuple[str, ...]
+    industries: Tuple[str, ...]
+    experience_years: int
+    remote_preference: bool
+    
+    @classmethod
+    def from_profile(cls, profile: Union[UserProfile, 'CompiledProfile']) -> 'CompiledProfile':
+        """Compile a UserProfile (an already compiled profile is returned as is)"""
+        if isinstance(profile, CompiledProfile):
+            return profile
+        return cls(
+            profile=profile,
+            skills=frozenset(skill.lower() for skill in profile.skills),
+            education_text=' '.join(edu.lower() for edu in profile.education),
+            locations=tuple(loc.lower() for loc in profile.preferred_locations),
+            industries=tuple(industry.lower() for industry in profile.preferred_industries),
+            experience_years=profile.experience_years,
+            remote_preference=profile.remote_preference
+        )
+    
+    def __reduce__(self):
+        # Frozen slotted instances cannot be restored attribute by attribute;
+        # recompile from the source profile instead (e.g. for process pools)
+        return CompiledProfile.from_profile, (self.profile,)
+
+
+T = TypeVar('T')
+
+
+def top_k_by_score(scored_items: Iterable[Tuple[float, T]], k: int) -> List[T]:
+    """The k highest-scoring items from a stream of (score, item) pairs, best first.
+    
+    Keeps a min-heap of at most k entries, so memory is O(k) and each item
+    costs O(log k) however long the stream is. Ties go to the earlier item.
+    """
+    if k <= 0:
+        return []
+    heap: List[Tuple[float, int, T]] = []
+    for index, (score, item) in enumerate(scored_items):
+        # -index makes the later of two equal scores the smaller heap entry
+        entry = (score, -index, item)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    return [item for _, _, item in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+# Job listing keys read by AIJobMatcher.match_job_data
+MATCH_JOB_FIELDS = ('title', 'company', 'description', 'job_url')
+
+# Per-process state for AIJobMatcher.match_jobs workers
+_worker_matcher = None
+_worker_profile = None
+
+
+def _init_match_worker(user_profile: Union[UserProfile, CompiledProfile], scoring_mode: str = 'weighted',
+                       relevance_model: Optional[BM25RelevanceModel] = None,
+                       taxonomy: Optional[SkillTaxonomy] = None):
+    """Build one matcher per worker process; the profile is sent only once"""
+    global _worker_matcher, _worker_profile
+    _worker_matcher = AIJobMatcher(scoring_mode=scoring_mode, relevance_model=relevance_model, taxonomy=taxonomy)
+    _worker_profile = CompiledProfile.from_profile(user_profile)
+
+
+def _job_fields(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Keep only the fields scoring needs, so listings holding WebElements still pickle"""
+    return [{field: job.get(field, '') for field in MATCH_JOB_FIELDS} for job in jobs]
+
+
+def _match_job_chunk(jobs: List[Dict[str, Any]]) -> List[JobMatch]:
+    """Score a chunk of jobs inside a worker process"""
+    return [_worker_matcher.match_job_data(_worker_profile, job) for job in jobs]
+
+
 class AIJobMatcher:
     """AI-powered job matching and optimization"""
     
-    def __init__(self):
+    def __init__(self, requirements_cache: Optional[RequirementsCache] = None, scoring_mode: str = 'weighted',
+                 relevance_model: Optional[BM25RelevanceModel] = None,
+                 taxonomy: Optional[Union[SkillTaxonomy, TaxonomySource, str]] = None):
+        if scoring_mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode '{scoring_mode}', expected one of {', '.join(SCORING_MODES)}")
         self.logger = logging.getLogger(__name__)
-        self.skill_keywords = self._load_skill_keywords()
-        self.industry_keywords = self._load_industry_keywords()
-        self.company_size_keywords = self._load_company_size_keywords()
+        self.scoring_mode = scoring_mode
+        # Keywords come from the shared, hot-reloaded taxonomy file unless a
+        # fixed taxonomy, a source or another taxonomy file path is given
+        self._taxonomy = taxonomy if isinstance(taxonomy, SkillTaxonomy) else None
+        if self._taxonomy is not None:
+            self._taxonomy_source = None
+        elif isinstance(taxonomy, TaxonomySource):
+            self._taxonomy_source = taxonomy
+        else:
+            self._taxonomy_source = TaxonomySource.shared(taxonomy or DEFAULT_TAXONOMY_PATH)
+        self.requirements_cache = requirements_cache if requirements_cache is not None else RequirementsCache()
+        self.relevance_model = relevance_model
+        if self.relevance_model is None and scoring_mode == 'bm25':
+            # Corpus statistics persist wherever parsed requirements do
+            self.relevance_model = BM25RelevanceModel(self.skill_vocabulary(), store=self.requirements_cache.store)
+        # Taxonomy whose skills the relevance model was last extended with
+        self._relevance_fingerprint: Optional[str] = None
     
-    def _load_skill_keywords(self) -> Dict[str, List[str]]:
-        """Load skill keywords for different categories"""
-        return {
-            'programming': [
-                'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'rust',
-                'php', 'ruby', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'sql'
-            ],
-            'data_science': [
-                'machine learning', 'deep learning', 'artificial intelligence', 'ai',
-                'data analysis', 'statistics', 'pandas', 'numpy', 'scikit-learn',
-                'tensorflow', 'pytorch', 'keras', 'spark', 'hadoop', 'tableau',
-                'power bi', 'excel', 'r', 'python', 'sql'
-            ],
-            'web_development': [
-                'html', 'css', 'javascript', 'react', 'angular', 'vue', 'node.js',
-                'express', 'django', 'flask', 'spring', 'laravel', 'php', 'ruby on rails',
-                'api', 'rest', 'graphql', 'microservices', 'docker', 'kubernetes'
-            ],
-            'cloud': [
-                'aws', 'azure', 'gcp', 'google cloud', 'amazon web services',
-                'docker', 'kubernetes', 'terraform', 'ansible', 'jenkins',
-                'ci/cd', 'devops', 'microservices', 'serverless', 'lambda'
-            ],
-            'databases': [
-                'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
-                'oracle', 'sql server', 'sqlite', 'cassandra', 'dynamodb'
-            ],
-            'soft_skills': [
-                'leadership', 'communication', 'teamwork', 'problem solving',
-                'project management', 'agile', 'scrum', 'mentoring', 'presentation'
-            ]
-        }
+    @property
+    def taxonomy(self) -> SkillTaxonomy:
+        """The keyword taxonomy in use (the latest version of a reloadable file)"""
+        if self._taxonomy_source is not None:
+            return self._taxonomy_source.current()
+        return self._taxonomy
     
-    def _load_industry_keywords(self) -> Dict[str, List[str]]:
-        """Load industry-specific keywords"""
-        return {
-            'technology': ['software', 'tech', 'it', 'computer', 'digital', 'cyber'],
-            'finance': ['banking', 'financial', 'fintech', 'investment', 'trading'],
-            'healthcare': ['medical', 'health', 'pharmaceutical', 'biotech', 'clinical'],
-            'retail': ['e-commerce', 'retail', 'consumer', 'shopping', 'marketplace'],
-            'education': ['education', 'learning', 'training', 'academic', 'university'],
-            'manufacturing': ['manufacturing', 'production', 'industrial', 'automation'],
-            'consulting': ['consulting', 'advisory', 'strategy', 'management']
-        }
+    @property
+    def skill_keywords(self) -> Dict[str, List[str]]:
+        """Skill keywords by category"""
+        return self.taxonomy.skill_keywords
     
-    def _load_company_size_keywords(self) -> Dict[str, List[str]]:
-        """Load company size indicators"""
-        return {
-            'startup': ['startup', 'early stage', 'seed', 'series a', 'small team'],
-            'medium': ['mid-size', 'growing', 'established', 'medium'],
-            'large': ['large', 'enterprise', 'fortune 500', 'multinational'],
-            'enterprise': ['enterprise', 'fortune 500', 'global', 'multinational', 'corporate']
-        }
+    @property
+    def industry_keywords(self) -> Dict[str, List[str]]:
+        """Industry-specific keywords"""
+        return self.taxonomy.industry_keywords
+    
+    @property
+    def company_size_keywords(self) -> Dict[str, List[str]]:
+        """Company size indicators"""
+        return self.taxonomy.company_size_keywords
+    
+    @property
+    def education_keywords(self) -> List[str]:
+        """Education requirement keywords"""
+        return self.taxonomy.education_keywords
+    
+    @property
+    def remote_indicators(self) -> List[str]:
+        """Remote work indicators"""
+        return self.taxonomy.remote_indicators
+    
+    @property
+    def keyword_automaton(self) -> KeywordAutomaton:
+        """Automaton over every keyword and alias of the taxonomy"""
+        return self.taxonomy.keyword_automaton
+    
+    @staticmethod
+    def _cache_namespace(taxonomy: SkillTaxonomy) -> str:
+        """Identify the parser version and keyword set that produced a cached parse"""
+        return RequirementsCache.key(json.dumps([REQUIREMENTS_PARSER_VERSION, taxonomy.fingerprint]))
+    
+    @property
+    def cache_namespace(self) -> str:
+        """Cache namespace of the current taxonomy"""
+        return self._cache_namespace(self.taxonomy)
+    
+    @staticmethod
+    def _skill_vocabulary(taxonomy: SkillTaxonomy) -> List[str]:
+        return sorted({skill for skills in taxonomy.skill_keywords.values() for skill in skills})
+    
+    def skill_vocabulary(self) -> List[str]:
+        """Every distinct skill keyword"""
+        return self._skill_vocabulary(self.taxonomy)
+    
+    def scan_keywords(self, job_description: str) -> Counter:
+        """Count whole-word occurrences of every known keyword in one pass"""
+        return self.keyword_automaton.count(job_description)
     
     def extract_job_requirements(self, job_description: str) -> Dict[str, Any]:
-        """Extract requirements and keywords from job description"""
+        """Extract requirements and keywords from job description.
+        
+        Results are memoised by a hash of the description, so a posting seen
+        again (while listing, filling forms or on a later run) is not
+        re-parsed. Nested values are shared with the cache; do not mutate.
+        """
+        # One taxonomy version for the cache key and the parse, even mid-reload
+        taxonomy = self.taxonomy
         job_desc_lower = job_description.lower()
+        key = RequirementsCache.key(job_description, self._cache_namespace(taxonomy))
+        requirements = self.requirements_cache.get_or_compute(
+            key, lambda: self._parse_job_requirements(job_description, taxonomy, job_desc_lower))
+        if self.relevance_model is not None:
+            if taxonomy.fingerprint != self._relevance_fingerprint:
+                # Score skills a reloaded taxonomy added
+                self.relevance_model.extend_vocabulary(self._skill_vocabulary(taxonomy))
+                self._relevance_fingerprint = taxonomy.fingerprint
+            # Each distinct description is counted once in the corpus statistics,
+            # whichever parser version or taxonomy parsed it
+            self.relevance_model.add_document(RequirementsCache.key(job_description),
+                                              requirements['word_count'], requirements['skill_counts'])
+        # The description itself is not cached; it is the lookup key. The
+        # lowered copy serves free-text checks for every profile scored.
+        return dict(requirements, full_text=job_description, full_text_lower=job_desc_lower)
+    
+    def _parse_job_requirements(self, job_description: str, taxonomy: Optional[SkillTaxonomy] = None,
+                                job_desc_lower: Optional[str] = None) -> Dict[str, Any]:
+        """Parse requirements from a job description (uncached)"""
+        taxonomy = taxonomy or self.taxonomy
+        if job_desc_lower is None:
+            job_desc_lower = job_description.lower()
+        tokens = tokenize(job_description)
+        keyword_counts = taxonomy.keyword_automaton.count_tokens(tokens)
+        
+        # Extract skills (keeping keyword list order)
+        found_skills = {
+            category: [skill for skill in skills if ('skills', category, skill) in keyword_counts]
+            for category, skills in taxonomy.skill_keywords.items()
+        }
+        skill_counts = {}
+        for (group, _, term), count in keyword_counts.items():
+            if group == 'skills':
+                skill_counts[term] = count
         
-        # Extract skills
-        found_skills = {}
-        for category, skills in self.skill_keywords.items():
-            found_skills[category] = []
-            for skill in skills:
-                if skill in job_desc_lower:
-                    found_skills[category].append(skill)
+        industries = [industry for industry, terms in taxonomy.industry_keywords.items()
+                      if any(('industries', industry, term) in keyword_counts for term in terms)]
+        company_sizes = [size for size, terms in taxonomy.company_size_keywords.items()
+                         if any(('company_size', size, term) in keyword_counts for term in terms)]
         
         # Extract experience requirements
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\+?\s*years?\s*in',
-            r'minimum\s*(\d+)\s*years?',
-            r'at\s*least\s*(\d+)\s*years?'
-        ]
-        
-        experience_years = []
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, job_desc_lower)
-            experience_years.extend([int(match) for match in matches])
-        
+        experience_years = [int(match.group('bounded') or match.group('years'))
+                            for match in EXPERIENCE_PATTERN.finditer(job_desc_lower)]
         min_experience = max(experience_years) if experience_years else 0
         
         # Extract education requirements
-        education_keywords = ['bachelor', 'master', 'phd', 'degree', 'diploma', 'certification']
-        education_required = [edu for edu in education_keywords if edu in job_desc_lower]
-        
-        # Extract location requirements
-        location_patterns = [
-            r'(?:in|at|located in)\s+([a-zA-Z\s,]+?)(?:\s|,|\.|$)',
-            r'(?:based in|headquartered in)\s+([a-zA-Z\s,]+?)(?:\s|,|\.|$)'
-        ]
+        education_required = [edu for edu in taxonomy.education_keywords
+                              if ('education', None, edu) in keyword_counts]
         
-        locations = []
-        for pattern in location_patterns:
-            matches = re.findall(pattern, job_desc_lower)
-            locations.extend([match.strip() for match in matches])
+        # Extract location requirements (each location once, in order of appearance)
+        locations = list(dict.fromkeys(
+            match.group('location').strip() for match in LOCATION_PATTERN.finditer(job_desc_lower)))
         
         # Extract remote work indicators
-        remote_indicators = ['remote', 'work from home', 'wfh', 'distributed', 'virtual']
-        is_remote = any(indicator in job_desc_lower for indicator in remote_indicators)
-        
-        # Extract salary information
-        salary_patterns = [
-            r'\$(\d+(?:,\d{3})*(?:k|k\+)?)\s*(?:-|to|–)\s*\$(\d+(?:,\d{3})*(?:k|k\+)?)',
-            r'salary[:\s]*\$(\d+(?:,\d{3})*(?:k|k\+)?)',
-            r'compensation[:\s]*\$(\d+(?:,\d{3})*(?:k|k\+)?)'
-        ]
-        
-        salary_range = None
-        for pattern in salary_patterns:
-            match = re.search(pattern, job_desc_lower)
-            if match:
-                salary_range = match.group(0)
+        is_remote = any(('remote', None, indicator) in keyword_counts for indicator in taxonomy.remote_indicators)
+        
+        # Extract salary information: the first range, else the first "salary",
+        # else the first "compensation" amount
+        salary = {'salary_range': None, 'salary_min': None, 'salary_max': None, 'salary_period': None}
+        labelled = {}
+        for match in SALARY_PATTERN.finditer(job_desc_lower):
+            if match.group('high'):
+                salary = parse_salary(match)
                 break
+            label = salary_label(match)
+            if label is not None:
+                labelled.setdefault(label.group('label'), (match, label))
+        else:
+            found = labelled.get('salary') or labelled.get('compensation')
+            if found is not None:
+                salary = parse_salary(*found)
         
         return {
             'skills': found_skills,
+            'skill_counts': skill_counts,
+            'word_count': len(tokens),
+            'industries': industries,
+            'company_sizes': company_sizes,
             'min_experience': min_experience,
             'education_required': education_required,
             'locations': locations,
             'is_remote': is_remote,
-            'salary_range': salary_range,
-            'full_text': job_description
+            **salary
         }
     
-    def calculate_match_score(self, user_profile: UserProfile, job_requirements: Dict[str, Any]) -> Tuple[float, List[str], List[str]]:
+    def calculate_match_score(self, user_profile: Union[UserProfile, CompiledProfile],
+                              job_requirements: Dict[str, Any]) -> Tuple[float, List[str], List[str]]:
         """Calculate match score between user profile and job requirements"""
+        user_profile = CompiledProfile.from_profile(user_profile)
         reasons = []
         missing_skills = []
         
@@ -184,7 +419,7 @@ class AIJobMatcher:
             matched_skills = 0
             
             for skill in required_skills:
-                if skill in [s.lower() for s in user_profile.skills]:
+                if skill in user_profile.skills:
                     matched_skills += 1
                 else:
                     missing_skills.append(skill)
@@ -195,6 +430,10 @@ class AIJobMatcher:
                 reasons.append(f"Matched {matched_skills}/{len(required_skills)} {category} skills")
         
         skill_match_percentage = (skill_score / total_skills * 100) if total_skills > 0 else 0
+        if self.scoring_mode == 'bm25' and total_skills > 0:
+            skill_match_percentage = self.relevance_model.score(
+                job_requirements['skill_counts'], job_requirements['word_count'], user_profile.skills)
+            reasons.append(f"Skill relevance {skill_match_percentage:.0f}% (BM25)")
         
         # Experience matching (25% weight)
         experience_score = 0
@@ -211,8 +450,7 @@ class AIJobMatcher:
             education_score = 100
             reasons.append("No specific education requirements")
         else:
-            user_education_lower = [edu.lower() for edu in user_profile.education]
-            matched_education = any(req in ' '.join(user_education_lower) for req in job_requirements['education_required'])
+            matched_education = any(req in user_profile.education_text for req in job_requirements['education_required'])
             education_score = 100 if matched_education else 50
             if matched_education:
                 reasons.append("Meets education requirements")
@@ -224,11 +462,10 @@ class AIJobMatcher:
         if job_requirements['is_remote'] and user_profile.remote_preference:
             location_score = 100
             reasons.append("Remote work preference matched")
-        elif not job_requirements['is_remote'] and user_profile.preferred_locations:
+        elif not job_requirements['is_remote'] and user_profile.locations:
             # Check if any preferred location matches job locations
-            job_locations_lower = [loc.lower() for loc in job_requirements['locations']]
-            user_locations_lower = [loc.lower() for loc in user_profile.preferred_locations]
-            location_match = any(user_loc in ' '.join(job_locations_lower) for user_loc in user_locations_lower)
+            job_locations_text = ' '.join(job_requirements['locations']).lower()
+            location_match = any(user_loc in job_locations_text for user_loc in user_profile.locations)
             location_score = 100 if location_match else 50
             if location_match:
                 reasons.append("Location preference matched")
@@ -239,9 +476,9 @@ class AIJobMatcher:
         
         # Industry preference matching (10% weight)
         industry_score = 0
-        if user_profile.preferred_industries:
-            job_desc_lower = job_requirements['full_text'].lower()
-            industry_match = any(industry in job_desc_lower for industry in user_profile.preferred_industries)
+        if user_profile.industries:
+            job_desc_lower = job_requirements['full_text_lower']
+            industry_match = any(industry in job_desc_lower for industry in user_profile.industries)
             industry_score = 100 if industry_match else 50
             if industry_match:
                 reasons.append("Industry preference matched")
@@ -261,8 +498,10 @@ class AIJobMatcher:
         
         return round(total_score, 2), reasons, missing_skills
     
-    def generate_recommendations(self, user_profile: UserProfile, job_requirements: Dict[str, Any], missing_skills: List[str]) -> List[str]:
+    def generate_recommendations(self, user_profile: Union[UserProfile, CompiledProfile],
+                                 job_requirements: Dict[str, Any], missing_skills: List[str]) -> List[str]:
         """Generate recommendations for improving job match"""
+        user_profile = CompiledProfile.from_profile(user_profile)
         recommendations = []
         
         # Skill recommendations
@@ -275,7 +514,7 @@ class AIJobMatcher:
             recommendations.append(f"Gain {years_needed} more years of experience or highlight relevant projects")
         
         # Education recommendations
-        if job_requirements['education_required'] and not any(req in ' '.join([edu.lower() for edu in user_profile.education]) for req in job_requirements['education_required']):
+        if job_requirements['education_required'] and not any(req in user_profile.education_text for req in job_requirements['education_required']):
             recommendations.append("Consider highlighting relevant certifications or equivalent experience")
         
         # Portfolio recommendations
@@ -287,14 +526,16 @@ class AIJobMatcher:
         
         return recommendations
     
-    def match_job(self, user_profile: UserProfile, job_title: str, job_description: str, company: str) -> JobMatch:
+    def match_job(self, user_profile: Union[UserProfile, CompiledProfile], job_title: str, job_description: str,
+                  company: str, job_url: str = "") -> JobMatch:
         """Main method to match a job with user profile"""
+        user_profile = CompiledProfile.from_profile(user_profile)
         job_requirements = self.extract_job_requirements(job_description)
         match_score, reasons, missing_skills = self.calculate_match_score(user_profile, job_requirements)
         recommendations = self.generate_recommendations(user_profile, job_requirements, missing_skills)
         
-        # Generate job ID
-        job_id = f"{company}_{job_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Stable job ID shared with the application database
+        job_id = canonical_job_key(job_url, company, job_title)
         
         return JobMatch(
             job_id=job_id,
@@ -304,8 +545,55 @@ class AIJobMatcher:
             recommended_actions=recommendations
         )
     
-    def optimize_resume_keywords(self, user_profile: UserProfile, job_description: str) -> List[str]:
+    def match_job_data(self, user_profile: Union[UserProfile, CompiledProfile], job: Dict[str, Any]) -> JobMatch:
+        """Match a job listing dict (title, company, description, job_url)"""
+        return self.match_job(user_profile, job.get('title', ''), job.get('description', ''),
+                              job.get('company', ''), job.get('job_url', ''))
+    
+    def match_jobs(self, user_profile: Union[UserProfile, CompiledProfile], jobs: Iterable[Dict[str, Any]],
+                   workers: Optional[int] = None, chunk_size: int = 64) -> Iterator[JobMatch]:
+        """Score many job listings, yielding JobMatch results in input order.
+        
+        Jobs are sent to a process pool in chunks of ``chunk_size`` so the
+        pickling cost is paid per chunk rather than per job, and at most
+        two chunks per worker are in flight so large iterables (e.g. every
+        stored application) are streamed rather than loaded at once.
+        ``workers`` defaults to the CPU count; with one worker, or when all
+        jobs fit in a single chunk, scoring runs in this process.
+        """
+        user_profile = CompiledProfile.from_profile(user_profile)
+        workers = workers or os.cpu_count() or 1
+        chunk_size = max(1, chunk_size)
+        jobs = iter(jobs)
+        chunks = iter(lambda: list(islice(jobs, chunk_size)), [])
+        head = list(islice(chunks, 2))
+        
+        if workers == 1 or len(head) < 2:
+            for chunk in chain(head, chunks):
+                for job in chunk:
+                    yield self.match_job_data(user_profile, job)
+            return
+        
+        # Workers score with a copy of the relevance statistics and taxonomy taken now
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_match_worker,
+                                       initargs=(user_profile, self.scoring_mode, self.relevance_model,
+                                                 self.taxonomy))
+        try:
+            pending = deque(executor.submit(_match_job_chunk, _job_fields(chunk)) for chunk in head)
+            for chunk in chunks:
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+                pending.append(executor.submit(_match_job_chunk, _job_fields(chunk)))
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # Also runs when the caller stops iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def optimize_resume_keywords(self, user_profile: Union[UserProfile, CompiledProfile],
+                                 job_description: str) -> List[str]:
         """Suggest keywords to add to resume for better ATS matching"""
+        user_profile = CompiledProfile.from_profile(user_profile)
         job_requirements = self.extract_job_requirements(job_description)
         suggested_keywords = []
         
@@ -315,14 +603,12 @@ class AIJobMatcher:
             important_keywords.extend(skills)
         
         # Find missing keywords that user should add
-        user_skills_lower = [skill.lower() for skill in user_profile.skills]
-        missing_keywords = [keyword for keyword in important_keywords if keyword not in user_skills_lower]
+        missing_keywords = [keyword for keyword in important_keywords if keyword not in user_profile.skills]
         
         # Prioritize by frequency in job description
-        job_desc_lower = job_description.lower()
         keyword_frequency = {}
         for keyword in missing_keywords:
-            keyword_frequency[keyword] = job_desc_lower.count(keyword)
+            keyword_frequency[keyword] = job_requirements['skill_counts'].get(keyword, 0)
         
         # Return top 5 most frequent missing keywords
         sorted_keywords = sorted(keyword_frequency.items(), key=lambda x: x[1], reverse=True)
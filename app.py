@@ -311,11 +311,36 @@ def api_automation_status():
 
 @app.route('/api/jobs', methods=['GET'])
 def api_jobs():
-    """API endpoint to get job applications"""
+    """API endpoint to get job applications, one keyset page per request.
+
+    Pass the returned ``next_cursor`` back as ``?cursor=`` to get the next
+    page; ``page_size``, ``status`` and ``company`` are optional.
+    """
     try:
+        cursor = request.args.get('cursor', type=int)
+        page_size = min(max(request.args.get('page_size', 100, type=int), 1), 500)
+        filters = {key: request.args[key] for key in ('status', 'company') if request.args.get(key)}
+
         # Get job applications from database
-        applications = db_manager.get_job_applications()
-        return jsonify({'jobs': applications})
+        applications, next_cursor = db_manager.get_job_applications_page(cursor, page_size, filters)
+        return jsonify({'jobs': applications, 'next_cursor': next_cursor})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/jobs/search', methods=['GET'])
+def api_jobs_search():
+    """API endpoint for full-text search over job applications"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Missing search query parameter: q'}), 400
+
+    try:
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        results = db_manager.search_applications(query, limit)
+        return jsonify({'query': query, 'results': results})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,195 @@
+"""
+Micro-benchmarks for job card extraction
+Parses saved search result pages with JobCardParser, and counts the WebDriver
+round trips (and the time they would take with and without an implicit wait)
+the element-by-element extractors would need for the same cards
+"""
+import argparse
+import copy
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple
+
+from selenium.common.exceptions import NoSuchElementException
+
+from benchmark_matcher import time_batch
+from element_finder import ElementFinder
+from job_card_extractor import (JobCardParser, LXML_AVAILABLE, ENHANCED_CARD_SELECTORS, ENHANCED_FIELD_SELECTORS,
+                                LOCATION_KEYWORDS, SALARY_KEYWORDS)
+
+if LXML_AVAILABLE:
+    from lxml import html as lxml_html
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_data')
+FIXTURE_PAGE = os.path.join(FIXTURE_DIR, 'job_search_results.html')
+LIST_ITEM_XPATH = "//li[contains(@class, 'jobs-search-results__list-item')]"
+
+
+class UncompiledJobCardParser(JobCardParser):
+    """Evaluates selector strings on every lookup, as the per-element code does"""
+
+    def _compile(self):
+        self._cards = [(selector, lambda node, s=selector: node.xpath(s)) for selector in self.card_selectors]
+        self._fields = {field: [lambda node, s=selector: node.xpath(s) for selector in selectors]
+                        for field, selectors in self.field_selectors.items()}
+
+
+def synthetic_page(cards: int, fixture: str = FIXTURE_PAGE) -> str:
+    """The fixture page with its cards repeated to the given count"""
+    with open(fixture, encoding='utf-8') as f:
+        document = lxml_html.fromstring(f.read())
+    items = document.xpath(LIST_ITEM_XPATH)
+    parent = items[0].getparent()
+    for item in items:
+        parent.remove(item)
+    for i in range(cards):
+        parent.append(copy.deepcopy(items[i % len(items)]))
+    return lxml_html.tostring(document, encoding='unicode')
+
+
+class SimulatedClock:
+    """Requests a WebDriver session would make and the seconds they would take"""
+
+    def __init__(self, latency: float = 0.0, implicit_wait: float = 0.0):
+        self.latency = latency
+        self.implicit_wait = implicit_wait
+        self.requests = 0
+        self.seconds = 0.0
+
+    def request(self, missed: bool = False):
+        self.requests += 1
+        self.seconds += self.latency + (self.implicit_wait if missed else 0.0)
+
+
+class SimulatedElement:
+    """An lxml node behind the WebDriver element API, charging each call to a SimulatedClock.
+
+    As in WebDriver, a lookup that finds nothing blocks for the implicit
+    wait, whether it is find_element or find_elements.
+    """
+
+    def __init__(self, node, clock: SimulatedClock):
+        self.node = node
+        self.clock = clock
+
+    def find_elements(self, by, selector: str) -> List['SimulatedElement']:
+        nodes = self.node.xpath(selector)
+        self.clock.request(missed=not nodes)
+        return [SimulatedElement(node, self.clock) for node in nodes]
+
+    def find_element(self, by, selector: str) -> 'SimulatedElement':
+        elements = self.find_elements(by, selector)
+        if not elements:
+            raise NoSuchElementException(selector)
+        return elements[0]
+
+    @property
+    def text(self) -> str:
+        self.clock.request()
+        return ' '.join(self.node.text_content().split())
+
+    def get_attribute(self, name: str):
+        self.clock.request()
+        return self.node.get(name)
+
+
+def read_cards_element_by_element(page, finder: ElementFinder,
+                                  field_selectors: Dict[str, List[str]] = ENHANCED_FIELD_SELECTORS):
+    """The lookups EnhancedLinkedInAutomation's per-element helpers make for every card on page"""
+    cards = []
+    for selector in ENHANCED_CARD_SELECTORS:
+        cards = finder.probe_all(page, selector)
+        if cards:
+            break
+
+    for card in cards:
+        for field in ('title', 'company'):
+            for selector in field_selectors[field]:
+                element = finder.probe(card, selector)
+                if element is not None and element.text:
+                    break
+        for field, keywords in (('location', LOCATION_KEYWORDS), ('salary', SALARY_KEYWORDS)):
+            found = False
+            for selector in field_selectors[field]:
+                for element in finder.probe_all(card, selector):
+                    text = element.text.lower()
+                    if any(keyword in text for keyword in keywords):
+                        found = True
+                        break
+                if found:
+                    break
+        for selector in field_selectors['url']:
+            element = finder.probe(card, selector)
+            if element is not None and element.get_attribute('href'):
+                break
+        for selector in field_selectors['easy_apply']:
+            if finder.probe(card, selector) is not None:
+                break
+    return cards
+
+
+def element_path_cost(page_html: str, latency: float = 0.0, implicit_wait: float = 0.0) -> Tuple[int, int, float]:
+    """(cards, WebDriver requests, simulated seconds) for reading a page element by element.
+
+    Every find_element/find_elements call is one request, as is reading
+    each found element's text or href; each costs latency seconds, and
+    each lookup that misses also costs implicit_wait.
+    """
+    clock = SimulatedClock(latency, implicit_wait)
+    cards = read_cards_element_by_element(SimulatedElement(lxml_html.fromstring(page_html), clock), ElementFinder())
+    return len(cards), clock.requests, clock.seconds
+
+
+def element_path_round_trips(page_html: str) -> int:
+    """WebDriver requests EnhancedLinkedInAutomation's per-element helpers make for a page"""
+    return element_path_cost(page_html)[1]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark job card extraction from page HTML")
+    parser.add_argument('--cards', type=int, default=25, help="Job cards per page")
+    parser.add_argument('--pages', type=int, default=400, help="Number of pages to parse")
+    parser.add_argument('--workers', type=int, default=None, help="Processes for pooled parsing (default: CPU count)")
+    parser.add_argument('--latency', type=float, default=0.005, help="Seconds per simulated WebDriver request")
+    parser.add_argument('--implicit-wait', type=float, default=10, help="Implicit wait to compare against, in seconds")
+    args = parser.parse_args(argv)
+
+    if not LXML_AVAILABLE:
+        print("lxml is not installed; nothing to benchmark")
+        return 1
+
+    page = synthetic_page(args.cards)
+    pages = [page] * args.pages
+    card_parser = JobCardParser()
+    _, cards = card_parser.parse(page)
+    print(f"{args.pages} pages, {len(cards)} cards each, {len(page) // 1024} KiB per page")
+
+    round_trips = element_path_round_trips(page)
+    print(f"WebDriver round trips per page: element-by-element {round_trips} "
+          f"({round_trips / len(cards):.1f} per card), script mode 1, html mode 2")
+    for label, implicit_wait in ((f"implicit wait {args.implicit_wait:g}s", args.implicit_wait),
+                                 ("probes without implicit wait", 0.0)):
+        card_count, _, seconds = element_path_cost(page, args.latency, implicit_wait)
+        print(f"Element-by-element cost, {label}: {seconds / card_count:.3f} s per card "
+              f"at {args.latency * 1000:g} ms per request")
+
+    uncompiled = time_batch("parse, uncompiled selectors",
+                            lambda: [UncompiledJobCardParser().parse(p) for p in pages], len(pages), "pages")
+    compiled = time_batch("parse, compiled selectors",
+                          lambda: [card_parser.parse(p) for p in pages], len(pages), "pages")
+    print(f"Compiled selector speedup: {uncompiled / compiled:.2f}x")
+
+    workers = args.workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(pages) // (workers * 4))
+        pooled = time_batch(f"parse, {workers} processes",
+                            lambda: list(executor.map(card_parser.parse, pages, chunksize=chunksize)),
+                            len(pages), "pages")
+    print(f"Process pool speedup: {compiled / pooled:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Micro-benchmarks for the AI job matcher
+Compares the single-pass keyword automaton with the legacy substring scan
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from typing import List, Callable
+
+from ai_job_matcher import AIJobMatcher, UserProfile, EXPERIENCE_PATTERN, LOCATION_PATTERN, SALARY_PATTERN
+from vectorized_scoring import VectorizedScorer, NUMPY_AVAILABLE
+
+
+SALARY_SNIPPETS = [
+    'salary: $95,000', 'compensation $120k+', '$45 - $60/hr', '$80,000 to $110,000 per year',
+    '$7,500 a month', 'competitive pay'
+]
+
+FILLER_WORDS = [
+    'team', 'build', 'scalable', 'services', 'customers', 'product', 'experience',
+    'collaborate', 'design', 'deliver', 'ownership', 'growth', 'mission', 'platform',
+    'we', 'are', 'looking', 'for', 'an', 'engineer', 'with', 'strong', 'skills', 'in'
+]
+
+
+def synthetic_descriptions(matcher: AIJobMatcher, count: int, words: int = 400, seed: int = 42) -> List[str]:
+    """Generate job descriptions mixing filler text with known keywords"""
+    rng = random.Random(seed)
+    keywords = [term for terms in matcher.skill_keywords.values() for term in terms]
+    keywords += [term for terms in matcher.industry_keywords.values() for term in terms]
+    keywords += matcher.education_keywords + matcher.remote_indicators
+
+    descriptions = []
+    for _ in range(count):
+        parts = [rng.choice(keywords) if rng.random() < 0.1 else rng.choice(FILLER_WORDS)
+                 for _ in range(words)]
+        descriptions.append(' '.join(parts).capitalize() + f". {rng.randint(1, 9)}+ years of experience required, "
+                            f"based in {rng.choice(['denver', 'austin', 'boston'])}. {rng.choice(SALARY_SNIPPETS)}.")
+    return descriptions
+
+
+def legacy_keyword_scan(matcher: AIJobMatcher, job_description: str) -> dict:
+    """Keyword extraction as done before the automaton: one substring scan per term"""
+    job_desc_lower = job_description.lower()
+    found_skills = {category: [skill for skill in skills if skill in job_desc_lower]
+                    for category, skills in matcher.skill_keywords.items()}
+    education_required = [edu for edu in matcher.education_keywords if edu in job_desc_lower]
+    is_remote = any(indicator in job_desc_lower for indicator in matcher.remote_indicators)
+    return {'skills': found_skills, 'education_required': education_required, 'is_remote': is_remote}
+
+
+def report(label: str, elapsed: float, count: int, unit: str = "descriptions") -> float:
+    """Print elapsed time and throughput"""
+    print(f"{label:<28} {elapsed:8.3f}s  {count / elapsed:10.0f} {unit}/s")
+    return elapsed
+
+
+def legacy_requirement_regexes(job_description: str) -> tuple:
+    """Experience, location and salary extraction as done before the fused patterns"""
+    job_desc_lower = job_description.lower()
+    experience_years = []
+    for pattern in [r'(\d+)\+?\s*years?\s*(?:of\s*)?experience', r'(\d+)\+?\s*years?\s*in',
+                    r'minimum\s*(\d+)\s*years?', r'at\s*least\s*(\d+)\s*years?']:
+        experience_years.extend(int(match) for match in re.findall(pattern, job_desc_lower))
+    locations = []
+    for pattern in [r'(?:in|at|located in)\s+([a-zA-Z\s,]+?)(?:\s|,|\.|$)',
+                    r'(?:based in|headquartered in)\s+([a-zA-Z\s,]+?)(?:\s|,|\.|$)']:
+        locations.extend(match.strip() for match in re.findall(pattern, job_desc_lower))
+    salary_range = None
+    for pattern in [r'\$(\d+(?:,\d{3})*(?:k|k\+)?)\s*(?:-|to|–)\s*\$(\d+(?:,\d{3})*(?:k|k\+)?)',
+                    r'salary[:\s]*\$(\d+(?:,\d{3})*(?:k|k\+)?)', r'compensation[:\s]*\$(\d+(?:,\d{3})*(?:k|k\+)?)']:
+        match = re.search(pattern, job_desc_lower)
+        if match:
+            salary_range = match.group(0)
+            break
+    return max(experience_years, default=0), locations, salary_range
+
+
+def fused_requirement_regexes(job_description: str) -> tuple:
+    """The same three fields with the precompiled fused patterns, one scan each"""
+    job_desc_lower = job_description.lower()
+    experience_years = [int(match.group('bounded') or match.group('years'))
+                        for match in EXPERIENCE_PATTERN.finditer(job_desc_lower)]
+    locations = [match.group('location').strip() for match in LOCATION_PATTERN.finditer(job_desc_lower)]
+    salaries = list(SALARY_PATTERN.finditer(job_desc_lower))
+    return max(experience_years, default=0), locations, salaries
+
+
+def time_it(label: str, func: Callable[[str], object], descriptions: List[str]) -> float:
+    """Run func over every description and print throughput"""
+    start = time.perf_counter()
+    for description in descriptions:
+        func(description)
+    return report(label, time.perf_counter() - start, len(descriptions))
+
+
+def time_batch(label: str, func: Callable[[], list], count: int, unit: str = "descriptions") -> float:
+    """Run a batch function once and print throughput"""
+    start = time.perf_counter()
+    func()
+    return report(label, time.perf_counter() - start, count, unit)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark AI job matcher keyword extraction")
+    parser.add_argument('--count', type=int, default=5000, help="Number of synthetic descriptions")
+    parser.add_argument('--words', type=int, default=400, help="Words per description")
+    parser.add_argument('--workers', type=int, default=None, help="Processes for batch scoring (default: CPU count)")
+    parser.add_argument('--corpus-size', type=int, default=100000,
+                        help="Jobs in the vectorised scoring corpus (descriptions are repeated to reach it)")
+    args = parser.parse_args(argv)
+
+    matcher = AIJobMatcher()
+    descriptions = synthetic_descriptions(matcher, args.count, args.words)
+    print(f"{len(descriptions)} descriptions, {args.words} words each, "
+          f"{len(matcher.keyword_automaton)} keywords")
+
+    legacy = time_it("legacy substring scan", lambda d: legacy_keyword_scan(matcher, d), descriptions)
+    automaton = time_it("keyword automaton", matcher.scan_keywords, descriptions)
+    parse = time_it("extract_job_requirements", matcher.extract_job_requirements, descriptions)
+    print(f"Automaton speedup over legacy scan: {legacy / automaton:.2f}x")
+
+    legacy_regex = time_it("legacy requirement regexes", legacy_requirement_regexes, descriptions)
+    fused_regex = time_it("fused requirement regexes", fused_requirement_regexes, descriptions)
+    print(f"Fused regex speedup: {legacy_regex / fused_regex:.2f}x")
+
+    cached = time_it("extract (cached repeat)", matcher.extract_job_requirements, descriptions)
+    print(f"Cache speedup over parsing: {parse / cached:.2f}x  {matcher.requirements_cache.stats}")
+
+    profile = UserProfile(skills=['python', 'sql', 'docker', 'aws'], experience_years=5,
+                          education=['bachelor'], certifications=[], preferred_industries=['technology'],
+                          preferred_locations=[], salary_expectation=None, remote_preference=True,
+                          company_size_preference='medium')
+    jobs = [{'title': f"Job {i}", 'company': "Acme", 'description': description}
+            for i, description in enumerate(descriptions)]
+    # Fresh matcher so the serial run does not benefit from the warm cache
+    matcher = AIJobMatcher()
+    serial = time_batch("match_jobs (1 worker)",
+                        lambda: list(matcher.match_jobs(profile, jobs, workers=1)), len(jobs))
+    pooled = time_batch("match_jobs (process pool)",
+                        lambda: list(matcher.match_jobs(profile, jobs, workers=args.workers)), len(jobs))
+    print(f"Process pool speedup: {serial / pooled:.2f}x")
+
+    if NUMPY_AVAILABLE:
+        scorer = VectorizedScorer(matcher)
+        requirements = [matcher.extract_job_requirements(description) for description in descriptions]
+        requirements = (requirements * (args.corpus_size // len(requirements) + 1))[:args.corpus_size]
+        corpus = scorer.build_corpus_from_requirements(requirements)
+        time_batch("vectorised score (cold)", lambda: scorer.score(corpus, profile), len(corpus))
+        time_batch("vectorised score (warm)", lambda: scorer.score(corpus, profile), len(corpus))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -29,10 +29,13 @@ try:
 
         # Browser settings
         headless: bool = Field(default=False, description="Run browser in headless mode")
-        implicit_wait: int = Field(default=10, description="Implicit wait time in seconds")
+        implicit_wait: int = Field(default=10, description="Seconds to wait for required elements (lookups never wait implicitly)")
         page_load_timeout: int = Field(default=30, description="Page load timeout in seconds")
         job_search_timeout: int = Field(default=30, description="Job search results timeout in seconds")
         element_wait_timeout: int = Field(default=15, description="Element wait timeout in seconds")
+        settle_timeout: float = Field(default=10.0, description="Longest wait for the page to settle after an action, in seconds")
+        pacing_min_delay: float = Field(default=0.5, description="Shortest human-like pause after an action, in seconds")
+        pacing_max_delay: float = Field(default=1.5, description="Longest human-like pause after an action, in seconds (0 disables pacing)")
 
         # URLs
         linkedin_login_url: str = Field(default="https://www.linkedin.com/login", description="LinkedIn login URL")
@@ -49,6 +52,9 @@ try:
                 headless=os.getenv("HEADLESS", "false").lower() == "true",
                 implicit_wait=int(os.getenv("IMPLICIT_WAIT", "10")),
                 page_load_timeout=int(os.getenv("PAGE_LOAD_TIMEOUT", "30")),
+                settle_timeout=float(os.getenv("SETTLE_TIMEOUT", "10")),
+                pacing_min_delay=float(os.getenv("PACING_MIN_DELAY", "0.5")),
+                pacing_max_delay=float(os.getenv("PACING_MAX_DELAY", "1.5")),
             )
 
 
@@ -69,6 +75,15 @@ try:
         preferred_companies: list[str] = Field(default=[], description="List of preferred companies")
         blacklisted_companies: list[str] = Field(default=[], description="List of companies to avoid")
 
+        match_scoring_mode: str = Field(
+            default="weighted",
+            description="AI skill scoring: 'weighted' (required skills matched) or 'bm25' (relevance)",
+        )
+        skill_taxonomy_path: Optional[str] = Field(
+            default=None,
+            description="JSON/YAML skill taxonomy file for AI matching (default: skill_taxonomy.json)",
+        )
+
 except Exception:
     # Lightweight fallback for environments without pydantic
     from dataclasses import dataclass, field
@@ -86,6 +101,9 @@ except Exception:
         page_load_timeout: int = 30
         job_search_timeout: int = 30
         element_wait_timeout: int = 15
+        settle_timeout: float = 10.0
+        pacing_min_delay: float = 0.5
+        pacing_max_delay: float = 1.5
         linkedin_login_url: str = "https://www.linkedin.com/login"
         linkedin_jobs_url: str = "https://www.linkedin.com/jobs/"
 
@@ -100,6 +118,9 @@ except Exception:
                 headless=os.getenv("HEADLESS", "false").lower() == "true",
                 implicit_wait=int(os.getenv("IMPLICIT_WAIT", "10")),
                 page_load_timeout=int(os.getenv("PAGE_LOAD_TIMEOUT", "30")),
+                settle_timeout=float(os.getenv("SETTLE_TIMEOUT", "10")),
+                pacing_min_delay=float(os.getenv("PACING_MIN_DELAY", "0.5")),
+                pacing_max_delay=float(os.getenv("PACING_MAX_DELAY", "1.5")),
             )
 
 
@@ -113,6 +134,8 @@ except Exception:
         location: Optional[str] = None
         preferred_companies: list[str] = field(default_factory=list)
         blacklisted_companies: list[str] = field(default_factory=list)
+        match_scoring_mode: str = "weighted"
+        skill_taxonomy_path: Optional[str] = None
 
 
 # Global configuration instance
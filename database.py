@@ -4,11 +4,32 @@ Handles application tracking, job history, and analytics
 """
 import sqlite3
 import json
+import csv
+import sys
+import re
+import time
+import queue
+import atexit
+import hashlib
+import weakref
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Iterable, Set, Callable
 from dataclasses import dataclass
 import logging
 
+from migrations import Migration, MigrationRunner
+from near_duplicates import MinHasher, NearDuplicateIndex
+
+# Optional: Arrow/Parquet export
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 
 @dataclass
 class JobApplication:
@@ -28,6 +49,7 @@ class JobApplication:
     response_date: Optional[datetime] = None
     interview_scheduled: bool = False
     interview_date: Optional[datetime] = None
+    job_key: str = ""  # canonical identity, see canonical_job_key()
 
 
 @dataclass
@@ -43,129 +65,948 @@ class JobSearch:
     session_duration: int = 0  # in minutes
 
 
+_LINKEDIN_JOB_ID_PATTERN = re.compile(r'/jobs/view/(?:[^/?#]*-)?(\d+)|[?&]currentJobId=(\d+)')
+_NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9]+')
+
+
+def canonical_job_key(job_url: str = "", company: str = "", job_title: str = "") -> str:
+    """Canonical identity for a job posting.
+    
+    Uses the numeric LinkedIn job id from ``/jobs/view/<id>`` (or
+    ``currentJobId=<id>``) URLs when present, otherwise a hash of the
+    normalised company and title.
+    """
+    match = _LINKEDIN_JOB_ID_PATTERN.search(job_url or "")
+    if match:
+        return f"li:{match.group(1) or match.group(2)}"
+    
+    normalised = '|'.join(
+        _NON_ALNUM_PATTERN.sub(' ', (value or '').lower()).strip()
+        for value in (company, job_title)
+    )
+    return f"h:{hashlib.sha1(normalised.encode('utf-8')).hexdigest()[:20]}"
+
+
+INSERT_JOB_APPLICATION_SQL = """
+    INSERT INTO job_applications 
+    (job_title, company, job_url, application_date, status, easy_apply, 
+     notes, salary_range, location, job_description, response_received, 
+     response_date, interview_scheduled, interview_date, job_key, description_minhash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Re-seeing a known job refreshes what we scraped about it but keeps the
+# original application date, the tracked status and notes (filled in only
+# when missing) and any response/interview state.
+MERGE_JOB_APPLICATION_SQL = INSERT_JOB_APPLICATION_SQL + """
+    ON CONFLICT(job_key) DO UPDATE SET
+        job_url = COALESCE(NULLIF(excluded.job_url, ''), job_url),
+        status = COALESCE(status, excluded.status),
+        easy_apply = excluded.easy_apply,
+        notes = COALESCE(NULLIF(notes, ''), excluded.notes),
+        salary_range = COALESCE(NULLIF(excluded.salary_range, ''), salary_range),
+        location = COALESCE(NULLIF(excluded.location, ''), location),
+        job_description = COALESCE(NULLIF(excluded.job_description, ''), job_description),
+        description_minhash = COALESCE(excluded.description_minhash, description_minhash),
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+UPSERT_JOB_APPLICATION_SQL = MERGE_JOB_APPLICATION_SQL + """
+    RETURNING id
+"""
+
+INSERT_JOB_SEARCH_SESSION_SQL = """
+    INSERT INTO job_search_sessions 
+    (search_date, keywords, location, jobs_found, applications_sent, 
+     success_rate, session_duration)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Indexes backing the analytics, listing and daily-limit queries. Date
+# predicates must stay sargable (compare the raw column, never DATE(column))
+# for these to be used.
+JOB_APPLICATION_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_job_applications_application_date "
+    "ON job_applications (application_date)",
+    "CREATE INDEX IF NOT EXISTS idx_job_applications_status_date "
+    "ON job_applications (status, application_date)",
+    "CREATE INDEX IF NOT EXISTS idx_job_applications_company_date "
+    "ON job_applications (company, application_date)",
+]
+
+# Daily rollups backing get_analytics. ``analytics`` holds one row per day;
+# the status and company tables keep the per-day breakdowns. All three are
+# maintained by triggers on job_applications so every write path (single,
+# bulk, update, delete) keeps them exact.
+ANALYTICS_ROLLUP_TABLES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_analytics_date ON analytics (date)",
+    """
+    CREATE TABLE IF NOT EXISTS analytics_status_daily (
+        date DATE NOT NULL,
+        status TEXT NOT NULL,
+        count INTEGER DEFAULT 0,
+        PRIMARY KEY (date, status)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analytics_company_daily (
+        date DATE NOT NULL,
+        company TEXT NOT NULL,
+        count INTEGER DEFAULT 0,
+        PRIMARY KEY (date, company)
+    )
+    """,
+]
+
+
+# Rollup bucket for applications stored without a status
+UNKNOWN_STATUS = 'unknown'
+
+
+def _rollup_delta_sql(row: str, delta: int) -> str:
+    """Statements applying +/-1 for ``row`` (NEW or OLD) to the daily rollups"""
+    day = f"DATE({row}.application_date)"
+    status = f"COALESCE({row}.status, '{UNKNOWN_STATUS}')"
+    return f"""
+        INSERT INTO analytics (date, total_applications, total_interviews, total_offers)
+        VALUES ({day}, {delta},
+                {delta} * ({status} = 'interviewed'),
+                {delta} * ({status} = 'accepted'))
+        ON CONFLICT(date) DO UPDATE SET
+            total_applications = total_applications + excluded.total_applications,
+            total_interviews = total_interviews + excluded.total_interviews,
+            total_offers = total_offers + excluded.total_offers;
+        UPDATE analytics
+        SET success_rate = CASE WHEN total_applications > 0
+            THEN ROUND((total_interviews + total_offers) * 100.0 / total_applications, 2)
+            ELSE 0 END
+        WHERE date = {day};
+        INSERT INTO analytics_status_daily (date, status, count)
+        VALUES ({day}, {status}, {delta})
+        ON CONFLICT(date, status) DO UPDATE SET count = count + excluded.count;
+        DELETE FROM analytics_status_daily
+        WHERE date = {day} AND status = {status} AND count <= 0;
+        INSERT INTO analytics_company_daily (date, company, count)
+        VALUES ({day}, {row}.company, {delta})
+        ON CONFLICT(date, company) DO UPDATE SET count = count + excluded.count;
+        DELETE FROM analytics_company_daily
+        WHERE date = {day} AND company = {row}.company AND count <= 0;
+    """
+
+
+ANALYTICS_ROLLUP_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_job_applications_rollup_insert
+    AFTER INSERT ON job_applications
+    WHEN NEW.application_date IS NOT NULL
+    BEGIN
+        {_rollup_delta_sql('NEW', 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_job_applications_rollup_delete
+    AFTER DELETE ON job_applications
+    WHEN OLD.application_date IS NOT NULL
+    BEGIN
+        {_rollup_delta_sql('OLD', -1)}
+    END
+    """,
+    # Updates are split so a NULL date on either side only applies one half
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_job_applications_rollup_update_old
+    AFTER UPDATE OF status, company, application_date ON job_applications
+    WHEN OLD.application_date IS NOT NULL
+    BEGIN
+        {_rollup_delta_sql('OLD', -1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_job_applications_rollup_update_new
+    AFTER UPDATE OF status, company, application_date ON job_applications
+    WHEN NEW.application_date IS NOT NULL
+    BEGIN
+        {_rollup_delta_sql('NEW', 1)}
+    END
+    """,
+]
+
+# External-content FTS5 index over job_applications; the triggers mirror
+# every insert, delete and text update into it.
+FULL_TEXT_INDEX = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS job_applications_fts USING fts5 (
+        job_title, company, job_description,
+        content = 'job_applications', content_rowid = 'id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_job_applications_fts_insert
+    AFTER INSERT ON job_applications
+    BEGIN
+        INSERT INTO job_applications_fts (rowid, job_title, company, job_description)
+        VALUES (NEW.id, NEW.job_title, NEW.company, NEW.job_description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_job_applications_fts_delete
+    AFTER DELETE ON job_applications
+    BEGIN
+        INSERT INTO job_applications_fts (job_applications_fts, rowid, job_title, company, job_description)
+        VALUES ('delete', OLD.id, OLD.job_title, OLD.company, OLD.job_description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_job_applications_fts_update
+    AFTER UPDATE OF job_title, company, job_description ON job_applications
+    BEGIN
+        INSERT INTO job_applications_fts (job_applications_fts, rowid, job_title, company, job_description)
+        VALUES ('delete', OLD.id, OLD.job_title, OLD.company, OLD.job_description);
+        INSERT INTO job_applications_fts (rowid, job_title, company, job_description)
+        VALUES (NEW.id, NEW.job_title, NEW.company, NEW.job_description);
+    END
+    """,
+]
+
+# bm25 column weights for (job_title, company, job_description)
+FULL_TEXT_WEIGHTS = (10.0, 5.0, 1.0)
+
+# Persistent layer of the AIJobMatcher requirements cache, keyed by a hash
+# of the job description and the matcher's keyword set
+PARSED_REQUIREMENTS_TABLE = [
+    """
+    CREATE TABLE IF NOT EXISTS parsed_requirements (
+        content_hash TEXT PRIMARY KEY,
+        requirements TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+]
+
+# Corpus statistics for AIJobMatcher's BM25 relevance mode. Documents are
+# keyed by a hash of the description alone (not the requirements cache key,
+# which changes with the parser version and taxonomy), so each distinct
+# description is counted once, however often and however it is parsed.
+RELEVANCE_STATISTICS_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS relevance_documents (
+        content_hash TEXT PRIMARY KEY,
+        length INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS term_document_frequencies (
+        term TEXT PRIMARY KEY,
+        document_count INTEGER NOT NULL
+    )
+    """
+]
+
+# Which XPath selectors found an element, per lookup (e.g. "form.next_button"),
+# so SelectorRegistry can try the selectors that work first across runs
+SELECTOR_STATISTICS_TABLE = [
+    """
+    CREATE TABLE IF NOT EXISTS selector_statistics (
+        lookup TEXT NOT NULL,
+        selector TEXT NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        recent_hit_rate REAL NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (lookup, selector)
+    )
+    """
+]
+
+# Signatures stored in job_applications.description_minhash; changing its
+# parameters needs a migration that recomputes them
+DESCRIPTION_MINHASHER = MinHasher()
+
+# Columns get_job_applications_page/iter_job_applications can filter on;
+# both are leading columns of an index that ends in application_date.
+PAGE_FILTER_COLUMNS = ('status', 'company')
+
+BASE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS job_applications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_title TEXT NOT NULL,
+        company TEXT NOT NULL,
+        job_url TEXT,
+        application_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        status TEXT DEFAULT 'applied',
+        easy_apply BOOLEAN DEFAULT FALSE,
+        notes TEXT,
+        salary_range TEXT,
+        location TEXT,
+        job_description TEXT,
+        response_received BOOLEAN DEFAULT FALSE,
+        response_date TIMESTAMP,
+        interview_scheduled BOOLEAN DEFAULT FALSE,
+        interview_date TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS job_search_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        search_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        keywords TEXT NOT NULL,
+        location TEXT,
+        jobs_found INTEGER DEFAULT 0,
+        applications_sent INTEGER DEFAULT 0,
+        success_rate REAL DEFAULT 0.0,
+        session_duration INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_profiles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT UNIQUE NOT NULL,
+        profile_name TEXT,
+        is_active BOOLEAN DEFAULT TRUE,
+        daily_application_limit INTEGER DEFAULT 10,
+        preferred_keywords TEXT,
+        preferred_companies TEXT,
+        blacklisted_companies TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analytics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date DATE NOT NULL,
+        total_applications INTEGER DEFAULT 0,
+        total_interviews INTEGER DEFAULT 0,
+        total_offers INTEGER DEFAULT 0,
+        success_rate REAL DEFAULT 0.0,
+        avg_response_time INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+# Days recomputed per analytics backfill chunk
+ANALYTICS_BACKFILL_DAYS = 31
+
+
+def _execute_all(statements: List[str]) -> Callable[[sqlite3.Cursor], None]:
+    """Schema step running a fixed list of statements"""
+    def apply(cursor: sqlite3.Cursor):
+        for statement in statements:
+            cursor.execute(statement)
+    return apply
+
+
+def _add_job_key_column(cursor: sqlite3.Cursor):
+    cursor.execute("PRAGMA table_info(job_applications)")
+    if not any(column[1] == 'job_key' for column in cursor.fetchall()):
+        cursor.execute("ALTER TABLE job_applications ADD COLUMN job_key TEXT")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_job_applications_job_key "
+                   "ON job_applications (job_key)")
+
+
+def _backfill_job_keys(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[int]:
+    """Assign job keys to rows missing one, in id order.
+    
+    The first row for a job keeps the key; later duplicates are skipped by
+    OR IGNORE and stay NULL, which the unique index allows.
+    """
+    last_id = 0
+    while True:
+        cursor.execute("""
+            SELECT id, job_url, company, job_title FROM job_applications
+            WHERE id > ? AND job_key IS NULL
+            ORDER BY id LIMIT ?
+        """, (last_id, batch_size))
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        cursor.executemany(
+            "UPDATE OR IGNORE job_applications SET job_key = ? WHERE id = ?",
+            [(canonical_job_key(job_url, company, job_title), app_id)
+             for app_id, job_url, company, job_title in rows]
+        )
+        last_id = rows[-1][0]
+        yield len(rows)
+
+
+def _add_description_minhash_column(cursor: sqlite3.Cursor):
+    cursor.execute("PRAGMA table_info(job_applications)")
+    if not any(column[1] == 'description_minhash' for column in cursor.fetchall()):
+        cursor.execute("ALTER TABLE job_applications ADD COLUMN description_minhash BLOB")
+
+
+def _backfill_description_minhashes(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[int]:
+    """Compute signatures for stored descriptions, in id order"""
+    last_id = 0
+    while True:
+        cursor.execute("""
+            SELECT id, job_description FROM job_applications
+            WHERE id > ? AND description_minhash IS NULL
+            ORDER BY id LIMIT ?
+        """, (last_id, batch_size))
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        cursor.executemany(
+            "UPDATE job_applications SET description_minhash = ? WHERE id = ?",
+            [(DESCRIPTION_MINHASHER.signature_bytes(description or ''), app_id)
+             for app_id, description in rows]
+        )
+        last_id = rows[-1][0]
+        yield len(rows)
+
+
+def _backfill_analytics(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[int]:
+    """Recompute the daily rollups from job_applications, a month of days per chunk.
+    
+    Each chunk deletes and recomputes whole days, so restarting is safe.
+    ``batch_size`` is unused; chunks are sized in days.
+    """
+    cursor.execute("SELECT MIN(application_date), MAX(application_date) FROM job_applications")
+    first, last = cursor.fetchone()
+    if first is None:
+        return
+    
+    day = datetime.fromisoformat(str(first)[:10])
+    last_day = datetime.fromisoformat(str(last)[:10])
+    while day <= last_day:
+        window = (day.strftime('%Y-%m-%d'),
+                  (day + timedelta(days=ANALYTICS_BACKFILL_DAYS)).strftime('%Y-%m-%d'))
+        for table in ('analytics', 'analytics_status_daily', 'analytics_company_daily'):
+            cursor.execute(f"DELETE FROM {table} WHERE date >= ? AND date < ?", window)
+        cursor.execute("""
+            INSERT INTO analytics (date, total_applications, total_interviews, total_offers, success_rate)
+            SELECT DATE(application_date), COUNT(*),
+                   SUM(status = 'interviewed'), SUM(status = 'accepted'),
+                   ROUND((SUM(status = 'interviewed') + SUM(status = 'accepted')) * 100.0 / COUNT(*), 2)
+            FROM job_applications
+            WHERE application_date >= ? AND application_date < ?
+            GROUP BY DATE(application_date)
+        """, window)
+        rows = cursor.rowcount
+        cursor.execute("""
+            INSERT INTO analytics_status_daily (date, status, count)
+            SELECT DATE(application_date), COALESCE(status, ?), COUNT(*)
+            FROM job_applications
+            WHERE application_date >= ? AND application_date < ?
+            GROUP BY DATE(application_date), COALESCE(status, ?)
+        """, (UNKNOWN_STATUS, *window, UNKNOWN_STATUS))
+        cursor.execute("""
+            INSERT INTO analytics_company_daily (date, company, count)
+            SELECT DATE(application_date), company, COUNT(*)
+            FROM job_applications
+            WHERE application_date >= ? AND application_date < ?
+            GROUP BY DATE(application_date), company
+        """, window)
+        day += timedelta(days=ANALYTICS_BACKFILL_DAYS)
+        yield rows
+
+
+def _rebuild_full_text_index(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[int]:
+    """Index rows written before the FTS table existed.
+    
+    FTS5 rebuilds an external-content index in a single statement, so this
+    is one chunk regardless of batch_size.
+    """
+    cursor.execute("INSERT INTO job_applications_fts (job_applications_fts) VALUES ('rebuild')")
+    yield cursor.execute("SELECT COUNT(*) FROM job_applications").fetchone()[0]
+
+
+# Ordered schema history. Never edit or renumber a released step; append a
+# new one instead. Every step is idempotent so databases created before
+# versioning (user_version 0) upgrade by replaying all of them.
+MIGRATIONS = [
+    Migration(1, "Base tables", _execute_all(BASE_SCHEMA)),
+    Migration(2, "Indexes for hot job_applications queries", _execute_all(JOB_APPLICATION_INDEXES)),
+    Migration(3, "Canonical job keys", _add_job_key_column, backfill=_backfill_job_keys),
+    Migration(4, "Trigger-maintained daily analytics rollups",
+              _execute_all(ANALYTICS_ROLLUP_TABLES + ANALYTICS_ROLLUP_TRIGGERS),
+              backfill=_backfill_analytics),
+    Migration(5, "FTS5 full-text index", _execute_all(FULL_TEXT_INDEX),
+              backfill=_rebuild_full_text_index, optional=True),
+    Migration(6, "Parsed job requirements cache", _execute_all(PARSED_REQUIREMENTS_TABLE)),
+    Migration(7, "BM25 relevance statistics keyed by description hash", _execute_all(RELEVANCE_STATISTICS_TABLES)),
+    Migration(8, "MinHash signatures of job descriptions", _add_description_minhash_column,
+              backfill=_backfill_description_minhashes),
+    Migration(9, "Selector hit statistics", _execute_all(SELECTOR_STATISTICS_TABLE)),
+]
+
+# Columns written by DatabaseManager.export, in output order
+EXPORT_COLUMNS = [
+    'id', 'job_key', 'job_title', 'company', 'job_url', 'application_date', 'status',
+    'easy_apply', 'notes', 'salary_range', 'location', 'job_description',
+    'response_received', 'response_date', 'interview_scheduled', 'interview_date',
+    'created_at', 'updated_at'
+]
+EXPORT_TIMESTAMP_COLUMNS = {'application_date', 'response_date', 'interview_date', 'created_at', 'updated_at'}
+EXPORT_BOOLEAN_COLUMNS = {'easy_apply', 'response_received', 'interview_scheduled'}
+EXPORT_FORMATS = ('parquet', 'arrow', 'csv', 'jsonl')
+
+
+def _arrow_schema():
+    fields = []
+    for column in EXPORT_COLUMNS:
+        if column == 'id':
+            fields.append(pa.field(column, pa.int64(), nullable=False))
+        elif column in EXPORT_TIMESTAMP_COLUMNS:
+            fields.append(pa.field(column, pa.timestamp('us')))
+        elif column in EXPORT_BOOLEAN_COLUMNS:
+            fields.append(pa.field(column, pa.bool_()))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _arrow_batch(rows: List[tuple], schema) -> 'pa.RecordBatch':
+    """Build a RecordBatch column by column from a chunk of exported rows"""
+    arrays = []
+    for index, (column, values) in enumerate(zip(EXPORT_COLUMNS, zip(*rows))):
+        if column in EXPORT_TIMESTAMP_COLUMNS:
+            values = [_parse_timestamp(value) for value in values]
+        elif column in EXPORT_BOOLEAN_COLUMNS:
+            values = [None if value is None else bool(value) for value in values]
+        arrays.append(pa.array(values, type=schema.field(index).type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+# Pragmas applied to every pooled connection. WAL lets the Flask request
+# threads read while an automation thread writes; NORMAL sync is safe in WAL.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,  # negative = KiB, i.e. ~16 MB page cache
+    'mmap_size': 268435456,  # 256 MB
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+
+class _ConnectionHolder:
+    """Thread-local slot for a pooled connection; the connection is released when it is collected"""
+    __slots__ = ('conn', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+class ConnectionPool:
+    """Thread-safe pool handing out one long-lived SQLite connection per thread.
+    
+    A thread's connection is closed and dropped from the pool when the
+    thread exits, so short-lived worker threads do not leak connections.
+    """
+    
+    def __init__(self, db_path: str, pragmas: Optional[Dict[str, Any]] = None, timeout: float = 30.0):
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._closed = False
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection and apply the configured pragmas"""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use"""
+        holder = getattr(self._local, 'holder', None)
+        if holder is not None:
+            return holder.conn
+        
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed")
+            conn = self._connect()
+            self._connections.append(conn)
+        
+        # Thread-local values are dropped when their thread exits, which
+        # collects the holder and releases the connection
+        holder = _ConnectionHolder(conn)
+        weakref.finalize(holder, self._release, weakref.ref(self), conn).atexit = False
+        self._local.holder = holder
+        return conn
+    
+    @staticmethod
+    def _release(pool_ref: 'weakref.ref', conn: sqlite3.Connection):
+        """Close a connection whose thread has gone, unless close() already did"""
+        pool = pool_ref()
+        if pool is not None:
+            with pool._lock:
+                if conn not in pool._connections:
+                    return
+                pool._connections.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    
+    @property
+    def size(self) -> int:
+        """Number of open connections owned by the pool"""
+        with self._lock:
+            return len(self._connections)
+    
+    def close(self):
+        """Close every connection opened by the pool"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._closed = True
+        
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Error closing database connection: {e}")
+        self._local = threading.local()
+
+
+class BufferedWriter:
+    """Buffers job applications and search sessions and writes them in bulk.
+    
+    Rows are flushed when the buffer reaches ``batch_size`` or
+    ``flush_interval`` seconds after the first buffered row, whichever comes
+    first. Timed flushes run on one flusher thread that lives as long as the
+    writer. Rows whose flush fails stay buffered for the next flush. Use as a
+    context manager (or call ``close()``) so the tail of the buffer is
+    written.
+    """
+    
+    def __init__(self, db_manager: 'DatabaseManager', batch_size: int = 100, flush_interval: float = 5.0):
+        self.db_manager = db_manager
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+        self._applications: List[JobApplication] = []
+        self._sessions: List[JobSearch] = []
+        self._lock = threading.RLock()
+        self._wakeup = threading.Condition(self._lock)
+        self._deadline: Optional[float] = None
+        self._flusher: Optional[threading.Thread] = None
+        self.inserted_ids: Dict[str, List[int]] = {'applications': [], 'sessions': []}
+    
+    def add(self, record):
+        """Buffer a JobApplication or JobSearch record"""
+        with self._lock:
+            if isinstance(record, JobApplication):
+                self._applications.append(record)
+            elif isinstance(record, JobSearch):
+                self._sessions.append(record)
+            else:
+                raise TypeError(f"Unsupported record type: {type(record).__name__}")
+            
+            if self.pending >= self.batch_size:
+                self.flush()
+            else:
+                self._schedule_flush()
+    
+    @property
+    def pending(self) -> int:
+        """Number of buffered rows not yet written"""
+        with self._lock:
+            return len(self._applications) + len(self._sessions)
+    
+    def _schedule_flush(self):
+        """Arm the timed flush for the buffered rows, starting the flusher thread if needed"""
+        if self.flush_interval <= 0 or self._deadline is not None:
+            return
+        self._deadline = time.monotonic() + self.flush_interval
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._run_flusher, name="buffered-writer-flush", daemon=True)
+            self._flusher.start()
+        self._wakeup.notify()
+    
+    def _run_flusher(self):
+        with self._wakeup:
+            # close() retires this thread by clearing _flusher
+            while self._flusher is threading.current_thread():
+                if self._deadline is None:
+                    self._wakeup.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._wakeup.wait(remaining)
+                    continue
+                try:
+                    self.flush()
+                except Exception as e:
+                    self.logger.error(f"Timed flush of buffered rows failed, will retry: {e}")
+    
+    def flush(self):
+        """Write all buffered rows, one transaction per table.
+        
+        If a write fails its rows are put back in the buffer (and the timed
+        flush re-armed) before the error propagates.
+        """
+        with self._lock:
+            self._deadline = None
+            applications, self._applications = self._applications, []
+            sessions, self._sessions = self._sessions, []
+            
+            try:
+                if applications:
+                    self.inserted_ids['applications'].extend(
+                        self.db_manager.add_job_applications_bulk(applications))
+                    applications = []
+                if sessions:
+                    self.inserted_ids['sessions'].extend(
+                        self.db_manager.add_job_search_sessions_bulk(sessions))
+                    sessions = []
+            finally:
+                if applications or sessions:
+                    self._applications = applications + self._applications
+                    self._sessions = sessions + self._sessions
+                    self._schedule_flush()
+    
+    def close(self):
+        """Flush remaining rows and stop the flusher thread"""
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                flusher, self._flusher = self._flusher, None
+                self._deadline = None
+                self._wakeup.notify()
+            if flusher is not None and flusher is not threading.current_thread():
+                flusher.join()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
 class DatabaseManager:
     """Manages SQLite database for application tracking"""
     
-    def __init__(self, db_path: str = "linkedin_automation.db"):
+    def __init__(self, db_path: str = "linkedin_automation.db", pragmas: Optional[Dict[str, Any]] = None,
+                 auto_migrate: bool = True):
+        """Open the database; with auto_migrate=False pending migrations are
+        left for an explicit migrate() call (e.g. to dry-run them first)"""
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
-        self._init_database()
+        self.pool = ConnectionPool(db_path, pragmas)
+        self._write_queue: Optional['WriteBehindQueue'] = None
+        self._init_database(auto_migrate)
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the pooled connection for the current thread.
+        
+        Use it as a context manager (``with self._get_connection() as conn``)
+        to commit on success and roll back on error; the connection itself
+        stays open for reuse.
+        """
+        return self.pool.get_connection()
+    
+    def _init_database(self, auto_migrate: bool = True):
+        """Initialize database tables by applying any pending schema migrations"""
+        if auto_migrate:
+            self.migrate()
+        self.fts_enabled = self._has_full_text_index()
+        self.logger.info("Database initialized successfully")
+    
+    def migrate(self, dry_run: bool = False, batch_size: int = 1000) -> List[Dict[str, Any]]:
+        """Bring the schema up to date, or report pending migrations when dry_run is set.
+        
+        Backfills run in chunks of batch_size rows, committing between
+        chunks, so large databases can be upgraded while in use.
+        """
+        runner = MigrationRunner(self._get_connection(), MIGRATIONS, batch_size)
+        report = runner.run(dry_run=dry_run)
+        if not dry_run:
+            self.fts_enabled = self._has_full_text_index()
+        return report
+    
+    @property
+    def schema_version(self) -> int:
+        """Schema version recorded in the database file"""
+        return self._get_connection().execute("PRAGMA user_version").fetchone()[0]
+    
+    def _has_full_text_index(self) -> bool:
+        cursor = self._get_connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'job_applications_fts'")
+        return cursor.fetchone() is not None
+    
+    @staticmethod
+    def _application_params(application: JobApplication) -> tuple:
+        """Build the INSERT parameter tuple for a job application"""
+        return (
+            application.job_title, application.company, application.job_url,
+            application.application_date or datetime.now(), application.status,
+            application.easy_apply, application.notes, application.salary_range,
+            application.location, application.job_description, application.response_received,
+            application.response_date, application.interview_scheduled, application.interview_date,
+            application.job_key or canonical_job_key(application.job_url, application.company, application.job_title),
+            DESCRIPTION_MINHASHER.signature_bytes(application.job_description or '')
+        )
     
-    def _init_database(self):
-        """Initialize database tables"""
-        with sqlite3.connect(self.db_path) as conn:
+    @staticmethod
+    def _search_session_params(session: JobSearch) -> tuple:
+        """Build the INSERT parameter tuple for a job search session"""
+        return (
+            session.search_date or datetime.now(), session.keywords, session.location,
+            session.jobs_found, session.applications_sent, session.success_rate,
+            session.session_duration
+        )
+    
+    def _insert_many(self, sql: str, rows: List[tuple]) -> List[int]:
+        """Insert rows with executemany in a single transaction and return their ids.
+        
+        The transaction holds SQLite's write lock from the first INSERT until
+        commit, so AUTOINCREMENT hands out a contiguous block of ids ending
+        at last_insert_rowid().
+        """
+        if not rows:
+            return []
+        
+        with self._get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Job applications table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS job_applications (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    job_title TEXT NOT NULL,
-                    company TEXT NOT NULL,
-                    job_url TEXT,
-                    application_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    status TEXT DEFAULT 'applied',
-                    easy_apply BOOLEAN DEFAULT FALSE,
-                    notes TEXT,
-                    salary_range TEXT,
-                    location TEXT,
-                    job_description TEXT,
-                    response_received BOOLEAN DEFAULT FALSE,
-                    response_date TIMESTAMP,
-                    interview_scheduled BOOLEAN DEFAULT FALSE,
-                    interview_date TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Job search sessions table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS job_search_sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    search_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    keywords TEXT NOT NULL,
-                    location TEXT,
-                    jobs_found INTEGER DEFAULT 0,
-                    applications_sent INTEGER DEFAULT 0,
-                    success_rate REAL DEFAULT 0.0,
-                    session_duration INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # User profiles table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_profiles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    email TEXT UNIQUE NOT NULL,
-                    profile_name TEXT,
-                    is_active BOOLEAN DEFAULT TRUE,
-                    daily_application_limit INTEGER DEFAULT 10,
-                    preferred_keywords TEXT,
-                    preferred_companies TEXT,
-                    blacklisted_companies TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Analytics table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS analytics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date DATE NOT NULL,
-                    total_applications INTEGER DEFAULT 0,
-                    total_interviews INTEGER DEFAULT 0,
-                    total_offers INTEGER DEFAULT 0,
-                    success_rate REAL DEFAULT 0.0,
-                    avg_response_time INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            conn.commit()
-            self.logger.info("Database initialized successfully")
+            cursor.executemany(sql, rows)
+            last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        
+        first_id = last_id - len(rows) + 1
+        return list(range(first_id, last_id + 1))
     
     def add_job_application(self, application: JobApplication) -> int:
         """Add a new job application record"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO job_applications 
-                (job_title, company, job_url, application_date, status, easy_apply, 
-                 notes, salary_range, location, job_description, response_received, 
-                 response_date, interview_scheduled, interview_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                application.job_title, application.company, application.job_url,
-                application.application_date or datetime.now(), application.status,
-                application.easy_apply, application.notes, application.salary_range,
-                application.location, application.job_description, application.response_received,
-                application.response_date, application.interview_scheduled, application.interview_date
-            ))
+            cursor.execute(INSERT_JOB_APPLICATION_SQL, self._application_params(application))
             conn.commit()
             return cursor.lastrowid
     
+    def upsert_job_application(self, application: JobApplication) -> int:
+        """Insert an application, or refresh the existing row for the same job.
+        
+        Rows are matched on job_key. Returns the id of the inserted or
+        updated row.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(UPSERT_JOB_APPLICATION_SQL, self._application_params(application))
+            return cursor.fetchone()[0]
+    
+    def has_applied(self, job_keys: Iterable[str]) -> Set[str]:
+        """Return the subset of job_keys that already have an application"""
+        keys = list(dict.fromkeys(key for key in job_keys if key))
+        found: Set[str] = set()
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(
+                    f"SELECT job_key FROM job_applications WHERE job_key IN ({placeholders})", chunk)
+                found.update(row[0] for row in cursor.fetchall())
+        
+        return found
+    
+    def near_duplicate_index(self, threshold: float = 0.9) -> NearDuplicateIndex:
+        """LSH index of every stored description signature, keyed by job_key"""
+        index = NearDuplicateIndex(threshold, DESCRIPTION_MINHASHER.num_perm)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COALESCE(job_key, 'id:' || id), description_minhash FROM job_applications
+                WHERE description_minhash IS NOT NULL
+            """)
+            for key, signature in cursor:
+                index.add(key, DESCRIPTION_MINHASHER.from_bytes(signature))
+        return index
+    
+    def add_job_applications_bulk(self, applications: List[JobApplication]) -> List[int]:
+        """Add many job application records in one transaction, returning their ids.
+        
+        A record for a job that is already stored (or appears earlier in
+        the batch) is merged into that row as by upsert_job_application,
+        so one duplicate does not fail the whole batch.
+        """
+        rows = [self._application_params(application) for application in applications]
+        if not rows:
+            return []
+        
+        # executemany cannot fetch RETURNING rows, so the ids are looked up
+        # by job_key (the last-but-one parameter) in the same transaction
+        keys = list(dict.fromkeys(row[-2] for row in rows))
+        ids: Dict[str, int] = {}
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(MERGE_JOB_APPLICATION_SQL, rows)
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(
+                    f"SELECT job_key, id FROM job_applications WHERE job_key IN ({placeholders})", chunk)
+                ids.update(cursor.fetchall())
+        
+        return [ids[row[-2]] for row in rows]
+    
+    @staticmethod
+    def _update_statement(application_id: int, updates: Dict[str, Any]) -> Tuple[str, list]:
+        """Build the UPDATE statement and parameters for a job application"""
+        set_clause = ", ".join([f"{key} = ?" for key in updates.keys()])
+        sql = f"""
+            UPDATE job_applications 
+            SET {set_clause}, updated_at = ?
+            WHERE id = ?
+        """
+        return sql, list(updates.values()) + [datetime.now(), application_id]
+    
     def update_job_application(self, application_id: int, updates: Dict[str, Any]):
         """Update an existing job application"""
-        set_clause = ", ".join([f"{key} = ?" for key in updates.keys()])
-        updates['updated_at'] = datetime.now()
-        
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(f"""
-                UPDATE job_applications 
-                SET {set_clause}, updated_at = ?
-                WHERE id = ?
-            """, list(updates.values()) + [application_id])
+            cursor.execute(*self._update_statement(application_id, updates))
             conn.commit()
     
+    @staticmethod
+    def _row_to_application(row: sqlite3.Row) -> JobApplication:
+        """Convert a job_applications row into a JobApplication"""
+        return JobApplication(
+            id=row['id'],
+            job_title=row['job_title'],
+            company=row['company'],
+            job_url=row['job_url'],
+            application_date=datetime.fromisoformat(row['application_date']) if row['application_date'] else None,
+            status=row['status'],
+            easy_apply=bool(row['easy_apply']),
+            notes=row['notes'] or "",
+            salary_range=row['salary_range'] or "",
+            location=row['location'] or "",
+            job_description=row['job_description'] or "",
+            response_received=bool(row['response_received']),
+            response_date=datetime.fromisoformat(row['response_date']) if row['response_date'] else None,
+            interview_scheduled=bool(row['interview_scheduled']),
+            interview_date=datetime.fromisoformat(row['interview_date']) if row['interview_date'] else None,
+            job_key=row['job_key'] or ""
+        )
+    
     def get_job_applications(self, limit: int = 100, status: Optional[str] = None) -> List[JobApplication]:
         """Get job applications with optional filtering"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             query = "SELECT * FROM job_applications"
             params = []
@@ -178,95 +1019,287 @@ class DatabaseManager:
             params.append(limit)
             
             cursor.execute(query, params)
+            return [self._row_to_application(row) for row in cursor.fetchall()]
+    
+    def get_job_applications_page(self, after_id: Optional[int] = None, page_size: int = 100,
+                                  filters: Optional[Dict[str, Any]] = None) -> Tuple[List[JobApplication], Optional[int]]:
+        """Get one page of applications, newest first, using keyset pagination.
+        
+        ``after_id`` is the id of the last application on the previous page
+        (the returned cursor); the page continues strictly after it in
+        ``(application_date, id)`` order. Supported filters are ``status``
+        and ``company``. Returns the page and the cursor for the next one,
+        which is None once the listing is exhausted. Applications without an
+        application_date are not paged.
+        """
+        filters = filters or {}
+        unknown = set(filters) - set(PAGE_FILTER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unsupported filters: {', '.join(sorted(unknown))}")
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            
+            conditions = ["application_date IS NOT NULL"]
+            params: List[Any] = []
+            
+            for key in PAGE_FILTER_COLUMNS:
+                if filters.get(key):
+                    conditions.append(f"{key} = ?")
+                    params.append(filters[key])
+            
+            if after_id is not None:
+                cursor.execute("SELECT application_date FROM job_applications WHERE id = ?", (after_id,))
+                anchor = cursor.fetchone()
+                if anchor is None:
+                    raise ValueError(f"Unknown pagination cursor: {after_id}")
+                conditions.append("(application_date, id) < (?, ?)")
+                params.extend([anchor['application_date'], after_id])
+            
+            cursor.execute(f"""
+                SELECT * FROM job_applications
+                WHERE {' AND '.join(conditions)}
+                ORDER BY application_date DESC, id DESC
+                LIMIT ?
+            """, params + [page_size + 1])
             rows = cursor.fetchall()
+        
+        applications = [self._row_to_application(row) for row in rows[:page_size]]
+        next_cursor = applications[-1].id if len(rows) > page_size else None
+        return applications, next_cursor
+    
+    def iter_job_applications(self, after_id: Optional[int] = None, page_size: int = 500,
+                              filters: Optional[Dict[str, Any]] = None) -> Iterator[JobApplication]:
+        """Stream applications newest first, one keyset page at a time.
+        
+        Only ``page_size`` rows are held in memory and every page is an index
+        seek, so walking the full history costs the same per page at any depth.
+        """
+        cursor = after_id
+        while True:
+            applications, cursor = self.get_job_applications_page(cursor, page_size, filters)
+            yield from applications
+            if cursor is None:
+                return
+    
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Turn free text into an FTS5 query matching all terms, prefix-matching the last"""
+        terms = [term.replace('"', '""') for term in query.split()]
+        if not terms:
+            return ""
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+    
+    @staticmethod
+    def _like_pattern(term: str) -> str:
+        """LIKE pattern (with ESCAPE '\\') matching term literally anywhere in a value"""
+        escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f"%{escaped}%"
+    
+    def search_applications(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Full-text search over job titles, companies and descriptions.
+        
+        Results are ranked by bm25 (title matches weigh most) and carry a
+        highlighted snippet of the description. Without FTS5 this degrades
+        to an unranked LIKE scan.
+        """
+        fts_query = self._fts_query(query)
+        if not fts_query:
+            return []
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
-            applications = []
-            for row in rows:
-                app = JobApplication(
-                    id=row['id'],
-                    job_title=row['job_title'],
-                    company=row['company'],
-                    job_url=row['job_url'],
-                    application_date=datetime.fromisoformat(row['application_date']) if row['application_date'] else None,
-                    status=row['status'],
-                    easy_apply=bool(row['easy_apply']),
-                    notes=row['notes'] or "",
-                    salary_range=row['salary_range'] or "",
-                    location=row['location'] or "",
-                    job_description=row['job_description'] or "",
-                    response_received=bool(row['response_received']),
-                    response_date=datetime.fromisoformat(row['response_date']) if row['response_date'] else None,
-                    interview_scheduled=bool(row['interview_scheduled']),
-                    interview_date=datetime.fromisoformat(row['interview_date']) if row['interview_date'] else None
-                )
-                applications.append(app)
+            if self.fts_enabled:
+                cursor.execute(f"""
+                    SELECT a.id, a.job_title, a.company, a.job_url, a.application_date, a.status,
+                           bm25(job_applications_fts, {', '.join(map(str, FULL_TEXT_WEIGHTS))}) AS rank,
+                           snippet(job_applications_fts, 2, '[', ']', '...', 12) AS snippet
+                    FROM job_applications_fts
+                    JOIN job_applications a ON a.id = job_applications_fts.rowid
+                    WHERE job_applications_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                """, (fts_query, limit))
+            else:
+                # Like the FTS query, every term has to match one of the columns
+                term_match = ("(job_title LIKE ? ESCAPE '\\' OR company LIKE ? ESCAPE '\\' "
+                              "OR job_description LIKE ? ESCAPE '\\')")
+                terms = query.split()
+                params = [self._like_pattern(term) for term in terms for _ in range(3)]
+                cursor.execute(f"""
+                    SELECT id, job_title, company, job_url, application_date, status,
+                           0.0 AS rank, SUBSTR(job_description, 1, 120) AS snippet
+                    FROM job_applications
+                    WHERE {' AND '.join([term_match] * len(terms))}
+                    ORDER BY application_date DESC
+                    LIMIT ?
+                """, (*params, limit))
             
-            return applications
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def export(self, path: str, format: str = 'parquet', since: Optional[datetime] = None,
+               chunk_size: int = 10000) -> int:
+        """Stream job applications to a file, chunk by chunk, and return the row count.
+        
+        ``format`` is one of 'parquet', 'arrow' (Arrow IPC file), 'csv' or
+        'jsonl'; the first two need pyarrow and are written as one Arrow
+        record batch per chunk. ``path`` may be '-' for csv/jsonl to write to
+        stdout. ``since`` limits the export to applications on or after that
+        date. Only ``chunk_size`` rows are held in memory at a time, and the
+        whole export reads from a single consistent snapshot.
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{format}', expected one of {', '.join(EXPORT_FORMATS)}")
+        if format in ('parquet', 'arrow') and not PYARROW_AVAILABLE:
+            raise ImportError(f"pyarrow is required for {format} export (pip install pyarrow)")
+        if path == '-' and format in ('parquet', 'arrow'):
+            raise ValueError(f"{format} export needs a file path")
+        
+        query = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM job_applications"
+        params: List[Any] = []
+        if since is not None:
+            query += " WHERE application_date >= ?"
+            params.append(since)
+        query += " ORDER BY id"
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        chunks = iter(lambda: cursor.fetchmany(chunk_size), [])
+        
+        try:
+            if format in ('parquet', 'arrow'):
+                rows = self._export_arrow(chunks, path, format)
+            else:
+                rows = self._export_text(chunks, path, format)
+        finally:
+            cursor.close()
+        
+        self.logger.info(f"Exported {rows} job applications to {path} ({format})")
+        return rows
+    
+    @staticmethod
+    def _export_arrow(chunks: Iterator[List[tuple]], path: str, format: str) -> int:
+        schema = _arrow_schema()
+        if format == 'parquet':
+            writer = pq.ParquetWriter(path, schema)
+        else:
+            writer = pa.ipc.new_file(path, schema)
+        
+        rows = 0
+        try:
+            for chunk in chunks:
+                batch = _arrow_batch(chunk, schema)
+                if format == 'parquet':
+                    writer.write_batch(batch)
+                else:
+                    writer.write(batch)
+                rows += len(chunk)
+        finally:
+            writer.close()
+        return rows
+    
+    @staticmethod
+    def _export_text(chunks: Iterator[List[tuple]], path: str, format: str) -> int:
+        stream = sys.stdout if path == '-' else open(path, 'w', newline='', encoding='utf-8')
+        rows = 0
+        try:
+            if format == 'csv':
+                writer = csv.writer(stream)
+                writer.writerow(EXPORT_COLUMNS)
+                for chunk in chunks:
+                    writer.writerows(chunk)
+                    rows += len(chunk)
+            else:
+                for chunk in chunks:
+                    stream.writelines(
+                        json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + '\n' for row in chunk)
+                    rows += len(chunk)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        return rows
     
     def add_job_search_session(self, session: JobSearch) -> int:
         """Add a new job search session record"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO job_search_sessions 
-                (search_date, keywords, location, jobs_found, applications_sent, 
-                 success_rate, session_duration)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                session.search_date or datetime.now(), session.keywords, session.location,
-                session.jobs_found, session.applications_sent, session.success_rate,
-                session.session_duration
-            ))
+            cursor.execute(INSERT_JOB_SEARCH_SESSION_SQL, self._search_session_params(session))
             conn.commit()
             return cursor.lastrowid
     
+    def add_job_search_sessions_bulk(self, sessions: List[JobSearch]) -> List[int]:
+        """Add many job search session records in one transaction, returning their ids"""
+        rows = [self._search_session_params(session) for session in sessions]
+        return self._insert_many(INSERT_JOB_SEARCH_SESSION_SQL, rows)
+    
+    def buffered_writer(self, batch_size: int = 100, flush_interval: float = 5.0) -> 'BufferedWriter':
+        """Create a writer that batches inserts, flushing every batch_size rows or flush_interval seconds"""
+        return BufferedWriter(self, batch_size=batch_size, flush_interval=flush_interval)
+    
+    def rebuild_analytics(self):
+        """Recompute the daily analytics rollups from scratch in one transaction"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for table in ('analytics', 'analytics_status_daily', 'analytics_company_daily'):
+                cursor.execute(f"DELETE FROM {table}")
+            for _ in _backfill_analytics(cursor, batch_size=0):
+                pass
+        self.logger.info("Analytics rollups rebuilt from job applications")
+    
     def get_analytics(self, days: int = 30) -> Dict[str, Any]:
-        """Get analytics data for the specified number of days"""
-        with sqlite3.connect(self.db_path) as conn:
+        """Get analytics data for the specified number of days.
+        
+        Served from the daily rollups, so cost depends on the number of days
+        in the window rather than the number of applications. The window is
+        day-granular: it covers every calendar day from ``days`` ago to today.
+        """
+        with self._get_connection() as conn:
             cursor = conn.cursor()
             
             # Get date range
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
+            start_day = start_date.strftime('%Y-%m-%d')
+            end_day = end_date.strftime('%Y-%m-%d')
             
-            # Total applications
+            # Daily application counts, interviews and offers
             cursor.execute("""
-                SELECT COUNT(*) FROM job_applications 
-                WHERE application_date >= ? AND application_date <= ?
-            """, (start_date, end_date))
-            total_applications = cursor.fetchone()[0]
+                SELECT date, total_applications, total_interviews, total_offers
+                FROM analytics 
+                WHERE date >= ? AND date <= ? AND total_applications > 0
+                ORDER BY date
+            """, (start_day, end_day))
+            daily_rows = cursor.fetchall()
+            daily_counts = [(day, count) for day, count, _, _ in daily_rows]
+            total_applications = sum(count for _, count in daily_counts)
+            total_responses = sum(interviews + offers for _, _, interviews, offers in daily_rows)
             
             # Applications by status
             cursor.execute("""
-                SELECT status, COUNT(*) FROM job_applications 
-                WHERE application_date >= ? AND application_date <= ?
+                SELECT status, SUM(count) FROM analytics_status_daily 
+                WHERE date >= ? AND date <= ?
                 GROUP BY status
-            """, (start_date, end_date))
+            """, (start_day, end_day))
             status_counts = dict(cursor.fetchall())
             
-            # Daily application counts
-            cursor.execute("""
-                SELECT DATE(application_date) as date, COUNT(*) as count
-                FROM job_applications 
-                WHERE application_date >= ? AND application_date <= ?
-                GROUP BY DATE(application_date)
-                ORDER BY date
-            """, (start_date, end_date))
-            daily_counts = cursor.fetchall()
-            
             # Success rate
-            total_responses = status_counts.get('interviewed', 0) + status_counts.get('accepted', 0)
             success_rate = (total_responses / total_applications * 100) if total_applications > 0 else 0
             
             # Top companies
             cursor.execute("""
-                SELECT company, COUNT(*) as count
-                FROM job_applications 
-                WHERE application_date >= ? AND application_date <= ?
+                SELECT company, SUM(count) as count
+                FROM analytics_company_daily 
+                WHERE date >= ? AND date <= ?
                 GROUP BY company
                 ORDER BY count DESC
                 LIMIT 10
-            """, (start_date, end_date))
+            """, (start_day, end_day))
             top_companies = cursor.fetchall()
             
             return {
@@ -276,8 +1309,8 @@ class DatabaseManager:
                 'daily_counts': daily_counts,
                 'top_companies': top_companies,
                 'date_range': {
-                    'start': start_date.strftime('%Y-%m-%d'),
-                    'end': end_date.strftime('%Y-%m-%d')
+                    'start': start_day,
+                    'end': end_day
                 }
             }
     
@@ -286,14 +1319,17 @@ class DatabaseManager:
         if date is None:
             date = datetime.now()
         
-        with sqlite3.connect(self.db_path) as conn:
+        day_start = datetime(date.year, date.month, date.day)
+        day_end = day_start + timedelta(days=1)
+        
+        with self._get_connection() as conn:
             cursor = conn.cursor()
             
-            # Applications for the day
+            # Applications for the day (half-open range so the date index is used)
             cursor.execute("""
                 SELECT COUNT(*) FROM job_applications 
-                WHERE DATE(application_date) = DATE(?)
-            """, (date,))
+                WHERE application_date >= ? AND application_date < ?
+            """, (day_start, day_end))
             daily_applications = cursor.fetchone()[0]
             
             # Remaining applications (based on limit)
@@ -313,6 +1349,263 @@ class DatabaseManager:
                 'can_apply': remaining_applications > 0
             }
     
+    def get_parsed_requirements(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Return cached job requirements for a description hash, if stored"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT requirements FROM parsed_requirements WHERE content_hash = ?",
+                           (content_hash,))
+            row = cursor.fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def _write(self, operation: Callable[[sqlite3.Cursor], Any]) -> Future:
+        """Run ``operation(cursor)`` on the write-behind thread if it is running, else here.
+        
+        Returns the operation's Future; when the write ran here it is
+        already resolved, and errors are raised directly.
+        """
+        writer = self._write_queue
+        if writer is not None and writer.is_running:
+            try:
+                return writer.submit(operation)
+            except RuntimeError:
+                # Closing; write synchronously instead
+                pass
+        future: Future = Future()
+        with self._get_connection() as conn:
+            future.set_result(operation(conn.cursor()))
+        return future
+    
+    def save_parsed_requirements(self, content_hash: str, requirements: Dict[str, Any]) -> Future:
+        """Store parsed job requirements for a description hash (behind other writes when write-behind runs)"""
+        params = (content_hash, json.dumps(requirements))
+        return self._write(lambda cursor: cursor.execute(
+            "INSERT OR REPLACE INTO parsed_requirements (content_hash, requirements) VALUES (?, ?)", params))
+    
+    def clear_parsed_requirements(self):
+        """Drop every cached job requirements entry"""
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM parsed_requirements")
+            conn.commit()
+    
+    def load_relevance_statistics(self) -> Tuple[int, int, Dict[str, int]]:
+        """Return (document count, total document length, term document frequencies)"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM relevance_documents")
+            document_count, total_length = cursor.fetchone()
+            cursor.execute("SELECT term, document_count FROM term_document_frequencies")
+            document_frequencies = dict(cursor.fetchall())
+        return document_count, total_length, document_frequencies
+    
+    def add_relevance_document(self, content_hash: str, length: int, terms: Iterable[str]) -> Future:
+        """Count a description in the relevance statistics.
+        
+        The Future resolves to False if the description was already
+        counted. Goes behind other writes when write-behind runs.
+        """
+        term_rows = [(term,) for term in set(terms)]
+        
+        def add(cursor: sqlite3.Cursor) -> bool:
+            cursor.execute("INSERT OR IGNORE INTO relevance_documents (content_hash, length) VALUES (?, ?)",
+                           (content_hash, length))
+            if cursor.rowcount == 0:
+                return False
+            cursor.executemany("""
+                INSERT INTO term_document_frequencies (term, document_count) VALUES (?, 1)
+                ON CONFLICT(term) DO UPDATE SET document_count = document_count + 1
+            """, term_rows)
+            return True
+        
+        return self._write(add)
+    
+    def load_selector_statistics(self) -> List[Tuple[str, str, int, int, float]]:
+        """Return (lookup, selector, hits, attempts, recent hit rate) for every recorded selector"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT lookup, selector, hits, attempts, recent_hit_rate FROM selector_statistics")
+            return cursor.fetchall()
+    
+    def save_selector_statistics(self, rows: Iterable[Tuple[str, str, int, int, float]]) -> Future:
+        """Store (lookup, selector, hits, attempts, recent hit rate) rows, replacing earlier values
+        (behind other writes when write-behind runs)"""
+        rows = list(rows)
+        return self._write(lambda cursor: cursor.executemany("""
+            INSERT INTO selector_statistics (lookup, selector, hits, attempts, recent_hit_rate)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(lookup, selector) DO UPDATE SET
+                hits = excluded.hits,
+                attempts = excluded.attempts,
+                recent_hit_rate = excluded.recent_hit_rate,
+                updated_at = CURRENT_TIMESTAMP
+        """, rows))
+    
+    def start_write_behind(self, max_pending: int = 1000, batch_size: int = 100,
+                           put_timeout: Optional[float] = None) -> 'WriteBehindQueue':
+        """Start (or return the running) background writer for this database"""
+        if self._write_queue is None or not self._write_queue.is_running:
+            self._write_queue = WriteBehindQueue(self, max_pending, batch_size, put_timeout)
+            self._write_queue.start()
+        return self._write_queue
+    
     def close(self):
-        """Close database connection"""
-        pass  # SQLite connections are closed automatically
+        """Flush the background writer, then close all pooled database connections"""
+        if self._write_queue is not None:
+            self._write_queue.close()
+            self._write_queue = None
+        self.pool.close()
+
+
+class WriteBehindQueue:
+    """Single background thread that owns all writes to the database.
+    
+    Callers enqueue writes and get a Future back immediately, so browser
+    work never waits on disk. The writer drains up to ``batch_size`` queued
+    writes into one transaction (each in its own savepoint, so one bad row
+    fails alone). The queue is bounded: when ``max_pending`` writes are
+    outstanding, submit blocks (up to ``put_timeout``, then raises
+    ``queue.Full``) to push back on producers. ``close()`` - also registered
+    with atexit - writes everything still queued before returning.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, db_manager: DatabaseManager, max_pending: int = 1000, batch_size: int = 100,
+                 put_timeout: Optional[float] = None):
+        self.db_manager = db_manager
+        self.batch_size = max(1, batch_size)
+        self.put_timeout = put_timeout
+        self.logger = logging.getLogger(__name__)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+        self._lock = threading.Lock()
+        self.stats = {'submitted': 0, 'written': 0, 'failed': 0, 'batches': 0, 'largest_batch': 0}
+    
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def pending(self) -> int:
+        """Approximate number of queued writes"""
+        return self._queue.qsize()
+    
+    def start(self):
+        """Start the writer thread"""
+        if self.is_running:
+            return
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, operation: Callable[[sqlite3.Cursor], Any]) -> Future:
+        """Queue ``operation(cursor)`` to run on the writer thread; returns its Future"""
+        if self._closing or not self.is_running:
+            raise RuntimeError("Write-behind queue is not running")
+        
+        future: Future = Future()
+        self._queue.put((operation, future), timeout=self.put_timeout)
+        with self._lock:
+            self.stats['submitted'] += 1
+        return future
+    
+    def add_job_application(self, application: JobApplication) -> Future:
+        """Queue an insert; the Future resolves to the new row id"""
+        params = DatabaseManager._application_params(application)
+        return self.submit(lambda cursor: cursor.execute(INSERT_JOB_APPLICATION_SQL, params).lastrowid)
+    
+    def upsert_job_application(self, application: JobApplication) -> Future:
+        """Queue an upsert; the Future resolves to the row id"""
+        params = DatabaseManager._application_params(application)
+        return self.submit(lambda cursor: cursor.execute(UPSERT_JOB_APPLICATION_SQL, params).fetchone()[0])
+    
+    def update_job_application(self, application_id: int, updates: Dict[str, Any]) -> Future:
+        """Queue an update of an existing application"""
+        sql, params = DatabaseManager._update_statement(application_id, dict(updates))
+        return self.submit(lambda cursor: cursor.execute(sql, params).rowcount)
+    
+    def add_job_search_session(self, session: JobSearch) -> Future:
+        """Queue a search session insert; the Future resolves to the new row id"""
+        params = DatabaseManager._search_session_params(session)
+        return self.submit(lambda cursor: cursor.execute(INSERT_JOB_SEARCH_SESSION_SQL, params).lastrowid)
+    
+    def flush(self):
+        """Block until every write queued so far has been committed"""
+        if self.is_running:
+            self._queue.join()
+    
+    def close(self, timeout: Optional[float] = None):
+        """Write everything still queued, then stop the writer thread"""
+        if self._thread is None:
+            return
+        if not self._closing:
+            self._closing = True
+            self._queue.put((self._STOP, None))
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._thread = None
+            atexit.unregister(self.close)
+    
+    def _run(self):
+        conn = self.db_manager._get_connection()
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            operations = [item for item in batch if item[0] is not self._STOP]
+            stopping = len(operations) < len(batch)
+            try:
+                if operations:
+                    self._write_batch(conn, operations)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _write_batch(self, conn: sqlite3.Connection, operations: List[tuple]):
+        results = []
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for operation, future in operations:
+                cursor.execute("SAVEPOINT write_behind_item")
+                try:
+                    results.append((future, operation(cursor), None))
+                    cursor.execute("RELEASE write_behind_item")
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO write_behind_item")
+                    cursor.execute("RELEASE write_behind_item")
+                    results.append((future, None, e))
+            conn.commit()
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            self.logger.error(f"Write-behind batch of {len(operations)} failed: {e}")
+            results = [(future, None, e) for _, future in operations]
+        
+        failed = 0
+        for future, result, error in results:
+            if error is not None:
+                failed += 1
+            # The caller may have cancelled while the write was queued; the
+            # write still happened, there is just nobody left to tell
+            if not future.set_running_or_notify_cancel():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['written'] += len(results) - failed
+            self.stats['failed'] += failed
+            self.stats['largest_batch'] = max(self.stats['largest_batch'], len(results))
+        if failed:
+            self.logger.warning(f"{failed} of {len(results)} queued writes failed")
@@ -0,0 +1,128 @@
+"""
+Element lookups without implicit waits
+Optional and fallback elements are probed without waiting; elements that must appear get explicit waits
+"""
+import time
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Iterator
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+
+# Drivers used with ElementFinder run with implicit waits off; a miss then
+# returns at once instead of blocking for the implicit timeout
+PROBE_IMPLICIT_WAIT = 0
+# Seconds between condition checks in explicit waits
+POLL_INTERVAL = 0.25
+
+
+class ElementFinder:
+    """Element lookups for a driver whose implicit wait is PROBE_IMPLICIT_WAIT.
+
+    With an implicit wait every ``find_element`` that misses blocks for the
+    full timeout, so a fallback chain of selectors where most miss costs
+    seconds per element. ``probe``/``probe_all`` are for elements that may
+    legitimately be absent: they use ``find_elements`` and treat an empty
+    list as a miss, which costs a single round trip. ``require`` and
+    ``wait_for_any`` are for elements that must appear, and wait for them
+    explicitly with WebDriverWait for up to ``timeout`` seconds.
+
+    Every lookup is counted and timed, and ``timed(label)`` times larger
+    units of work (one job card) so ``stats`` shows what each costs.
+    """
+
+    def __init__(self, timeout: float = 10, poll_interval: float = POLL_INTERVAL):
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        # label -> [count, total seconds]
+        self._timings: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def probe(self, context, selector: str, by: str = By.XPATH):
+        """First element matching selector under context (a driver or element), or None without waiting"""
+        elements = self.probe_all(context, selector, by)
+        return elements[0] if elements else None
+
+    def probe_all(self, context, selector: str, by: str = By.XPATH) -> List[Any]:
+        """Every element matching selector under context, without waiting"""
+        with self.timed('probe') as timing:
+            elements = context.find_elements(by, selector)
+            timing['hit'] = bool(elements)
+        return elements
+
+    def require(self, driver, selector: str, condition=EC.presence_of_element_located,
+                timeout: Optional[float] = None, by: str = By.XPATH):
+        """The element once condition((by, selector)) holds; raises TimeoutException after timeout"""
+        wait = WebDriverWait(driver, self.timeout if timeout is None else timeout, self.poll_interval)
+        with self.timed('wait') as timing:
+            element = wait.until(condition((by, selector)))
+            timing['hit'] = True
+        return element
+
+    def wait_for_any(self, driver, selectors: Sequence[str], clickable: bool = False,
+                     timeout: Optional[float] = None, by: str = By.XPATH) -> Tuple[Optional[str], Any]:
+        """(selector, element) for the first of selectors to match, waiting up to timeout for one to.
+
+        Each poll probes the selectors in order, so the wait ends as soon as
+        any of them appears; with clickable, only a displayed and enabled
+        element counts. Returns (None, None) on timeout.
+        """
+        def first_match(driver):
+            for selector in selectors:
+                for element in driver.find_elements(by, selector):
+                    try:
+                        if not clickable or (element.is_displayed() and element.is_enabled()):
+                            return selector, element
+                    except StaleElementReferenceException:
+                        continue
+            return False
+
+        wait = WebDriverWait(driver, self.timeout if timeout is None else timeout, self.poll_interval)
+        with self.timed('wait') as timing:
+            try:
+                match = wait.until(first_match)
+            except TimeoutException:
+                return None, None
+            timing['hit'] = True
+        return match
+
+    @contextmanager
+    def timed(self, label: str) -> Iterator[Dict[str, Any]]:
+        """Record the duration of the with-block under label.
+
+        If the block sets the yielded dict's 'hit' to True the duration is
+        also recorded under '<label>_hit', so lookups report their hit rate.
+        """
+        timing = {'hit': False}
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                labels = (label, f'{label}_hit') if timing['hit'] else (label,)
+                for name in labels:
+                    totals = self._timings.setdefault(name, [0, 0.0])
+                    totals[0] += 1
+                    totals[1] += elapsed
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Count, total and mean seconds per label ('probe', 'wait' and any timed() labels)"""
+        with self._lock:
+            return {
+                label: {
+                    'count': count,
+                    'total_seconds': round(total, 4),
+                    'mean_seconds': round(total / count, 4)
+                }
+                for label, (count, total) in sorted(self._timings.items())
+            }
+
+    def reset(self):
+        """Forget recorded timings"""
+        with self._lock:
+            self._timings.clear()
@@ -5,23 +5,27 @@ Full-featured version with AI matching, database integration, and advanced featu
 import time
 import random
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterator
 from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 
 from config import LinkedInConfig, JobApplicationConfig
-from database import DatabaseManager, JobApplication, JobSearch
-from ai_job_matcher import AIJobMatcher, UserProfile, JobMatch
+from database import DatabaseManager, JobApplication, JobSearch, canonical_job_key, DESCRIPTION_MINHASHER
+from ai_job_matcher import AIJobMatcher, UserProfile, CompiledProfile, JobMatch, top_k_by_score
+from requirements_cache import RequirementsCache
 from scheduler import AutomationScheduler
+from selector_registry import SelectorRegistry
+from element_finder import ElementFinder, PROBE_IMPLICIT_WAIT
+from wait_policy import WaitPolicy, Pacing
+from job_card_extractor import (JobCardExtractor, JobCardParser, LXML_AVAILABLE, ENHANCED_CARD_SELECTORS,
+                                ENHANCED_FIELD_SELECTORS)
 
 
 class EnhancedLinkedInAutomation:
@@ -35,12 +39,22 @@ class EnhancedLinkedInAutomation:
         
         # Initialize components
         self.db_manager = DatabaseManager()
-        self.ai_matcher = AIJobMatcher()
+        self.db_writer = self.db_manager.start_write_behind()
+        # Parsed job descriptions (and BM25 corpus statistics) are kept in the database across runs
+        self.ai_matcher = AIJobMatcher(RequirementsCache(store=self.db_manager),
+                                       scoring_mode=job_config.match_scoring_mode,
+                                       taxonomy=job_config.skill_taxonomy_path)
         self.scheduler = AutomationScheduler()
         
         # WebDriver components
         self.driver = None
-        self.wait = None
+        # Fallback lookups probe without waiting; elements that must appear get explicit waits
+        self.finder = ElementFinder(timeout=20)
+        # After each action wait for the page itself, with pacing as a separate minimum
+        self.waits = WaitPolicy(self.finder, Pacing(config.pacing_min_delay, config.pacing_max_delay),
+                                timeout=config.settle_timeout)
+        # Fallback selectors that have been matching are tried first, learned across runs
+        self.selector_registry = SelectorRegistry(store=self.db_manager)
         
         # Session tracking
         self.session_start_time = None
@@ -50,8 +64,20 @@ class EnhancedLinkedInAutomation:
         
         # AI matching
         self.user_profile = self._create_user_profile()
+        self.compiled_profile = CompiledProfile.from_profile(self.user_profile)
         self.min_match_score = 70.0  # Minimum AI match score to apply
         
+        # Job cards: 'script' reads every card in one execute_script call, 'html' parses the
+        # page source with lxml, 'elements' reads each field with WebDriver lookups
+        self.card_extraction_mode = 'script'
+        self.card_extractors = {'script': JobCardExtractor(ENHANCED_CARD_SELECTORS, ENHANCED_FIELD_SELECTORS)}
+        if LXML_AVAILABLE:
+            self.card_extractors['html'] = JobCardParser(ENHANCED_CARD_SELECTORS, ENHANCED_FIELD_SELECTORS)
+        
+        # Reposts of a job already applied to (or already seen this session)
+        self.near_duplicate_threshold = 0.9
+        self.duplicate_index = self.db_manager.near_duplicate_index(self.near_duplicate_threshold)
+        
         # Advanced features
         self.smart_filtering = True
         self.auto_messaging = False
@@ -80,7 +106,6 @@ class EnhancedLinkedInAutomation:
             self.detailed_logger.info("SESSION_START - Enhanced automation session initiated")
             
             self.driver = self._setup_enhanced_driver()
-            self.wait = WebDriverWait(self.driver, 20)
             
             # Set up session tracking
             self.session_start_time = datetime.now()
@@ -117,6 +142,8 @@ class EnhancedLinkedInAutomation:
         chrome_options.add_argument("--disable-plugins")
         chrome_options.add_argument("--disable-images")  # Faster loading
         chrome_options.add_argument("--disable-javascript")  # Optional: for faster loading
+        # Network events for WaitPolicy's network idle check
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
         
         # User agent
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
@@ -137,7 +164,7 @@ class EnhancedLinkedInAutomation:
         
         # Enhanced driver settings
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        driver.implicitly_wait(10)
+        driver.implicitly_wait(PROBE_IMPLICIT_WAIT)
         driver.set_page_load_timeout(30)
         
         return driver
@@ -149,32 +176,30 @@ class EnhancedLinkedInAutomation:
             self.detailed_logger.info("LOGIN_START - Enhanced login process initiated")
             
             self.driver.get("https://www.linkedin.com/login")
-            time.sleep(random.uniform(2, 4))
+            self.waits.settle(self.driver, 'navigate', selectors=["//input[@id='username']"])
             
             # Enhanced login with retry logic
             max_retries = 3
             for attempt in range(max_retries):
                 try:
                     # Email field
-                    email_field = self.wait.until(
-                        EC.presence_of_element_located((By.ID, "username"))
-                    )
+                    email_field = self.finder.require(self.driver, "username", by=By.ID)
                     email_field.clear()
                     email_field.send_keys(self.config.email)
-                    time.sleep(random.uniform(0.5, 1.5))
+                    self.waits.pace('type')
                     
                     # Password field
                     password_field = self.driver.find_element(By.ID, "password")
                     password_field.clear()
                     password_field.send_keys(self.config.password)
-                    time.sleep(random.uniform(0.5, 1.5))
+                    self.waits.pace('type')
                     
                     # Submit
                     login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
                     login_button.click()
                     
                     # Wait for login completion
-                    time.sleep(random.uniform(3, 5))
+                    self.waits.settle(self.driver, 'submit')
                     
                     # Check for successful login
                     if self._is_logged_in():
@@ -187,7 +212,7 @@ class EnhancedLinkedInAutomation:
                 except Exception as e:
                     self.logger.warning(f"Login attempt {attempt + 1} failed: {e}")
                     if attempt < max_retries - 1:
-                        time.sleep(random.uniform(2, 4))
+                        self.waits.pace('navigate')
             
             self.logger.error("All login attempts failed")
             self.detailed_logger.error("LOGIN_FAILED - All enhanced login attempts failed")
@@ -210,13 +235,9 @@ class EnhancedLinkedInAutomation:
                 "//button[contains(@aria-label, 'View profile')]"
             ]
             
-            for indicator in indicators:
-                try:
-                    element = self.driver.find_element(By.XPATH, indicator)
-                    if element:
-                        return True
-                except NoSuchElementException:
-                    continue
+            indicator, _ = self.finder.wait_for_any(self.driver, indicators, timeout=10)
+            if indicator:
+                return True
             
             # Check URL
             current_url = self.driver.current_url
@@ -271,14 +292,11 @@ class EnhancedLinkedInAutomation:
                     search_url += f"&f_C={size_mapping[self.job_config.company_size]}"
             
             self.driver.get(search_url)
-            time.sleep(random.uniform(3, 5))
+            self.waits.settle(self.driver, 'navigate')
             
             # Wait for job results to load
-            try:
-                self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "[data-test-id='job-card']"))
-                )
-            except TimeoutException:
+            selector, _ = self.finder.wait_for_any(self.driver, ENHANCED_CARD_SELECTORS)
+            if selector is None:
                 self.logger.warning("Job search results may not have loaded properly")
                 self.detailed_logger.warning("SEARCH_WARNING - Job results may not have loaded properly")
             
@@ -297,68 +315,38 @@ class EnhancedLinkedInAutomation:
             self.logger.info("Retrieving job listings with AI analysis...")
             self.detailed_logger.info("JOB_ANALYSIS_START - Starting AI-powered job analysis")
             
-            # Enhanced job selectors
-            job_selectors = [
-                "//div[contains(@class, 'job-card-container')]",
-                "//div[contains(@class, 'jobs-search-results-list')]//li",
-                "//div[contains(@data-test-id, 'job-card')]",
-                "//article[contains(@class, 'job-card')]",
-                "//div[contains(@class, 'base-card')]"
-            ]
-            
-            job_elements = []
-            for selector in job_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    if elements:
-                        job_elements = elements
-                        self.logger.info(f"Found {len(elements)} job elements using selector: {selector}")
-                        break
-                except Exception as e:
-                    self.logger.debug(f"Selector {selector} failed: {e}")
-                    continue
-            
-            if not job_elements:
+            cards = self._find_job_cards(limit=20)  # Limit to first 20 jobs
+            if not cards:
                 self.logger.warning("No job elements found with any selector")
                 self.detailed_logger.warning("JOB_ANALYSIS_WARNING - No job elements found")
                 return []
             
-            jobs = []
-            for i, job_element in enumerate(job_elements[:20]):  # Limit to first 20 jobs
+            # One lookup for every card whose fields were read up front
+            applied_keys = self.db_manager.has_applied(
+                canonical_job_key(card['url'], card['company'], card['title'])
+                for _, card in cards if card is not None)
+            
+            # Extract everything from the page first so scoring is not interleaved with Selenium calls
+            listings = []
+            for i, (job_element, card) in enumerate(cards):
                 try:
-                    job_data = self._extract_job_data_enhanced(job_element, i + 1)
+                    with self.finder.timed('card'):
+                        job_data = self._extract_job_data_enhanced(job_element, i + 1, card, applied_keys)
                     if job_data:
-                        # AI analysis
-                        if self.smart_filtering:
-                            job_match = self.ai_matcher.match_job(
-                                self.user_profile,
-                                job_data['title'],
-                                job_data.get('description', ''),
-                                job_data['company']
-                            )
-                            
-                            job_data['ai_match'] = {
-                                'score': job_match.match_score,
-                                'reasons': job_match.reasons,
-                                'missing_skills': job_match.missing_skills,
-                                'recommendations': job_match.recommended_actions
-                            }
-                            
-                            # Only include jobs above minimum match score
-                            if job_match.match_score >= self.min_match_score:
-                                jobs.append(job_data)
-                                self.logger.info(f"Job {i+1} passed AI filter (score: {job_match.match_score:.1f})")
-                            else:
-                                self.logger.info(f"Job {i+1} filtered out by AI (score: {job_match.match_score:.1f})")
-                        else:
-                            jobs.append(job_data)
-                        
+                        listings.append((i + 1, job_data))
                         self.jobs_processed += 1
-                        
                 except Exception as e:
                     self.logger.warning(f"Could not process job {i+1}: {e}")
                     continue
             
+            if not self.smart_filtering:
+                jobs = [job_data for _, job_data in listings]
+            else:
+                # AI analysis, keeping only the best matches the daily budget can be spent on
+                budget = self.scheduler.remaining_applications()
+                jobs = top_k_by_score(self._score_listings(listings), budget)
+                self.logger.info(f"Selected top {len(jobs)} jobs for remaining daily budget of {budget}")
+            
             self.logger.info(f"Retrieved {len(jobs)} jobs after AI filtering")
             self.detailed_logger.info(f"JOB_ANALYSIS_SUCCESS - Retrieved {len(jobs)} jobs after AI analysis")
             return jobs
@@ -368,23 +356,111 @@ class EnhancedLinkedInAutomation:
             self.detailed_logger.error(f"JOB_ANALYSIS_ERROR - Enhanced job analysis failed: {e}")
             return []
     
-    def _extract_job_data_enhanced(self, job_element, job_number: int) -> Optional[Dict[str, Any]]:
-        """Extract comprehensive job data with enhanced selectors"""
+    def _find_job_cards(self, limit: int) -> List[Tuple[Any, Optional[Dict[str, Any]]]]:
+        """(card element, extracted card fields) pairs for the job cards on the page.
+        
+        In 'script' and 'html' modes the fields of every card are read at once
+        (one execute_script call, or a parse of the page source); in
+        'elements' mode, or when that fails, only the elements are found and
+        fields are None, to be read element by element.
+        """
+        extractor = self.card_extractors.get(self.card_extraction_mode)
+        if extractor is not None:
+            try:
+                selector, cards = extractor.extract(self.driver, limit)
+                if cards:
+                    self.logger.info(f"Extracted {len(cards)} job cards in {self.card_extraction_mode} mode "
+                                     f"using selector: {selector}")
+                return [(card['element'], card) for card in cards]
+            except Exception as e:
+                self.logger.debug(f"Job card {self.card_extraction_mode} extraction failed, "
+                                  f"reading cards element by element: {e}")
+        
+        for selector in ENHANCED_CARD_SELECTORS:
+            try:
+                elements = self.finder.probe_all(self.driver, selector)
+                if elements:
+                    self.logger.info(f"Found {len(elements)} job elements using selector: {selector}")
+                    return [(element, None) for element in elements[:limit]]
+            except Exception as e:
+                self.logger.debug(f"Selector {selector} failed: {e}")
+                continue
+        return []
+    
+    def _score_listings(self, listings: List[Tuple[int, Dict[str, Any]]]) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """Score extracted listings, yielding (score, job_data) for jobs above the minimum match score"""
+        job_matches = self.ai_matcher.match_jobs(
+            self.compiled_profile, (job_data for _, job_data in listings)
+        )
+        for (job_number, job_data), job_match in zip(listings, job_matches):
+            job_data['ai_match'] = {
+                'score': job_match.match_score,
+                'reasons': job_match.reasons,
+                'missing_skills': job_match.missing_skills,
+                'recommendations': job_match.recommended_actions
+            }
+            
+            # Only include jobs above minimum match score
+            if job_match.match_score >= self.min_match_score:
+                self.logger.info(f"Job {job_number} passed AI filter (score: {job_match.match_score:.1f})")
+                yield job_match.match_score, job_data
+            else:
+                self.logger.info(f"Job {job_number} filtered out by AI (score: {job_match.match_score:.1f})")
+    
+    def _extract_job_data_enhanced(self, job_element, job_number: int,
+                                   card: Optional[Dict[str, Any]] = None,
+                                   applied_keys: Optional[Set[str]] = None) -> Optional[Dict[str, Any]]:
+        """Extract comprehensive job data with enhanced selectors.
+        
+        ``card`` holds fields already read by a card extractor; without it
+        they are read from job_element. ``applied_keys`` are the keys of the
+        page's cards already applied to, looked up together; without a card
+        the job is looked up on its own.
+        """
         try:
             # Extract basic information
-            title = self._extract_job_title_enhanced(job_element)
-            company = self._extract_company_name_enhanced(job_element)
-            location = self._extract_job_location(job_element)
-            salary = self._extract_job_salary(job_element)
-            job_url = self._extract_job_url(job_element)
+            if card is None:
+                title = self._extract_job_title_enhanced(job_element)
+                company = self._extract_company_name_enhanced(job_element)
+                location = self._extract_job_location(job_element)
+                salary = self._extract_job_salary(job_element)
+                job_url = self._extract_job_url(job_element)
+            else:
+                title, company = card['title'], card['company']
+                location, salary, job_url = card['location'], card['salary'], card['url']
             
             if not title or not company:
                 self.logger.warning(f"Could not extract title/company from job {job_number}")
                 return None
             
+            # Skip jobs we already applied to before clicking into the description
+            job_key = canonical_job_key(job_url, company, title)
+            if card is not None and applied_keys is not None:
+                already_applied = job_key in applied_keys
+            else:
+                already_applied = bool(self.db_manager.has_applied([job_key]))
+            if already_applied:
+                self.logger.info(f"Skipping job {job_number}, already applied: {title} at {company}")
+                self.detailed_logger.info(f"JOB_SKIPPED - Already applied to {title} at {company} ({job_key})")
+                return None
+            
             # Extract additional details
             description = self._extract_job_description(job_element)
-            easy_apply = self._check_easy_apply_enhanced(job_element)
+            
+            # Skip reposts (other titles, agencies) of jobs already applied to or seen this session
+            signature = DESCRIPTION_MINHASHER.signature(description) if description else None
+            if signature is not None:
+                duplicate = self.duplicate_index.find_duplicate(signature, exclude=job_key)
+                if duplicate:
+                    duplicate_key, similarity = duplicate
+                    self.logger.info(f"Skipping job {job_number}, near-duplicate of {duplicate_key} "
+                                     f"({similarity:.0%} similar): {title} at {company}")
+                    self.detailed_logger.info(f"JOB_SKIPPED - Near-duplicate posting {title} at {company} "
+                                              f"matches {duplicate_key} ({similarity:.0%})")
+                    return None
+                self.duplicate_index.add(job_key, signature)
+            
+            easy_apply = card['easy_apply'] if card is not None else self._check_easy_apply_enhanced(job_element)
             
             job_data = {
                 'title': title,
@@ -394,6 +470,7 @@ class EnhancedLinkedInAutomation:
                 'job_url': job_url,
                 'description': description,
                 'easy_apply': easy_apply,
+                'job_key': job_key,
                 'extracted_at': datetime.now().isoformat()
             }
             
@@ -406,113 +483,54 @@ class EnhancedLinkedInAutomation:
     
     def _extract_job_title_enhanced(self, job_element) -> str:
         """Enhanced job title extraction"""
-        title_selectors = [
-            ".//a[contains(@class, 'job-card-list__title')]",
-            ".//a[contains(@class, 'job-card-container__link')]",
-            ".//h3[contains(@class, 'job-card-list__title')]",
-            ".//span[contains(@class, 'job-card-list__title')]",
-            ".//a[contains(@data-control-name, 'job_card_click')]",
-            ".//a[contains(@class, 'base-card__full-link')]",
-            ".//h3[contains(@class, 'base-search-card__title')]",
-            ".//a[contains(@class, 'base-search-card__title')]",
-            ".//span[contains(@class, 'base-search-card__title')]",
-            ".//a[contains(@data-entity-urn, 'job')]",
-            ".//h3",
-            ".//a[contains(@href, '/jobs/view/')]"
-        ]
-        
-        for selector in title_selectors:
-            try:
-                element = job_element.find_element(By.XPATH, selector)
-                title = element.text.strip()
-                if title:
-                    return title
-            except NoSuchElementException:
-                continue
-        
-        return ""
+        title_selectors = ENHANCED_FIELD_SELECTORS['title']
+        return self.selector_registry.first_match(
+            'card.title', title_selectors, lambda selector: self._element_text(job_element, selector)) or ""
     
     def _extract_company_name_enhanced(self, job_element) -> str:
         """Enhanced company name extraction"""
-        company_selectors = [
-            ".//h4[contains(@class, 'job-card-container__company-name')]",
-            ".//a[contains(@class, 'job-card-container__company-name')]",
-            ".//h4[contains(@class, 'base-search-card__subtitle')]",
-            ".//a[contains(@class, 'base-search-card__subtitle')]",
-            ".//span[contains(@class, 'job-card-container__company-name')]",
-            ".//div[contains(@class, 'job-card-container__company-name')]",
-            ".//h4",
-            ".//a[contains(@href, '/company/')]"
-        ]
-        
-        for selector in company_selectors:
-            try:
-                element = job_element.find_element(By.XPATH, selector)
-                company = element.text.strip()
-                if company:
-                    return company
-            except NoSuchElementException:
-                continue
-        
-        return ""
+        company_selectors = ENHANCED_FIELD_SELECTORS['company']
+        return self.selector_registry.first_match(
+            'card.company', company_selectors, lambda selector: self._element_text(job_element, selector)) or ""
+    
+    def _element_text(self, parent, selector: str) -> str:
+        """Stripped text of the first element matching selector under parent, or '' if there is none"""
+        element = self.finder.probe(parent, selector)
+        return element.text.strip() if element is not None else ""
     
     def _extract_job_location(self, job_element) -> str:
         """Extract job location"""
-        location_selectors = [
-            ".//span[contains(@class, 'job-card-container__metadata-item')]",
-            ".//li[contains(@class, 'job-card-container__metadata-item')]",
-            ".//span[contains(@class, 'job-card-container__metadata-wrapper')]//span",
-            ".//div[contains(@class, 'job-card-container__metadata')]//span"
-        ]
+        location_selectors = ENHANCED_FIELD_SELECTORS['location']
         
         for selector in location_selectors:
-            try:
-                elements = job_element.find_elements(By.XPATH, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and any(keyword in text.lower() for keyword in ['remote', 'hybrid', 'on-site', 'location']):
-                        return text
-            except NoSuchElementException:
-                continue
+            for element in self.finder.probe_all(job_element, selector):
+                text = element.text.strip()
+                if text and any(keyword in text.lower() for keyword in ['remote', 'hybrid', 'on-site', 'location']):
+                    return text
         
         return ""
     
     def _extract_job_salary(self, job_element) -> str:
         """Extract job salary information"""
-        salary_selectors = [
-            ".//span[contains(@class, 'job-card-container__metadata-item')]",
-            ".//li[contains(@class, 'job-card-container__metadata-item')]"
-        ]
+        salary_selectors = ENHANCED_FIELD_SELECTORS['salary']
         
         for selector in salary_selectors:
-            try:
-                elements = job_element.find_elements(By.XPATH, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if '$' in text or 'salary' in text.lower() or 'compensation' in text.lower():
-                        return text
-            except NoSuchElementException:
-                continue
+            for element in self.finder.probe_all(job_element, selector):
+                text = element.text.strip()
+                if '$' in text or 'salary' in text.lower() or 'compensation' in text.lower():
+                    return text
         
         return ""
     
     def _extract_job_url(self, job_element) -> str:
         """Extract job URL"""
-        url_selectors = [
-            ".//a[contains(@class, 'job-card-list__title')]",
-            ".//a[contains(@class, 'job-card-container__link')]",
-            ".//a[contains(@data-control-name, 'job_card_click')]",
-            ".//a[contains(@href, '/jobs/view/')]"
-        ]
+        url_selectors = ENHANCED_FIELD_SELECTORS['url']
         
         for selector in url_selectors:
-            try:
-                element = job_element.find_element(By.XPATH, selector)
-                url = element.get_attribute('href')
-                if url:
-                    return url
-            except NoSuchElementException:
-                continue
+            element = self.finder.probe(job_element, selector)
+            url = element.get_attribute('href') if element is not None else None
+            if url:
+                return url
         
         return ""
     
@@ -522,7 +540,6 @@ class EnhancedLinkedInAutomation:
             # Try to click on job to get description
             clickable_element = job_element.find_element(By.XPATH, ".//a")
             clickable_element.click()
-            time.sleep(2)
             
             # Look for description
             description_selectors = [
@@ -531,14 +548,11 @@ class EnhancedLinkedInAutomation:
                 "//div[contains(@class, 'jobs-description')]"
             ]
             
-            for selector in description_selectors:
-                try:
-                    element = self.driver.find_element(By.XPATH, selector)
-                    description = element.text.strip()
-                    if description:
-                        return description[:1000]  # Limit length
-                except NoSuchElementException:
-                    continue
+            # The description panel loads after the click, in whichever layout the page uses
+            self.waits.settle(self.driver, 'click', selectors=description_selectors, network=False, dom=False)
+            selector, element = self.finder.wait_for_any(self.driver, description_selectors, timeout=0)
+            if element is not None:
+                return element.text.strip()[:1000]  # Limit length
             
             return ""
             
@@ -548,22 +562,9 @@ class EnhancedLinkedInAutomation:
     
     def _check_easy_apply_enhanced(self, job_element) -> bool:
         """Enhanced Easy Apply detection"""
-        easy_apply_selectors = [
-            ".//button[contains(@aria-label, 'Easy Apply')]",
-            ".//button[contains(@class, 'jobs-apply-button')]",
-            ".//span[contains(text(), 'Easy Apply')]",
-            ".//button[contains(text(), 'Easy Apply')]"
-        ]
+        easy_apply_selectors = ENHANCED_FIELD_SELECTORS['easy_apply']
         
-        for selector in easy_apply_selectors:
-            try:
-                element = job_element.find_element(By.XPATH, selector)
-                if element:
-                    return True
-            except NoSuchElementException:
-                continue
-        
-        return False
+        return any(self.finder.probe(job_element, selector) is not None for selector in easy_apply_selectors)
     
     def apply_to_job_enhanced(self, job_data: Dict[str, Any]) -> bool:
         """Enhanced job application with AI optimization"""
@@ -581,7 +582,7 @@ class EnhancedLinkedInAutomation:
             # Navigate to job if needed
             if job_data.get('job_url'):
                 self.driver.get(job_data['job_url'])
-                time.sleep(random.uniform(2, 4))
+                self.waits.settle(self.driver, 'navigate')
             
             # Find and click Easy Apply button
             easy_apply_button = self._find_easy_apply_button_enhanced()
@@ -591,7 +592,7 @@ class EnhancedLinkedInAutomation:
                 return False
             
             easy_apply_button.click()
-            time.sleep(random.uniform(2, 4))
+            self.waits.settle(self.driver, 'click', selectors=["//div[contains(@class, 'jobs-easy-apply-modal')]"])
             
             # Handle application form with AI optimization
             success = self._handle_application_form_enhanced(job_data)
@@ -608,15 +609,18 @@ class EnhancedLinkedInAutomation:
                     notes=f"AI Match Score: {job_data.get('ai_match', {}).get('score', 'N/A')}",
                     salary_range=job_data.get('salary', ''),
                     location=job_data.get('location', ''),
-                    job_description=job_data.get('description', '')
+                    job_description=job_data.get('description', ''),
+                    job_key=job_data.get('job_key', '')
                 )
                 
-                app_id = self.db_manager.add_job_application(application)
+                # Recorded by the background writer so the browser flow never waits on disk
+                write = self.db_writer.upsert_job_application(application)
+                write.add_done_callback(lambda future: self._log_application_recorded(future, job_data))
                 self.scheduler.record_application()
                 self.applications_sent += 1
                 
-                self.logger.info(f"Successfully applied to job (ID: {app_id})")
-                self.detailed_logger.info(f"APPLICATION_SUCCESS - Applied to {job_data['title']} at {job_data['company']} (ID: {app_id})")
+                self.logger.info("Successfully applied to job")
+                self.detailed_logger.info(f"APPLICATION_SUCCESS - Applied to {job_data['title']} at {job_data['company']}")
                 
                 # Cooldown between applications
                 cooldown = random.uniform(
@@ -636,6 +640,15 @@ class EnhancedLinkedInAutomation:
             self.detailed_logger.error(f"APPLICATION_ERROR - Enhanced application failed: {e}")
             return False
     
+    def _log_application_recorded(self, future, job_data: Dict[str, Any]):
+        """Log the outcome of a queued application write"""
+        error = future.exception()
+        if error is not None:
+            self.logger.error(f"Failed to record application for {job_data['title']} at {job_data['company']}: {error}")
+            self.detailed_logger.error(f"DATABASE_ERROR - Could not record {job_data['title']} at {job_data['company']}: {error}")
+        else:
+            self.logger.info(f"Recorded application for {job_data['title']} (ID: {future.result()})")
+    
     def _find_easy_apply_button_enhanced(self):
         """Enhanced Easy Apply button detection"""
         easy_apply_selectors = [
@@ -646,14 +659,11 @@ class EnhancedLinkedInAutomation:
             "//button[contains(@class, 'jobs-apply-button--top-card')]"
         ]
         
-        for selector in easy_apply_selectors:
-            try:
-                element = self.wait.until(EC.element_to_be_clickable((By.XPATH, selector)))
-                return element
-            except TimeoutException:
-                continue
-        
-        return None
+        # One explicit wait for whichever selector matches first, rather than a full timeout per miss
+        ordered = self.selector_registry.ordered('apply.easy_apply_button', easy_apply_selectors)
+        selector, element = self.finder.wait_for_any(self.driver, ordered, clickable=True)
+        self.selector_registry.record_result('apply.easy_apply_button', ordered, selector)
+        return element
     
     def _handle_application_form_enhanced(self, job_data: Dict[str, Any]) -> bool:
         """Enhanced application form handling with AI optimization"""
@@ -672,13 +682,13 @@ class EnhancedLinkedInAutomation:
                 next_button = self._find_next_button()
                 if next_button:
                     next_button.click()
-                    time.sleep(random.uniform(2, 4))
+                    self.waits.settle(self.driver, 'click')
                 else:
                     # Look for submit button
                     submit_button = self._find_submit_button()
                     if submit_button:
                         submit_button.click()
-                        time.sleep(random.uniform(3, 5))
+                        self.waits.settle(self.driver, 'submit')
                         return True
                     else:
                         self.logger.warning("No next or submit button found")
@@ -697,7 +707,7 @@ class EnhancedLinkedInAutomation:
             # Get AI-optimized resume keywords
             if self.resume_optimization and job_data.get('description'):
                 keywords = self.ai_matcher.optimize_resume_keywords(
-                    self.user_profile, 
+                    self.compiled_profile, 
                     job_data['description']
                 )
                 self.logger.info(f"AI suggested keywords: {keywords}")
@@ -746,18 +756,17 @@ Best regards,
         
         selectors = field_selectors.get(field_type, [])
         for selector in selectors:
-            try:
-                element = self.driver.find_element(By.XPATH, selector)
-                if field_type == "resume":
-                    # Handle file upload
-                    element.send_keys(value)
-                else:
-                    element.clear()
-                    element.send_keys(value)
-                time.sleep(random.uniform(0.5, 1.5))
-                return
-            except NoSuchElementException:
+            element = self.finder.probe(self.driver, selector)
+            if element is None:
                 continue
+            if field_type == "resume":
+                # Handle file upload
+                element.send_keys(value)
+            else:
+                element.clear()
+                element.send_keys(value)
+            self.waits.pace('type')
+            return
     
     def _find_next_button(self):
         """Find next button in application form"""
@@ -767,16 +776,8 @@ Best regards,
             "//button[contains(@aria-label, 'Continue')]",
             "//button[contains(@class, 'jobs-apply-button')]"
         ]
-        
-        for selector in next_selectors:
-            try:
-                element = self.driver.find_element(By.XPATH, selector)
-                if element.is_enabled():
-                    return element
-            except NoSuchElementException:
-                continue
-        
-        return None
+        return self.selector_registry.first_match('form.next_button', next_selectors, self._enabled_button,
+                                                  last_resort=next_selectors[-1:])
     
     def _find_submit_button(self):
         """Find submit button in application form"""
@@ -786,16 +787,14 @@ Best regards,
             "//button[contains(@aria-label, 'Submit')]",
             "//button[contains(@class, 'jobs-apply-button')]"
         ]
-        
-        for selector in submit_selectors:
-            try:
-                element = self.driver.find_element(By.XPATH, selector)
-                if element.is_enabled():
-                    return element
-            except NoSuchElementException:
-                continue
-        
-        return None
+        # The generic apply button class matches far more than form buttons, so it always goes last
+        return self.selector_registry.first_match('form.submit_button', submit_selectors, self._enabled_button,
+                                                  last_resort=submit_selectors[-1:])
+    
+    def _enabled_button(self, selector: str):
+        """The element matching selector if it is enabled, else None"""
+        element = self.finder.probe(self.driver, selector)
+        return element if element is not None and element.is_enabled() else None
     
     def run_automation_enhanced(self) -> Dict[str, Any]:
         """Run enhanced automation with full features"""
@@ -838,7 +837,7 @@ Best regards,
                 self.current_search_session.success_rate = (successful_applications / len(jobs) * 100) if jobs else 0
                 self.current_search_session.session_duration = int((datetime.now() - self.session_start_time).total_seconds() / 60)
                 
-                self.db_manager.add_job_search_session(self.current_search_session)
+                self.db_writer.add_job_search_session(self.current_search_session)
             
             result = {
                 "success": True,
@@ -870,6 +869,13 @@ Best regards,
                 self.detailed_logger.info("SESSION_END - Enhanced browser session closed")
         except Exception as e:
             self.logger.error(f"Error closing enhanced session: {e}")
+        
+        # Queue the selector statistics, then make sure every queued write reaches the database
+        self.selector_registry.save()
+        self.db_writer.flush()
+        self.logger.info(f"Job requirements cache: {self.ai_matcher.requirements_cache.stats}")
+        self.logger.debug(f"Selector statistics: {self.selector_registry.statistics()}")
+        self.logger.info(f"Element lookup timings: {self.finder.stats}")
     
     def get_application_stats(self) -> Dict[str, Any]:
         """Get comprehensive application statistics"""
@@ -881,6 +887,8 @@ Best regards,
             return {
                 "database_stats": analytics,
                 "daily_progress": daily_stats,
+                "selector_stats": self.selector_registry.statistics(),
+                "lookup_timings": self.finder.stats,
                 "session_stats": {
                     "applications_sent": self.applications_sent,
                     "jobs_processed": self.jobs_processed,
@@ -0,0 +1,45 @@
+"""
+Export job application history for analysis
+Streams the job_applications table to Parquet, Arrow, CSV or JSON Lines
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from database import DatabaseManager, EXPORT_FORMATS
+
+
+def main(argv=None):
+    """Main function for the export utility"""
+    parser = argparse.ArgumentParser(description="Export job applications from the automation database")
+    parser.add_argument("path", help="Output file, or '-' for stdout (csv/jsonl only)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=None,
+                        help="Output format (default: from the file extension, else csv)")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None,
+                        help="Only export applications on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--db", default="linkedin_automation.db", help="Database file")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows held in memory per chunk")
+    args = parser.parse_args(argv)
+
+    export_format = args.format
+    if export_format is None:
+        extension = args.path.rsplit('.', 1)[-1].lower() if '.' in args.path else ''
+        export_format = {'parquet': 'parquet', 'arrow': 'arrow', 'feather': 'arrow',
+                         'jsonl': 'jsonl', 'ndjson': 'jsonl'}.get(extension, 'csv')
+
+    db_manager = DatabaseManager(args.db)
+    try:
+        rows = db_manager.export(args.path, export_format, since=args.since, chunk_size=args.chunk_size)
+    except (ImportError, ValueError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    finally:
+        db_manager.close()
+
+    if args.path != '-':
+        print(f"[OK] Exported {rows} applications to {args.path} ({export_format})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""
+Job card extraction for LinkedIn search results
+Reads every card on the page in one execute_script call, or parses the page HTML with lxml,
+instead of per-field WebDriver lookups
+"""
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urljoin
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
+
+# Optional dependency: offline parsing of saved or fetched page HTML
+try:
+    from lxml import etree, html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+# Job card selectors of EnhancedLinkedInAutomation, first with results wins
+ENHANCED_CARD_SELECTORS = [
+    "//div[contains(@class, 'job-card-container')]",
+    "//div[contains(@class, 'jobs-search-results-list')]//li",
+    "//div[contains(@data-test-id, 'job-card')]",
+    "//article[contains(@class, 'job-card')]",
+    "//div[contains(@class, 'base-card')]"
+]
+
+# Job card selectors of LinkedInAutomation
+BASIC_CARD_SELECTORS = [
+    "//div[contains(@class, 'job-card-container')]",
+    "//div[contains(@class, 'jobs-search-results__list-item')]",
+    "//li[contains(@class, 'jobs-search-results__list-item')]",
+    "//div[contains(@class, 'job-card-list')]",
+    "//div[contains(@class, 'job-card')]",
+    "//li[contains(@class, 'job-card')]",
+    "//div[contains(@class, 'jobs-search-results__list')]//div[contains(@class, 'job-card')]"
+]
+
+# Card field selectors of EnhancedLinkedInAutomation, each list in fallback order
+ENHANCED_FIELD_SELECTORS = {
+    'title': [
+        ".//a[contains(@class, 'job-card-list__title')]",
+        ".//a[contains(@class, 'job-card-container__link')]",
+        ".//h3[contains(@class, 'job-card-list__title')]",
+        ".//span[contains(@class, 'job-card-list__title')]",
+        ".//a[contains(@data-control-name, 'job_card_click')]",
+        ".//a[contains(@class, 'base-card__full-link')]",
+        ".//h3[contains(@class, 'base-search-card__title')]",
+        ".//a[contains(@class, 'base-search-card__title')]",
+        ".//span[contains(@class, 'base-search-card__title')]",
+        ".//a[contains(@data-entity-urn, 'job')]",
+        ".//h3",
+        ".//a[contains(@href, '/jobs/view/')]"
+    ],
+    'company': [
+        ".//h4[contains(@class, 'job-card-container__company-name')]",
+        ".//a[contains(@class, 'job-card-container__company-name')]",
+        ".//h4[contains(@class, 'base-search-card__subtitle')]",
+        ".//a[contains(@class, 'base-search-card__subtitle')]",
+        ".//span[contains(@class, 'job-card-container__company-name')]",
+        ".//div[contains(@class, 'job-card-container__company-name')]",
+        ".//h4",
+        ".//a[contains(@href, '/company/')]"
+    ],
+    'location': [
+        ".//span[contains(@class, 'job-card-container__metadata-item')]",
+        ".//li[contains(@class, 'job-card-container__metadata-item')]",
+        ".//span[contains(@class, 'job-card-container__metadata-wrapper')]//span",
+        ".//div[contains(@class, 'job-card-container__metadata')]//span"
+    ],
+    'salary': [
+        ".//span[contains(@class, 'job-card-container__metadata-item')]",
+        ".//li[contains(@class, 'job-card-container__metadata-item')]"
+    ],
+    'url': [
+        ".//a[contains(@class, 'job-card-list__title')]",
+        ".//a[contains(@class, 'job-card-container__link')]",
+        ".//a[contains(@data-control-name, 'job_card_click')]",
+        ".//a[contains(@href, '/jobs/view/')]"
+    ],
+    'easy_apply': [
+        ".//button[contains(@aria-label, 'Easy Apply')]",
+        ".//button[contains(@class, 'jobs-apply-button')]",
+        ".//span[contains(text(), 'Easy Apply')]",
+        ".//button[contains(text(), 'Easy Apply')]"
+    ]
+}
+
+# Card field selectors of LinkedInAutomation (title, company and Easy Apply only)
+BASIC_FIELD_SELECTORS = {
+    'title': ENHANCED_FIELD_SELECTORS['title'],
+    'company': [
+        ".//a[contains(@class, 'job-card-container__company-name')]",
+        ".//h4[contains(@class, 'job-card-container__company-name')]",
+        ".//span[contains(@class, 'job-card-container__company-name')]",
+        ".//a[contains(@data-control-name, 'job_card_company_click')]",
+        ".//h4[contains(@class, 'base-search-card__subtitle')]",
+        ".//a[contains(@class, 'base-search-card__subtitle')]",
+        ".//span[contains(@class, 'base-search-card__subtitle')]",
+        ".//a[contains(@class, 'hidden-nested-link')]",
+        ".//h4",
+        ".//a[contains(@href, '/company/')]"
+    ],
+    'easy_apply': [
+        ".//button[contains(@aria-label, 'Easy Apply')]",
+        ".//button[contains(text(), 'Easy Apply')]",
+        ".//span[contains(text(), 'Easy Apply')]",
+        ".//button[contains(@class, 'jobs-apply-button')]"
+    ]
+}
+# LinkedInAutomation's minimum text lengths for a meaningful title and company
+BASIC_MIN_LENGTHS = {'title': 4, 'company': 2}
+
+# Relative card links are resolved against this, as the browser does for element.href
+LINKEDIN_BASE_URL = "https://www.linkedin.com/"
+
+# Metadata text that marks a location, and text that marks a salary
+LOCATION_KEYWORDS = ['remote', 'hybrid', 'on-site', 'location']
+SALARY_KEYWORDS = ['$', 'salary', 'compensation']
+
+# Runs in the page. Mirrors the Python extractors: title and company take the
+# first selector whose first match has enough text, location and salary the
+# first metadata item containing one of their keywords, url the first href,
+# and easy_apply whether any selector matches. Card elements are returned too
+# so callers can still click or apply through them.
+EXTRACT_CARDS_SCRIPT = r"""
+const [cardSelectors, fields, minLengths, locationKeywords, salaryKeywords, maxCards] = arguments;
+
+function evaluate(xpath, context, type) {
+    try {
+        return document.evaluate(xpath, context, null, type, null);
+    } catch (e) {
+        return null;
+    }
+}
+function first(xpath, context) {
+    const result = evaluate(xpath, context, XPathResult.FIRST_ORDERED_NODE_TYPE);
+    return result ? result.singleNodeValue : null;
+}
+function all(xpath, context) {
+    const result = evaluate(xpath, context, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE);
+    const nodes = [];
+    for (let i = 0; result && i < result.snapshotLength; i++) {
+        nodes.push(result.snapshotItem(i));
+    }
+    return nodes;
+}
+function text(node) {
+    return node ? (node.innerText || node.textContent || '').trim() : '';
+}
+function firstText(selectors, card, minLength) {
+    for (const xpath of selectors || []) {
+        const value = text(first(xpath, card));
+        if (value && value.length >= minLength) {
+            return value;
+        }
+    }
+    return '';
+}
+function textContaining(selectors, card, keywords) {
+    for (const xpath of selectors || []) {
+        for (const node of all(xpath, card)) {
+            const value = text(node);
+            if (value && keywords.some(keyword => value.toLowerCase().includes(keyword))) {
+                return value;
+            }
+        }
+    }
+    return '';
+}
+function firstHref(selectors, card) {
+    for (const xpath of selectors || []) {
+        const node = first(xpath, card);
+        const url = node ? (typeof node.href === 'string' ? node.href : node.getAttribute('href')) : null;
+        if (url) {
+            return url;
+        }
+    }
+    return '';
+}
+
+let cards = [];
+let selector = null;
+for (const xpath of cardSelectors) {
+    cards = all(xpath, document);
+    if (cards.length) {
+        selector = xpath;
+        break;
+    }
+}
+
+return {
+    selector: selector,
+    cards: cards.slice(0, maxCards).map(card => ({
+        element: card,
+        title: firstText(fields.title, card, minLengths.title || 1),
+        company: firstText(fields.company, card, minLengths.company || 1),
+        location: textContaining(fields.location, card, locationKeywords),
+        salary: textContaining(fields.salary, card, salaryKeywords),
+        url: firstHref(fields.url, card),
+        easy_apply: (fields.easy_apply || []).some(xpath => first(xpath, card) !== null)
+    }))
+};
+"""
+
+
+class JobCardExtractor:
+    """Extracts all job cards on a search results page in one browser round trip.
+
+    Per-element extraction costs a WebDriver request for every selector tried
+    on every field of every card; ``extract`` evaluates the same selector
+    fallbacks inside the page and returns a list of card dicts with title,
+    company, location, salary, url, easy_apply and the card's element.
+    Fields without selectors come back empty.
+    """
+
+    def __init__(self, card_selectors: List[str], field_selectors: Dict[str, List[str]],
+                 min_lengths: Optional[Dict[str, int]] = None):
+        self.card_selectors = list(card_selectors)
+        self.field_selectors = field_selectors
+        self.min_lengths = min_lengths or {}
+        self.logger = logging.getLogger(__name__)
+
+    def extract(self, driver, max_cards: int) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """(matching card selector, card dicts) for the first card selector with results.
+
+        Raises WebDriverException when the script cannot run, so callers can
+        fall back to per-element extraction.
+        """
+        result = driver.execute_script(EXTRACT_CARDS_SCRIPT, self.card_selectors, self.field_selectors,
+                                       self.min_lengths, LOCATION_KEYWORDS, SALARY_KEYWORDS, max_cards)
+        if not isinstance(result, dict) or not isinstance(result.get('cards'), list):
+            raise WebDriverException("Job card extraction script returned no result")
+        return result.get('selector'), result['cards']
+
+
+class JobCardParser:
+    """Parses job cards out of page HTML with lxml, away from the browser.
+
+    Takes ``driver.page_source`` (or a saved page) and applies the same
+    card and field selector fallbacks as JobCardExtractor, compiled once
+    per parser. Card dicts have the extractor's fields plus ``index``, the
+    card's position among the matches of ``selector``, for pairing with
+    live elements. Parsers pickle, so pages can be parsed in a process pool.
+    """
+
+    def __init__(self, card_selectors: List[str] = ENHANCED_CARD_SELECTORS,
+                 field_selectors: Dict[str, List[str]] = ENHANCED_FIELD_SELECTORS,
+                 min_lengths: Optional[Dict[str, int]] = None, base_url: str = LINKEDIN_BASE_URL):
+        if not LXML_AVAILABLE:
+            raise ImportError("lxml is required for HTML job card parsing (pip install lxml)")
+        self.card_selectors = list(card_selectors)
+        self.field_selectors = field_selectors
+        self.min_lengths = min_lengths or {}
+        self.base_url = base_url
+        self._compile()
+
+    def _compile(self):
+        self._cards = [(selector, etree.XPath(selector)) for selector in self.card_selectors]
+        self._fields = {field: [etree.XPath(selector) for selector in selectors]
+                        for field, selectors in self.field_selectors.items()}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Compiled XPath objects do not pickle; recompile on the other side
+        state = self.__dict__.copy()
+        del state['_cards'], state['_fields']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._compile()
+
+    @staticmethod
+    def _text(node) -> str:
+        # Whitespace collapsed, close to what element.text gives for rendered cards
+        return ' '.join(node.text_content().split()) if hasattr(node, 'text_content') else ''
+
+    def _first_text(self, card, field: str) -> str:
+        min_length = self.min_lengths.get(field, 1)
+        for xpath in self._fields.get(field, []):
+            nodes = xpath(card)
+            value = self._text(nodes[0]) if nodes else ''
+            if len(value) >= min_length:
+                return value
+        return ''
+
+    def _text_containing(self, card, field: str, keywords: List[str]) -> str:
+        for xpath in self._fields.get(field, []):
+            for node in xpath(card):
+                value = self._text(node)
+                if value and any(keyword in value.lower() for keyword in keywords):
+                    return value
+        return ''
+
+    def _first_href(self, card) -> str:
+        for xpath in self._fields.get('url', []):
+            nodes = xpath(card)
+            href = nodes[0].get('href') if nodes and hasattr(nodes[0], 'get') else None
+            if href:
+                return urljoin(self.base_url, href)
+        return ''
+
+    def parse(self, page_html: str, max_cards: Optional[int] = None) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """(matching card selector, card dicts) for the first card selector with results"""
+        if not page_html or not page_html.strip():
+            return None, []
+        document = lxml_html.fromstring(page_html)
+        for selector, xpath in self._cards:
+            cards = xpath(document)
+            if cards:
+                break
+        else:
+            return None, []
+
+        return selector, [
+            {
+                'index': index,
+                'title': self._first_text(card, 'title'),
+                'company': self._first_text(card, 'company'),
+                'location': self._text_containing(card, 'location', LOCATION_KEYWORDS),
+                'salary': self._text_containing(card, 'salary', SALARY_KEYWORDS),
+                'url': self._first_href(card),
+                'easy_apply': any(xpath(card) for xpath in self._fields.get('easy_apply', []))
+            }
+            for index, card in enumerate(cards[:max_cards])
+        ]
+
+    def extract(self, driver, max_cards: int) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """Like JobCardExtractor.extract, from ``driver.page_source``.
+
+        Cards are paired with the live elements of the matching selector
+        (one more round trip) so callers can click or apply through them.
+        Raises WebDriverException if the cards changed in between.
+        """
+        selector, cards = self.parse(driver.page_source, max_cards)
+        if not cards:
+            return selector, cards
+        elements = driver.find_elements(By.XPATH, selector)
+        if len(elements) < len(cards):
+            raise WebDriverException("Job cards changed while the page source was parsed")
+        for card in cards:
+            card['element'] = elements[card['index']]
+        return selector, cards
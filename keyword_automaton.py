@@ -0,0 +1,134 @@
+"""
+Multi-pattern keyword matching for job descriptions
+Aho-Corasick automaton over word tokens, so every term is found in a single pass
+"""
+import re
+from collections import deque, Counter
+from typing import List, Dict, Any, Iterable, Iterator, Hashable
+
+
+# Words, or single punctuation characters so terms like "c++", "node.js" and
+# "ci/cd" tokenize the same way in patterns and in text. Matching on whole
+# tokens gives word boundaries for free: "r" never matches inside "scrum".
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split lower-cased text into match tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton whose alphabet is tokens rather than characters.
+
+    Add every term with ``add(term, payload)``, call ``build()`` once, then
+    ``find(text)`` reports the payload of every occurrence of every term in
+    one left-to-right pass over the text's tokens, including terms nested
+    in longer ones (``sql`` inside ``sql server``).
+    """
+
+    def __init__(self):
+        # Node 0 is the root; each node is a dict token -> child node id
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Hashable]] = [[]]
+        self._built = False
+        self.term_count = 0
+
+    def add(self, term: str, payload: Hashable):
+        """Register a term; payload is reported for each occurrence"""
+        if self._built:
+            raise RuntimeError("Cannot add terms after build()")
+
+        tokens = tokenize(term)
+        if not tokens:
+            return
+
+        node = 0
+        for token in tokens:
+            child = self._goto[node].get(token)
+            if child is None:
+                child = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][token] = child
+            node = child
+
+        if payload not in self._output[node]:
+            self._output[node].append(payload)
+            self.term_count += 1
+
+    def build(self) -> 'KeywordAutomaton':
+        """Compute failure links and merged outputs (breadth-first)"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit outputs of the longest proper suffix that is a term
+                self._output[child] = self._output[child] + [
+                    payload for payload in self._output[self._fail[child]]
+                    if payload not in self._output[child]
+                ]
+        self._built = True
+        return self
+
+    def find_tokens(self, tokens: Iterable[str]) -> Iterator[Hashable]:
+        """Yield the payload of every term occurrence in a token sequence"""
+        if not self._built:
+            self.build()
+
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for token in tokens:
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if output[node]:
+                yield from output[node]
+
+    def find(self, text: str) -> Iterator[Hashable]:
+        """Yield the payload of every term occurrence in text"""
+        return self.find_tokens(tokenize(text))
+
+    def count(self, text: str) -> Counter:
+        """Occurrences of each payload in text"""
+        return Counter(self.find(text))
+
+    def count_tokens(self, tokens: Iterable[str]) -> Counter:
+        """Occurrences of each payload in an already tokenized text"""
+        return Counter(self.find_tokens(tokens))
+
+    def __len__(self) -> int:
+        return self.term_count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The built automaton as JSON-serialisable data (tuple payloads become lists)"""
+        if not self._built:
+            self.build()
+        return {'goto': self._goto, 'fail': self._fail, 'output': self._output, 'term_count': self.term_count}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'KeywordAutomaton':
+        """Rebuild an automaton from to_dict() data without recomputing it"""
+        goto, fail, output = data['goto'], data['fail'], data['output']
+        if not (len(goto) == len(fail) == len(output) and goto):
+            raise ValueError("Inconsistent automaton data")
+        nodes = len(goto)
+        if any(not 0 <= node < nodes for node in fail) or any(
+                not 0 <= child < nodes for children in goto for child in children.values()):
+            raise ValueError("Automaton data refers to missing nodes")
+        automaton = cls()
+        automaton._goto = [dict(children) for children in goto]
+        automaton._fail = list(fail)
+        automaton._output = [[tuple(payload) if isinstance(payload, list) else payload for payload in payloads]
+                             for payloads in output]
+        automaton.term_count = data['term_count']
+        automaton._built = True
+        return automaton
@@ -4,7 +4,7 @@ Core automation class for LinkedIn job searching and application
 """
 import time
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -12,11 +12,15 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
 from comprehensive_logging import AutomationLogger
 from config import LinkedInConfig, JobApplicationConfig
+from element_finder import ElementFinder, PROBE_IMPLICIT_WAIT
+from wait_policy import WaitPolicy, Pacing
+from job_card_extractor import (JobCardExtractor, JobCardParser, LXML_AVAILABLE, BASIC_CARD_SELECTORS,
+                                BASIC_FIELD_SELECTORS, BASIC_MIN_LENGTHS)
 
 
 class LinkedInAutomation:
@@ -36,9 +40,20 @@ class LinkedInAutomation:
         self.job_config = job_config
         self.driver: Optional[webdriver.Chrome] = None
         self.wait: Optional[WebDriverWait] = None
+        # Times element lookups; the driver runs without implicit waits so misses return at once
+        self.finder = ElementFinder(timeout=config.element_wait_timeout)
+        # After each action wait for the page itself, with pacing as a separate minimum
+        self.waits = WaitPolicy(self.finder, Pacing(config.pacing_min_delay, config.pacing_max_delay),
+                                timeout=config.settle_timeout)
         self.logger = self._setup_logger()
         self.comprehensive_logger = AutomationLogger()
         self.applications_today = 0
+        # Job cards: 'script' reads every card in one execute_script call, 'html' parses the
+        # page source with lxml, 'elements' reads each field with WebDriver lookups
+        self.card_extraction_mode = 'script'
+        self.card_extractors = {'script': JobCardExtractor(BASIC_CARD_SELECTORS, BASIC_FIELD_SELECTORS, BASIC_MIN_LENGTHS)}
+        if LXML_AVAILABLE:
+            self.card_extractors['html'] = JobCardParser(BASIC_CARD_SELECTORS, BASIC_FIELD_SELECTORS, BASIC_MIN_LENGTHS)
         
     def _setup_logger(self) -> logging.Logger:
         """Setup logging configuration"""
@@ -84,6 +99,8 @@ class LinkedInAutomation:
         chrome_options.add_argument("--disable-features=VizDisplayCompositor")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        # Network events for WaitPolicy's network idle check
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
         
         # Use ChromeDriver with smart fallback handling
         service = None
@@ -125,8 +142,9 @@ class LinkedInAutomation:
             raise Exception("All ChromeDriver approaches failed - please update Chrome or ChromeDriver")
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
-        # Set timeouts
-        driver.implicitly_wait(self.config.implicit_wait)
+        # Set timeouts. Fallback selector chains rely on misses failing fast, so there is
+        # no implicit wait; required elements are waited for explicitly (self.wait)
+        driver.implicitly_wait(PROBE_IMPLICIT_WAIT)
         driver.set_page_load_timeout(self.config.page_load_timeout)
         
         return driver
@@ -252,7 +270,7 @@ class LinkedInAutomation:
             self.driver.get(search_url)
             
             # Wait for page to load
-            time.sleep(5)
+            self.waits.settle(self.driver, 'navigate')
             
             # Wait for job listings to appear with extended timeout and multiple attempts
             job_loaded = False
@@ -285,8 +303,8 @@ class LinkedInAutomation:
                 self.logger.warning("Job search results may not have loaded properly - will attempt to extract anyway")
                 self.comprehensive_logger.log_error("Job Search", "Results may not have loaded", "All selectors timed out")
                 
-                # Wait a bit more for any dynamic content
-                time.sleep(5)
+                # Give any dynamic content a chance to finish loading
+                self.waits.settle(self.driver, 'navigate')
             
             self.logger.info("Job search completed successfully")
             self.comprehensive_logger.log_step(3, "Job Search", "COMPLETED")
@@ -311,7 +329,7 @@ class LinkedInAutomation:
                 EC.element_to_be_clickable((By.XPATH, "//button[contains(@aria-label, 'Easy Apply filter')]"))
             )
             easy_apply_filter.click()
-            time.sleep(2)  # Wait for filter to apply
+            self.waits.settle(self.driver, 'click')  # Wait for filter to apply
             
             self.logger.info("Easy Apply filter applied successfully")
             return True
@@ -343,62 +361,44 @@ class LinkedInAutomation:
             self.logger.info("Scrolling to load more job listings...")
             for scroll_attempt in range(3):
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(3)  # Wait longer for dynamic content to load
+                # Wait until the lazy-loaded cards have arrived and rendered
+                self.waits.settle(self.driver, 'scroll')
                 self.logger.info(f"Scroll attempt {scroll_attempt + 1}/3 completed")
             
-            # Wait a bit more for any lazy-loaded content
-            time.sleep(2)
-            
             # Try multiple selectors for job cards (LinkedIn has different layouts)
-            job_selectors = [
-                "//div[contains(@class, 'job-card-container')]",
-                "//div[contains(@class, 'jobs-search-results__list-item')]",
-                "//li[contains(@class, 'jobs-search-results__list-item')]",
-                "//div[contains(@class, 'job-card-list')]",
-                "//div[contains(@class, 'job-card')]",
-                "//li[contains(@class, 'job-card')]",
-                "//div[contains(@class, 'jobs-search-results__list')]//div[contains(@class, 'job-card')]"
-            ]
-            
-            job_elements = []
-            for selector in job_selectors:
-                elements = self.driver.find_elements(By.XPATH, selector)
-                if elements:
-                    job_elements = elements
-                    self.logger.info(f"Found {len(elements)} job elements using selector: {selector}")
-                    break
-            
-            if not job_elements:
+            cards = self._find_job_cards(max_jobs)
+            if not cards:
                 self.logger.warning("No job elements found with any selector")
                 self.comprehensive_logger.log_error("Job Extraction", "No job elements found", "All selectors failed")
                 return []
             
-            for i, job_element in enumerate(job_elements[:max_jobs]):
+            for i, (job_element, card) in enumerate(cards):
                 try:
-                    # Extract job information with multiple selectors
-                    title = self._extract_job_title(job_element)
-                    company = self._extract_company_name(job_element)
-                    
-                    if not title or not company:
-                        self.logger.warning(f"Could not extract title/company from job {i+1}")
-                        self.comprehensive_logger.log_error("Job Extraction", f"Could not extract title/company from job {i+1}", "Missing job information")
-                        # Debug: log the HTML structure for troubleshooting
-                        self._debug_job_element(job_element, i+1)
-                        continue
-                    
-                    # Check if Easy Apply button exists
-                    has_easy_apply = self._check_easy_apply(job_element)
-                    
-                    job_info = {
-                        'title': title,
-                        'company': company,
-                        'has_easy_apply': has_easy_apply,
-                        'element': job_element
-                    }
-                    
-                    jobs.append(job_info)
-                    self.logger.info(f"Job {i+1}: {title} at {company} - Easy Apply: {has_easy_apply}")
-                    self.comprehensive_logger.log_job_found(i+1, title, company, has_easy_apply)
+                    with self.finder.timed('card'):
+                        # Extract job information with multiple selectors, unless a card extractor already did
+                        title = card['title'] if card is not None else self._extract_job_title(job_element)
+                        company = card['company'] if card is not None else self._extract_company_name(job_element)
+                        
+                        if not title or not company:
+                            self.logger.warning(f"Could not extract title/company from job {i+1}")
+                            self.comprehensive_logger.log_error("Job Extraction", f"Could not extract title/company from job {i+1}", "Missing job information")
+                            # Debug: log the HTML structure for troubleshooting
+                            self._debug_job_element(job_element, i+1)
+                            continue
+                        
+                        # Check if Easy Apply button exists
+                        has_easy_apply = card['easy_apply'] if card is not None else self._check_easy_apply(job_element)
+                        
+                        job_info = {
+                            'title': title,
+                            'company': company,
+                            'has_easy_apply': has_easy_apply,
+                            'element': job_element
+                        }
+                        
+                        jobs.append(job_info)
+                        self.logger.info(f"Job {i+1}: {title} at {company} - Easy Apply: {has_easy_apply}")
+                        self.comprehensive_logger.log_job_found(i+1, title, company, has_easy_apply)
                     
                 except Exception as e:
                     self.logger.warning(f"Could not extract info from job {i+1}: {e}")
@@ -412,77 +412,65 @@ class LinkedInAutomation:
             self.logger.error(f"Failed to get job listings: {e}")
             return []
     
+    def _find_job_cards(self, max_jobs: int) -> List[Tuple[Any, Optional[Dict[str, Any]]]]:
+        """
+        Find the job cards on the page
+        
+        Args:
+            max_jobs: Maximum number of cards to return
+            
+        Returns:
+            (card element, card fields) pairs; fields are read for all cards at once
+            in 'script' mode (one execute_script call) and 'html' mode (a parse of the
+            page source), and are None when they must be read element by element
+        """
+        extractor = self.card_extractors.get(self.card_extraction_mode)
+        if extractor is not None:
+            try:
+                selector, cards = extractor.extract(self.driver, max_jobs)
+                if cards:
+                    self.logger.info(f"Extracted {len(cards)} job cards in {self.card_extraction_mode} mode "
+                                     f"using selector: {selector}")
+                return [(card['element'], card) for card in cards]
+            except Exception as e:
+                self.logger.debug(f"Job card {self.card_extraction_mode} extraction failed, "
+                                  f"reading cards element by element: {e}")
+        
+        for selector in BASIC_CARD_SELECTORS:
+            elements = self.driver.find_elements(By.XPATH, selector)
+            if elements:
+                self.logger.info(f"Found {len(elements)} job elements using selector: {selector}")
+                return [(element, None) for element in elements[:max_jobs]]
+        return []
+    
     def _extract_job_title(self, job_element) -> str:
         """Extract job title from job element"""
-        title_selectors = [
-            ".//a[contains(@class, 'job-card-list__title')]",
-            ".//a[contains(@class, 'job-card-container__link')]",
-            ".//h3[contains(@class, 'job-card-list__title')]",
-            ".//span[contains(@class, 'job-card-list__title')]",
-            ".//a[contains(@data-control-name, 'job_card_click')]",
-            ".//a[contains(@class, 'base-card__full-link')]",
-            ".//h3[contains(@class, 'base-search-card__title')]",
-            ".//a[contains(@class, 'base-search-card__title')]",
-            ".//span[contains(@class, 'base-search-card__title')]",
-            ".//a[contains(@data-entity-urn, 'job')]",
-            ".//h3",
-            ".//a[contains(@href, '/jobs/view/')]"
-        ]
+        title_selectors = BASIC_FIELD_SELECTORS['title']
         
         for selector in title_selectors:
-            try:
-                element = job_element.find_element(By.XPATH, selector)
-                title = element.text.strip()
-                if title and len(title) > 3:  # Ensure it's a meaningful title
-                    return title
-            except NoSuchElementException:
-                continue
+            element = self.finder.probe(job_element, selector)
+            title = element.text.strip() if element is not None else ""
+            if title and len(title) > 3:  # Ensure it's a meaningful title
+                return title
         
         return ""
     
     def _extract_company_name(self, job_element) -> str:
         """Extract company name from job element"""
-        company_selectors = [
-            ".//a[contains(@class, 'job-card-container__company-name')]",
-            ".//h4[contains(@class, 'job-card-container__company-name')]",
-            ".//span[contains(@class, 'job-card-container__company-name')]",
-            ".//a[contains(@data-control-name, 'job_card_company_click')]",
-            ".//h4[contains(@class, 'base-search-card__subtitle')]",
-            ".//a[contains(@class, 'base-search-card__subtitle')]",
-            ".//span[contains(@class, 'base-search-card__subtitle')]",
-            ".//a[contains(@class, 'hidden-nested-link')]",
-            ".//h4",
-            ".//a[contains(@href, '/company/')]"
-        ]
+        company_selectors = BASIC_FIELD_SELECTORS['company']
         
         for selector in company_selectors:
-            try:
-                element = job_element.find_element(By.XPATH, selector)
-                company = element.text.strip()
-                if company and len(company) > 1:  # Ensure it's a meaningful company name
-                    return company
-            except NoSuchElementException:
-                continue
+            element = self.finder.probe(job_element, selector)
+            company = element.text.strip() if element is not None else ""
+            if company and len(company) > 1:  # Ensure it's a meaningful company name
+                return company
         
         return ""
     
     def _check_easy_apply(self, job_element) -> bool:
         """Check if job has Easy Apply option"""
-        easy_apply_selectors = [
-            ".//button[contains(@aria-label, 'Easy Apply')]",
-            ".//button[contains(text(), 'Easy Apply')]",
-            ".//span[contains(text(), 'Easy Apply')]",
-            ".//button[contains(@class, 'jobs-apply-button')]"
-        ]
-        
-        for selector in easy_apply_selectors:
-            try:
-                job_element.find_element(By.XPATH, selector)
-                return True
-            except NoSuchElementException:
-                continue
-        
-        return False
+        easy_apply_selectors = BASIC_FIELD_SELECTORS['easy_apply']
+        return any(self.finder.probe(job_element, selector) is not None for selector in easy_apply_selectors)
     
     def _debug_job_element(self, job_element, job_number: int):
         """Debug method to log job element structure for troubleshooting"""
@@ -539,11 +527,9 @@ class LinkedInAutomation:
             ]
             
             for selector in easy_apply_selectors:
-                try:
-                    easy_apply_button = job_info['element'].find_element(By.XPATH, selector)
+                easy_apply_button = self.finder.probe(job_info['element'], selector)
+                if easy_apply_button is not None:
                     break
-                except NoSuchElementException:
-                    continue
             
             if not easy_apply_button:
                 self.logger.warning(f"Could not find Easy Apply button for {job_info['title']}")
@@ -552,11 +538,11 @@ class LinkedInAutomation:
             
             # Scroll to button and click
             self.driver.execute_script("arguments[0].scrollIntoView(true);", easy_apply_button)
-            time.sleep(1)
+            self.waits.pace('scroll')
             easy_apply_button.click()
             
             # Wait for application modal to appear
-            time.sleep(3)
+            self.waits.settle(self.driver, 'click', selectors=["//div[contains(@class, 'jobs-easy-apply-modal')]"])
             
             # Handle application form (simplified for MVP)
             success = self._handle_application_form()
@@ -593,9 +579,6 @@ class LinkedInAutomation:
             )
             submit_button.click()
             
-            # Wait for confirmation
-            time.sleep(2)
-            
             # Check if application was successful (look for success message or modal close)
             try:
                 # Look for success indicators
@@ -605,12 +588,12 @@ class LinkedInAutomation:
                     "//button[contains(@aria-label, 'Applied')]"
                 ]
                 
+                # Wait for confirmation
+                self.waits.settle(self.driver, 'submit', selectors=success_indicators)
+                
                 for indicator in success_indicators:
-                    try:
-                        self.driver.find_element(By.XPATH, indicator)
+                    if self.finder.probe(self.driver, indicator) is not None:
                         return True
-                    except NoSuchElementException:
-                        continue
                         
                 return True  # Assume success if no error occurred
                 
@@ -668,6 +651,7 @@ class LinkedInAutomation:
                 self.driver.quit()
                 self.driver = None
                 self.logger.info("Browser session closed")
+                self.logger.info(f"Element lookup timings: {self.finder.stats}")
             except Exception as e:
                 self.logger.warning(f"Error closing browser session: {e}")
                 self.driver = None
@@ -0,0 +1,114 @@
+"""
+Versioned schema migrations for the SQLite database
+Applies ordered, idempotent upgrade steps tracked with PRAGMA user_version
+"""
+import sqlite3
+import logging
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Callable, Iterator
+
+
+@dataclass
+class Migration:
+    """A single schema upgrade step.
+
+    ``schema`` runs in one short transaction and must be idempotent
+    (``IF NOT EXISTS``, column checks, ...). ``backfill`` is an optional
+    generator that updates existing rows in chunks of ``batch_size`` and
+    yields the number of rows touched after each chunk; the runner commits
+    between chunks so the write lock is never held for long. A backfill
+    must be safe to restart from the beginning.
+    """
+    version: int
+    description: str
+    schema: Callable[[sqlite3.Cursor], None]
+    backfill: Optional[Callable[[sqlite3.Cursor, int], Iterator[int]]] = None
+    optional: bool = False  # failure is logged and skipped instead of raised
+
+
+class MigrationRunner:
+    """Applies pending migrations to a connection in version order"""
+
+    def __init__(self, conn: sqlite3.Connection, migrations: List[Migration], batch_size: int = 1000):
+        versions = [migration.version for migration in migrations]
+        if versions != sorted(set(versions)) or (versions and versions[0] < 1):
+            raise ValueError("Migration versions must be unique, positive and in ascending order")
+
+        self.conn = conn
+        self.migrations = migrations
+        self.batch_size = max(1, batch_size)
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def current_version(self) -> int:
+        """Schema version recorded in the database"""
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    @property
+    def latest_version(self) -> int:
+        """Version the database will be at once every migration has run"""
+        return self.migrations[-1].version if self.migrations else 0
+
+    def pending(self) -> List[Migration]:
+        """Migrations newer than the database's recorded version"""
+        current = self.current_version
+        return [migration for migration in self.migrations if migration.version > current]
+
+    def run(self, dry_run: bool = False) -> List[Dict[str, Any]]:
+        """Apply pending migrations, or only report them when dry_run is set.
+
+        Returns one entry per pending migration describing what was (or
+        would be) done.
+        """
+        report = []
+        for migration in self.pending():
+            entry = {
+                'version': migration.version,
+                'description': migration.description,
+                'has_backfill': migration.backfill is not None,
+                'rows_backfilled': 0,
+                'applied': False
+            }
+            report.append(entry)
+
+            if dry_run:
+                self.logger.info(f"[dry run] Would apply migration {migration.version}: {migration.description}")
+                continue
+
+            try:
+                entry['rows_backfilled'] = self._apply(migration)
+                entry['applied'] = True
+            except sqlite3.Error as e:
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                if not migration.optional:
+                    raise
+                self.logger.warning(f"Skipping optional migration {migration.version} ({migration.description}): {e}")
+                self._set_version(migration.version)
+
+        return report
+
+    def _apply(self, migration: Migration) -> int:
+        self.logger.info(f"Applying migration {migration.version}: {migration.description}")
+        cursor = self.conn.cursor()
+
+        cursor.execute("BEGIN IMMEDIATE")
+        migration.schema(cursor)
+        self.conn.commit()
+
+        rows = 0
+        if migration.backfill is not None:
+            for count in migration.backfill(cursor, self.batch_size):
+                self.conn.commit()
+                rows += count
+                self.logger.debug(f"Migration {migration.version} backfilled {rows} rows so far")
+            self.conn.commit()
+
+        self._set_version(migration.version)
+        self.logger.info(f"Migration {migration.version} complete ({rows} rows backfilled)")
+        return rows
+
+    def _set_version(self, version: int):
+        # PRAGMA arguments cannot be bound parameters; version is always an int
+        self.conn.execute(f"PRAGMA user_version = {int(version)}")
+        self.conn.commit()
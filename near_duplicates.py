@@ -0,0 +1,170 @@
+"""
+Near-duplicate job posting detection
+MinHash signatures over description shingles and an LSH index for fast similarity lookups
+"""
+import re
+import random
+import struct
+import hashlib
+from typing import List, Dict, Optional, Iterable, Tuple, Hashable
+
+# Optional dependency: vectorises signature computation, results are identical
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Largest prime below 2**32. With a, b < 2**31 and 32-bit shingle hashes,
+# a * h + b stays below 2**64, so NumPy uint64 and Python ints agree exactly
+# and stored signatures do not depend on which path computed them.
+MINHASH_PRIME = 4294967291
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 3
+MINHASH_SEED = 1
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+class MinHasher:
+    """Computes MinHash signatures of word shingles.
+
+    Signatures from hashers with the same ``num_perm``, ``shingle_size``
+    and ``seed`` are comparable, including ones stored by earlier runs.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                 seed: int = MINHASH_SEED):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, 2 ** 31) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, 2 ** 31) for _ in range(num_perm)]
+        self._struct = struct.Struct(f'<{num_perm}I')
+        if NUMPY_AVAILABLE:
+            self._a_array = np.array(self._a, dtype=np.uint64)
+            self._b_array = np.array(self._b, dtype=np.uint64)
+
+    def shingles(self, text: str) -> set:
+        """Distinct lower-cased word n-grams of text"""
+        words = _WORD_PATTERN.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """MinHash signature of text, or None when it has no words"""
+        hashes = [_shingle_hash(shingle) for shingle in self.shingles(text)]
+        if not hashes:
+            return None
+        if NUMPY_AVAILABLE:
+            values = np.array(hashes, dtype=np.uint64)
+            permuted = (np.outer(self._a_array, values) + self._b_array[:, None]) % MINHASH_PRIME
+            return tuple(int(value) for value in permuted.min(axis=1))
+        return tuple(min((a * h + b) % MINHASH_PRIME for h in hashes) for a, b in zip(self._a, self._b))
+
+    def to_bytes(self, signature: Tuple[int, ...]) -> bytes:
+        """Compact storage form of a signature"""
+        return self._struct.pack(*signature)
+
+    def from_bytes(self, data: bytes) -> Tuple[int, ...]:
+        """Inverse of to_bytes"""
+        return self._struct.unpack(data)
+
+    def signature_bytes(self, text: str) -> Optional[bytes]:
+        """Signature of text in storage form, or None when it has no words"""
+        signature = self.signature(text)
+        return self.to_bytes(signature) if signature is not None else None
+
+
+def estimated_similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Jaccard similarity estimate: the fraction of agreeing signature slots"""
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+def _integrate(function, lower: float, upper: float, steps: int = 200) -> float:
+    width = (upper - lower) / steps
+    return sum(function(lower + (i + 0.5) * width) for i in range(steps)) * width
+
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bands, rows) minimising false positives plus false negatives around threshold"""
+    best, best_error = (1, num_perm), float('inf')
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positive = _integrate(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+            false_negative = _integrate(lambda s: (1 - s ** rows) ** bands, threshold, 1.0)
+            if false_positive + false_negative < best_error:
+                best, best_error = (bands, rows), false_positive + false_negative
+    return best
+
+
+class NearDuplicateIndex:
+    """LSH index over MinHash signatures answering "seen anything this similar?".
+
+    Signatures are split into bands; any band hashing to the same bucket
+    makes a candidate, and candidates are confirmed by their estimated
+    similarity, so a query costs ``bands`` dict lookups plus a handful of
+    comparisons.
+    """
+
+    _band_cache: Dict[Tuple[float, int], Tuple[int, int]] = {}
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = DEFAULT_NUM_PERM):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        key = (threshold, num_perm)
+        if key not in self._band_cache:
+            self._band_cache[key] = optimal_bands(threshold, num_perm)
+        self.bands, self.rows = self._band_cache[key]
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key: Hashable, signature: Tuple[int, ...]):
+        """Index a signature under key (re-adding a key is a no-op)"""
+        if key in self._signatures:
+            return
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def query(self, signature: Tuple[int, ...]) -> List[Tuple[Hashable, float]]:
+        """Indexed keys at least ``threshold`` similar to signature, most similar first"""
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        matches = []
+        for key in candidates:
+            similarity = estimated_similarity(signature, self._signatures[key])
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    def find_duplicate(self, signature: Tuple[int, ...],
+                       exclude: Optional[Hashable] = None) -> Optional[Tuple[Hashable, float]]:
+        """The most similar indexed key at or above threshold, if any.
+
+        ``exclude`` is the key of the item being checked, so an item seen
+        again is not reported as a duplicate of its own earlier entry.
+        """
+        for key, similarity in self.query(signature):
+            if key != exclude:
+                return key, similarity
+        return None
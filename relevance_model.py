@@ -0,0 +1,185 @@
+"""
+BM25 relevance scoring for job descriptions
+Corpus document frequencies are kept up to date incrementally and optionally persisted
+"""
+import math
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Iterable, Set, AbstractSet
+
+
+class BM25RelevanceModel:
+    """BM25 weights for a vocabulary (the matcher's skill terms).
+
+    Every distinct description added with ``add_document`` updates the
+    document count, average length and per-term document frequencies.
+    IDF values live in a list indexed like ``terms`` and are recomputed only
+    when the statistics have changed since the last score.
+    ``extend_vocabulary`` adds terms (e.g. after a taxonomy reload); they
+    are counted in descriptions added from then on.
+
+    With a ``store`` (a DatabaseManager) the statistics are loaded at start
+    and each new document is written through, so they accumulate across runs.
+    """
+
+    def __init__(self, vocabulary: Iterable[str], k1: float = 1.2, b: float = 0.75, store=None):
+        self.k1 = k1
+        self.b = b
+        self.store = store
+        self.logger = logging.getLogger(__name__)
+
+        self.terms: List[str] = sorted(set(vocabulary))
+        self.term_index: Dict[str, int] = {term: index for index, term in enumerate(self.terms)}
+        self.document_frequencies: List[int] = [0] * len(self.terms)
+        self.document_count = 0
+        self.total_length = 0
+
+        self._seen: Set[str] = set()
+        self._idf: Optional[List[float]] = None
+        self._lock = threading.Lock()
+
+        if store is not None:
+            self._load()
+
+    def _load(self):
+        try:
+            document_count, total_length, frequencies = self.store.load_relevance_statistics()
+        except Exception as e:
+            self.logger.warning(f"Could not load relevance statistics: {e}")
+            return
+        self.document_count = document_count
+        self.total_length = total_length
+        for term, count in frequencies.items():
+            index = self.term_index.get(term)
+            if index is not None:
+                self.document_frequencies[index] = count
+
+    def extend_vocabulary(self, vocabulary: Iterable[str]) -> int:
+        """Add the terms of vocabulary not scored yet; returns how many were added.
+
+        With a store, new terms start from their stored document
+        frequencies (counted while an earlier run knew them).
+        """
+        added = sorted(set(vocabulary) - self.term_index.keys())
+        if not added:
+            return 0
+        stored: Dict[str, int] = {}
+        if self.store is not None:
+            try:
+                stored = self.store.load_relevance_statistics()[2]
+            except Exception as e:
+                self.logger.warning(f"Could not load relevance statistics: {e}")
+        with self._lock:
+            # Build new containers and swap them in, so scoring threads never
+            # see a term index longer than the frequencies
+            terms = self.terms + added
+            self.document_frequencies = self.document_frequencies + [stored.get(term, 0) for term in added]
+            self.term_index = {term: index for index, term in enumerate(terms)}
+            self.terms = terms
+            self._idf = None
+        return len(added)
+
+    @property
+    def average_length(self) -> float:
+        """Mean document length in tokens"""
+        return self.total_length / self.document_count if self.document_count else 0.0
+
+    @property
+    def idf(self) -> List[float]:
+        """Inverse document frequency per term, indexed like ``terms``"""
+        idf = self._idf
+        if idf is None:
+            with self._lock:
+                n = self.document_count
+                # The "+1" form of BM25 IDF, never negative for common terms
+                idf = [math.log(1 + (n - df + 0.5) / (df + 0.5)) for df in self.document_frequencies]
+                self._idf = idf
+        return idf
+
+    def add_document(self, content_hash: str, length: int, term_counts: Dict[str, int]) -> bool:
+        """Count a description once; returns False if it was already counted in this process.
+
+        With a store the write may be queued behind other database writes;
+        the description is counted here once the store confirms it is new
+        (one counted in an earlier run is already in the loaded statistics).
+        """
+        terms = [term for term in term_counts if term in self.term_index]
+        with self._lock:
+            if content_hash in self._seen:
+                return False
+            self._seen.add(content_hash)
+
+        if self.store is None:
+            self._count(length, terms)
+            return True
+
+        def counted(write):
+            error = write.exception()
+            if error is not None:
+                self.logger.warning(f"Could not persist relevance statistics: {error}")
+            if error is not None or write.result():
+                self._count(length, terms)
+
+        try:
+            self.store.add_relevance_document(content_hash, length, terms).add_done_callback(counted)
+        except Exception as e:
+            self.logger.warning(f"Could not persist relevance statistics: {e}")
+            self._count(length, terms)
+        return True
+
+    def _count(self, length: int, terms: List[str]):
+        with self._lock:
+            self.document_count += 1
+            self.total_length += length
+            for term in terms:
+                self.document_frequencies[self.term_index[term]] += 1
+            self._idf = None
+
+    def term_weights(self, term_counts: Dict[str, int], length: int) -> Dict[str, float]:
+        """BM25 weight of each vocabulary term in one document"""
+        # Index before IDF: extend_vocabulary only grows them, so idf covers every index
+        term_index = self.term_index
+        idf = self.idf
+        average_length = self.average_length or max(length, 1)
+        norm = self.k1 * (1 - self.b + self.b * length / average_length)
+        weights = {}
+        for term, tf in term_counts.items():
+            index = term_index.get(term)
+            if index is not None and tf > 0:
+                weights[term] = idf[index] * tf * (self.k1 + 1) / (tf + norm)
+        return weights
+
+    def score(self, term_counts: Dict[str, int], length: int, query_terms: AbstractSet[str]) -> float:
+        """Share (0-100) of the document's BM25 skill weight covered by query_terms.
+
+        The relevance-mode counterpart of the matched/required skill ratio:
+        skills a description is built around, and rarer skills, count for
+        more than ones mentioned once in boilerplate.
+        """
+        weights = self.term_weights(term_counts, length)
+        total = sum(weights.values())
+        if total <= 0:
+            return 0.0
+        matched = sum(weight for term, weight in weights.items() if term in query_terms)
+        return matched / total * 100
+
+    def snapshot(self) -> 'BM25RelevanceModel':
+        """Copy of the current statistics without a store (e.g. for worker processes)"""
+        copy = BM25RelevanceModel([], self.k1, self.b)
+        copy.terms = list(self.terms)
+        copy.term_index = dict(self.term_index)
+        with self._lock:
+            copy.document_frequencies = list(self.document_frequencies)
+            copy.document_count = self.document_count
+            copy.total_length = self.total_length
+        return copy
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.snapshot().__dict__.copy()
+        del state['_lock'], state['logger']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
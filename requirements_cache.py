@@ -0,0 +1,129 @@
+"""
+Memoisation of parsed job requirements
+LRU cache bounded by entry count and size, optionally backed by the SQLite database
+"""
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+
+
+class RequirementsCache:
+    """LRU cache of extract_job_requirements results keyed by description hash.
+
+    Entries are evicted least recently used first once either ``max_entries``
+    or ``max_bytes`` (measured as the size of the JSON encoding) is exceeded.
+    With a ``store`` (a DatabaseManager), misses fall back to the
+    ``parsed_requirements`` table and new results are written to it (behind
+    other writes when the store's write-behind queue is running), so parses
+    survive restarts.
+
+    Cached values are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024, store=None):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.store = store
+        self.logger = logging.getLogger(__name__)
+
+        self._entries: 'OrderedDict[str, Tuple[Dict[str, Any], int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+
+    @staticmethod
+    def key(text: str, namespace: str = "") -> str:
+        """Content hash of text; namespace separates incompatible parsers"""
+        digest = hashlib.sha256(namespace.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached value for key, or None (counts as a hit or a miss)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        value = self._load(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.store_hits += 1
+            self._remember(key, value, len(json.dumps(value)))
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Add a value, persisting it when a store is configured"""
+        encoded = json.dumps(value)
+        with self._lock:
+            self._remember(key, value, len(encoded))
+        if self.store is not None:
+            try:
+                self.store.save_parsed_requirements(key, value)
+            except Exception as e:
+                self.logger.warning(f"Could not persist parsed requirements: {e}")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Cached value for key, computing and caching it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Empty the in-memory cache and reset counters (the store is kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.store_hits = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.store_hits + self.misses
+            return {
+                'hits': self.hits,
+                'store_hits': self.store_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.store_hits) / lookups * 100, 2) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.store is None:
+            return None
+        try:
+            return self.store.get_parsed_requirements(key)
+        except Exception as e:
+            self.logger.warning(f"Could not read parsed requirements: {e}")
+            return None
+
+    def _remember(self, key: str, value: Dict[str, Any], size: int):
+        # Caller holds the lock
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
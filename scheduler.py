@@ -221,6 +221,12 @@ class AutomationScheduler:
         start_time = datetime.strptime(first_period[1]["start"], "%H:%M").time()
         return datetime.combine(tomorrow, start_time)
     
+    def remaining_applications(self) -> int:
+        """Applications still allowed today under the daily limit"""
+        if self.daily_stats.get("current_date") != datetime.now().strftime('%Y-%m-%d'):
+            self._reset_daily_stats()
+        return max(0, self.config["daily_application_limit"] - self.daily_stats["applications_sent"])
+    
     def get_daily_progress(self) -> Dict[str, Any]:
         """Get daily progress information"""
         can_apply, reason = self.can_apply_now()
@@ -229,7 +235,7 @@ class AutomationScheduler:
         return {
             "applications_sent": self.daily_stats["applications_sent"],
             "daily_limit": self.config["daily_application_limit"],
-            "remaining_applications": max(0, self.config["daily_application_limit"] - self.daily_stats["applications_sent"]),
+            "remaining_applications": self.remaining_applications(),
             "can_apply_now": can_apply,
             "reason": reason,
             "next_optimal_time": next_optimal.isoformat() if next_optimal else None,
@@ -0,0 +1,164 @@
+"""
+Adaptive selector ordering
+Remembers which XPath selectors find elements and tries the ones that have been working first
+"""
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Sequence, Callable, TypeVar
+
+T = TypeVar('T')
+
+# Weight of the latest attempt in a selector's recent hit rate
+DEFAULT_SMOOTHING = 0.2
+# Recent hit rate assumed for a selector that has never been tried
+DEFAULT_PRIOR = 0.5
+# Recorded attempts between automatic saves to the store
+DEFAULT_SAVE_EVERY = 50
+
+
+class SelectorStats:
+    """Attempts and hits of one selector for one lookup"""
+
+    __slots__ = ('hits', 'attempts', 'recent_hit_rate')
+
+    def __init__(self, hits: int = 0, attempts: int = 0, recent_hit_rate: float = DEFAULT_PRIOR):
+        self.hits = hits
+        self.attempts = attempts
+        self.recent_hit_rate = recent_hit_rate
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'attempts': self.attempts,
+            'hit_rate': round(self.hits / self.attempts * 100, 2) if self.attempts else 0.0,
+            'recent_hit_rate': round(self.recent_hit_rate * 100, 2)
+        }
+
+
+class SelectorRegistry:
+    """Hit statistics for the fallback selector lists used to find elements.
+
+    A lookup is a named list of alternative selectors for the same element
+    ("form.next_button"). ``ordered()`` returns the candidates sorted by
+    their recent hit rate, an exponentially weighted average in which each
+    attempt counts ``smoothing`` and older attempts fade, so the order
+    follows LinkedIn's markup as it changes; ties keep the caller's order.
+    Selectors listed in ``last_resort`` are never promoted: they are broad
+    matches that must only be tried once the specific ones have missed.
+
+    With a ``store`` (a DatabaseManager) statistics are loaded on creation
+    and written back every ``save_every`` attempts and on ``save()``, so a
+    new run starts with the order the previous one learned.
+    """
+
+    def __init__(self, store=None, smoothing: float = DEFAULT_SMOOTHING, prior: float = DEFAULT_PRIOR,
+                 save_every: int = DEFAULT_SAVE_EVERY):
+        self.store = store
+        self.smoothing = smoothing
+        self.prior = prior
+        self.save_every = max(1, save_every)
+        self.logger = logging.getLogger(__name__)
+
+        self._stats: Dict[str, Dict[str, SelectorStats]] = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def ordered(self, lookup: str, selectors: Sequence[str], last_resort: Sequence[str] = ()) -> List[str]:
+        """selectors, best recent hit rate first, with last_resort ones kept at the end in order"""
+        with self._lock:
+            stats = self._stats.get(lookup, {})
+            rates = {selector: stats[selector].recent_hit_rate if selector in stats else self.prior
+                     for selector in selectors}
+        preferred = [selector for selector in selectors if selector not in last_resort]
+        preferred.sort(key=lambda selector: -rates[selector])
+        return preferred + [selector for selector in selectors if selector in last_resort]
+
+    def record(self, lookup: str, selector: str, hit: bool):
+        """Count one attempt of selector for lookup"""
+        with self._lock:
+            stats = self._stats.setdefault(lookup, {}).get(selector)
+            if stats is None:
+                stats = self._stats[lookup][selector] = SelectorStats(recent_hit_rate=self.prior)
+            stats.attempts += 1
+            stats.hits += hit
+            stats.recent_hit_rate += self.smoothing * (float(hit) - stats.recent_hit_rate)
+            self._dirty.add((lookup, selector))
+            due = len(self._dirty) >= self.save_every
+        if due:
+            self.save()
+
+    def record_result(self, lookup: str, tried: Sequence[str], matched: Optional[str]):
+        """Count a search that tried selectors in order and stopped at matched (None if all missed)"""
+        for selector in tried:
+            self.record(lookup, selector, selector == matched)
+            if selector == matched:
+                break
+
+    def first_match(self, lookup: str, selectors: Sequence[str], probe: Callable[[str], Optional[T]],
+                    last_resort: Sequence[str] = ()) -> Optional[T]:
+        """The first truthy probe(selector) result, trying the best selectors first.
+
+        probe returns the found value, or None/'' for a miss; every selector
+        tried is recorded.
+        """
+        for selector in self.ordered(lookup, selectors, last_resort):
+            result = probe(selector)
+            self.record(lookup, selector, bool(result))
+            if result:
+                return result
+        return None
+
+    def statistics(self, lookup: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Per lookup, each recorded selector's counters in the order they would be tried"""
+        with self._lock:
+            lookups = [lookup] if lookup is not None else sorted(self._stats)
+            return {
+                name: {selector: stats.as_dict()
+                       for selector, stats in sorted(self._stats.get(name, {}).items(),
+                                                     key=lambda item: -item[1].recent_hit_rate)}
+                for name in lookups
+            }
+
+    def save(self):
+        """Write statistics changed since the last save to the store"""
+        if self.store is None:
+            return
+        with self._lock:
+            rows = []
+            for lookup, selector in self._dirty:
+                stats = self._stats[lookup][selector]
+                rows.append((lookup, selector, stats.hits, stats.attempts, stats.recent_hit_rate))
+            self._dirty.clear()
+        if not rows:
+            return
+        try:
+            self.store.save_selector_statistics(rows).add_done_callback(self._saved)
+        except Exception as e:
+            self.logger.warning(f"Could not persist selector statistics: {e}")
+
+    def _saved(self, future):
+        # The store may write behind other database writes, so errors arrive here
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.warning(f"Could not persist selector statistics: {future.exception()}")
+
+    def reset(self, lookup: Optional[str] = None):
+        """Forget the statistics of one lookup, or of every lookup (the store is kept)"""
+        with self._lock:
+            if lookup is None:
+                self._stats.clear()
+                self._dirty.clear()
+            else:
+                self._stats.pop(lookup, None)
+                self._dirty = {key for key in self._dirty if key[0] != lookup}
+
+    def _load(self):
+        if self.store is None:
+            return
+        try:
+            rows = self.store.load_selector_statistics()
+        except Exception as e:
+            self.logger.warning(f"Could not read selector statistics: {e}")
+            return
+        for lookup, selector, hits, attempts, recent_hit_rate in rows:
+            self._stats.setdefault(lookup, {})[selector] = SelectorStats(hits, attempts, recent_hit_rate)
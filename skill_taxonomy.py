@@ -0,0 +1,283 @@
+"""
+Skill taxonomy for job matching
+Keyword groups and aliases loaded from a JSON/YAML file, compiled once into a shared keyword automaton
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+from keyword_automaton import KeywordAutomaton, tokenize
+
+# Optional dependency: YAML taxonomy files
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_taxonomy.json')
+# Compiled taxonomies are cached next to the taxonomy file, one per file hash
+TAXONOMY_CACHE_DIRNAME = '.taxonomy_cache'
+# Bump when the cache file layout changes so stale cache files are ignored
+TAXONOMY_CACHE_VERSION = 2
+# Seconds between checks of the taxonomy file for changes
+DEFAULT_CHECK_INTERVAL = 2.0
+
+# Sections of a taxonomy file: categorised term lists, and plain term lists
+CATEGORY_SECTIONS = ('skills', 'industries', 'company_sizes')
+TERM_SECTIONS = ('education', 'remote')
+
+
+class TaxonomyError(ValueError):
+    """Raised for a malformed taxonomy file"""
+
+
+def _contains_tokens(tokens: List[str], part: List[str]) -> bool:
+    return any(tokens[i:i + len(part)] == part for i in range(len(tokens) - len(part) + 1))
+
+
+def _term_list(name: str, terms: Any) -> List[str]:
+    if not isinstance(terms, list) or not all(isinstance(term, str) and tokenize(term) for term in terms):
+        raise TaxonomyError(f"'{name}' must be a list of non-empty strings")
+    return [term.lower() for term in terms]
+
+
+class SkillTaxonomy:
+    """Keyword groups and aliases, with the automaton that finds them.
+
+    ``aliases`` maps a canonical term to alternative spellings ("kubernetes":
+    ["k8s"]); an alias is reported as its canonical term wherever that term
+    appears, so aliases are matched in the same pass as everything else.
+    Instances are treated as immutable and shared between matchers.
+    """
+
+    def __init__(self, skills: Dict[str, List[str]], industries: Dict[str, List[str]],
+                 company_sizes: Dict[str, List[str]], education: List[str], remote: List[str],
+                 aliases: Optional[Dict[str, List[str]]] = None, source: Optional[str] = None,
+                 keyword_automaton: Optional[KeywordAutomaton] = None):
+        self.skill_keywords = skills
+        self.industry_keywords = industries
+        self.company_size_keywords = company_sizes
+        self.education_keywords = education
+        self.remote_indicators = remote
+        self.aliases = aliases or {}
+        self.source = source
+        self.fingerprint = hashlib.sha256(
+            json.dumps(self.to_dict(), sort_keys=True).encode('utf-8')).hexdigest()
+        # A cached automaton is only valid for the taxonomy it was compiled from
+        self.keyword_automaton = keyword_automaton or self._compile()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: Optional[str] = None) -> 'SkillTaxonomy':
+        """Validate and build a taxonomy from parsed file contents"""
+        if not isinstance(data, dict):
+            raise TaxonomyError("Taxonomy must be a mapping of keyword groups")
+        groups = {}
+        for name in CATEGORY_SECTIONS:
+            categories = data.get(name, {})
+            if not isinstance(categories, dict):
+                raise TaxonomyError(f"'{name}' must map categories to term lists")
+            groups[name] = {category: _term_list(f"{name}.{category}", terms)
+                            for category, terms in categories.items()}
+        for name in TERM_SECTIONS:
+            groups[name] = _term_list(name, data.get(name, []))
+
+        aliases = data.get('aliases', {})
+        if not isinstance(aliases, dict):
+            raise TaxonomyError("'aliases' must map canonical terms to alias lists")
+        aliases = {canonical.lower(): _term_list(f"aliases.{canonical}", names)
+                   for canonical, names in aliases.items()}
+        return cls(aliases=aliases, source=source, **groups)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The taxonomy in file form"""
+        return {
+            'skills': self.skill_keywords,
+            'industries': self.industry_keywords,
+            'company_sizes': self.company_size_keywords,
+            'education': self.education_keywords,
+            'remote': self.remote_indicators,
+            'aliases': self.aliases
+        }
+
+    def _compile(self) -> KeywordAutomaton:
+        """One automaton over every term and alias.
+
+        Payloads are (group, category, term) tuples so a single pass over a
+        description yields skills, industries, company sizes, education and
+        remote terms together; aliases carry their canonical term's payloads.
+        """
+        payloads: Dict[str, List[Tuple[str, Optional[str], str]]] = {}
+        for group, keywords in (('skills', self.skill_keywords),
+                                ('industries', self.industry_keywords),
+                                ('company_size', self.company_size_keywords)):
+            for category, terms in keywords.items():
+                for term in terms:
+                    payloads.setdefault(term, []).append((group, category, term))
+        for group, terms in (('education', self.education_keywords), ('remote', self.remote_indicators)):
+            for term in terms:
+                payloads.setdefault(term, []).append((group, None, term))
+
+        automaton = KeywordAutomaton()
+        for term, term_payloads in payloads.items():
+            for payload in term_payloads:
+                automaton.add(term, payload)
+        for canonical, names in self.aliases.items():
+            if canonical not in payloads:
+                raise TaxonomyError(f"Alias target '{canonical}' is not a taxonomy term")
+            for alias in names:
+                if alias in payloads:
+                    raise TaxonomyError(f"Alias '{alias}' of '{canonical}' is already a taxonomy term")
+                if _contains_tokens(tokenize(alias), tokenize(canonical)):
+                    # The canonical term already matches inside it; each mention would count twice
+                    raise TaxonomyError(f"Alias '{alias}' contains its canonical term '{canonical}'")
+                for payload in payloads[canonical]:
+                    automaton.add(alias, payload)
+        return automaton.build()
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TAXONOMY_PATH, cache_dir: Optional[str] = None) -> 'SkillTaxonomy':
+        """Load a .json, .yaml or .yml taxonomy file.
+
+        The compiled taxonomy is cached as JSON under ``cache_dir`` (by
+        default a ``.taxonomy_cache`` directory beside the file) keyed by a
+        hash of the file's bytes, so an unchanged file is never parsed or
+        compiled twice. Cache files are plain data, never code, and one
+        whose fingerprint does not match its contents is ignored.
+        """
+        logger = logging.getLogger(__name__)
+        with open(path, 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha256(content)
+        digest.update(f':{TAXONOMY_CACHE_VERSION}'.encode('ascii'))
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), TAXONOMY_CACHE_DIRNAME)
+        cache_path = os.path.join(cache_dir, f'{digest.hexdigest()}.json')
+
+        try:
+            with open(cache_path, 'rb') as f:
+                return cls._from_cache(json.loads(f.read().decode('utf-8')), source=path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable taxonomy cache {cache_path}: {e}")
+
+        taxonomy = cls.from_dict(cls._parse(path, content), source=path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write then rename so concurrent loaders never read a partial file
+            temp_path = f'{cache_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(taxonomy._cache_data(), f, separators=(',', ':'))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache compiled taxonomy: {e}")
+        return taxonomy
+
+    def _cache_data(self) -> Dict[str, Any]:
+        return {
+            'fingerprint': self.fingerprint,
+            'taxonomy': self.to_dict(),
+            'automaton': self.keyword_automaton.to_dict()
+        }
+
+    @classmethod
+    def _from_cache(cls, data: Dict[str, Any], source: Optional[str] = None) -> 'SkillTaxonomy':
+        """Rebuild a taxonomy from _cache_data() without recompiling its automaton"""
+        groups = data['taxonomy']
+        taxonomy = cls(groups['skills'], groups['industries'], groups['company_sizes'], groups['education'],
+                       groups['remote'], groups['aliases'], source=source,
+                       keyword_automaton=KeywordAutomaton.from_dict(data['automaton']))
+        if taxonomy.fingerprint != data['fingerprint']:
+            raise TaxonomyError("Cached taxonomy does not match its fingerprint")
+        return taxonomy
+
+    @staticmethod
+    def _parse(path: str, content: bytes) -> Any:
+        if path.lower().endswith(('.yaml', '.yml')):
+            if not YAML_AVAILABLE:
+                raise ImportError("PyYAML is required for YAML taxonomy files (pip install pyyaml)")
+            try:
+                return yaml.safe_load(content)
+            except yaml.YAMLError as e:
+                raise TaxonomyError(f"Invalid YAML in {path}: {e}")
+        try:
+            return json.loads(content.decode('utf-8'))
+        except ValueError as e:
+            raise TaxonomyError(f"Invalid JSON in {path}: {e}")
+
+
+class TaxonomySource:
+    """A taxonomy file that is reloaded when it changes.
+
+    ``current()`` checks the file's modification time and size at most once
+    every ``check_interval`` seconds and swaps in the recompiled taxonomy
+    when they change, so long-running processes (the web app) pick up edits
+    without a restart. A file that fails to load keeps the last good
+    taxonomy in use. Use ``shared()`` to get the one source per path that
+    every matcher in the process reuses.
+    """
+
+    _shared: Dict[str, 'TaxonomySource'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str = DEFAULT_TAXONOMY_PATH, check_interval: float = DEFAULT_CHECK_INTERVAL,
+                 cache_dir: Optional[str] = None):
+        self.path = path
+        self.check_interval = check_interval
+        self.cache_dir = cache_dir
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stat = self._file_stat()
+        self._taxonomy = SkillTaxonomy.load(path, cache_dir)
+        self._checked_at = time.monotonic()
+        self.reloads = 0
+
+    @classmethod
+    def shared(cls, path: str = DEFAULT_TAXONOMY_PATH) -> 'TaxonomySource':
+        """The process-wide source for path"""
+        path = os.path.abspath(path)
+        with cls._shared_lock:
+            source = cls._shared.get(path)
+            if source is None:
+                source = cls._shared[path] = cls(path)
+            return source
+
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def current(self) -> SkillTaxonomy:
+        """The taxonomy, reloaded first if the file has changed"""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self.reload_if_changed()
+        return self._taxonomy
+
+    def reload_if_changed(self) -> bool:
+        """Reload now if the file changed; returns True when a new taxonomy was loaded"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            stat = self._file_stat()
+            if stat is None or stat == self._stat:
+                return False
+            self._stat = stat
+            try:
+                taxonomy = SkillTaxonomy.load(self.path, self.cache_dir)
+            except Exception as e:
+                self.logger.error(f"Keeping previous skill taxonomy, could not reload {self.path}: {e}")
+                return False
+            changed = taxonomy.fingerprint != self._taxonomy.fingerprint
+            self._taxonomy = taxonomy
+            if changed:
+                self.reloads += 1
+                self.logger.info(f"Reloaded skill taxonomy from {self.path}")
+            return changed
@@ -0,0 +1,555 @@
+"""
+Unit tests for the AI job matcher
+Covers the keyword automaton and requirement extraction
+"""
+import unittest
+import os
+import shutil
+import json
+import tempfile
+import threading
+from unittest.mock import patch
+
+from keyword_automaton import KeywordAutomaton, tokenize
+from dataclasses import FrozenInstanceError, replace
+
+from ai_job_matcher import AIJobMatcher, UserProfile, CompiledProfile, top_k_by_score
+from requirements_cache import RequirementsCache
+from relevance_model import BM25RelevanceModel
+from vectorized_scoring import VectorizedScorer, NUMPY_AVAILABLE, SCIPY_AVAILABLE
+from database import DatabaseManager
+from skill_taxonomy import TaxonomySource
+
+
+class TestKeywordAutomaton(unittest.TestCase):
+    """Test the token-level Aho-Corasick automaton"""
+
+    def _automaton(self, *terms):
+        automaton = KeywordAutomaton()
+        for term in terms:
+            automaton.add(term, term)
+        return automaton.build()
+
+    def test_tokenize_keeps_punctuation_tokens(self):
+        """Test punctuated terms tokenize identically in patterns and text"""
+        self.assertEqual(tokenize("C++ and Node.js, CI/CD"),
+                         ['c', '+', '+', 'and', 'node', '.', 'js', ',', 'ci', '/', 'cd'])
+
+    def test_matches_whole_words_only(self):
+        """Test short terms are not found inside longer words"""
+        automaton = self._automaton('r', 'go', 'ai')
+        self.assertEqual(automaton.count("Scrum, Django and Google maintain fairness"), {})
+        self.assertEqual(automaton.count("R, Go and AI"), {'r': 1, 'go': 1, 'ai': 1})
+
+    def test_reports_nested_and_overlapping_terms(self):
+        """Test every term is reported, including ones inside longer terms"""
+        automaton = self._automaton('sql', 'sql server', 'server', 'machine learning', 'learning')
+        counts = automaton.count("SQL Server and machine learning; more SQL")
+        self.assertEqual(counts, {'sql': 2, 'sql server': 1, 'server': 1,
+                                  'machine learning': 1, 'learning': 1})
+
+    def test_punctuated_terms(self):
+        """Test terms containing punctuation are matched"""
+        automaton = self._automaton('c++', 'c#', 'node.js', 'ci/cd', 'c')
+        counts = automaton.count("Node.js, C++ and C# with CI/CD")
+        self.assertEqual(counts, {'node.js': 1, 'c++': 1, 'c#': 1, 'ci/cd': 1, 'c': 2})
+
+    def test_shared_term_payloads(self):
+        """Test several payloads can share one term"""
+        automaton = KeywordAutomaton()
+        automaton.add('sql', ('programming', 'sql'))
+        automaton.add('sql', ('data_science', 'sql'))
+        automaton.add('sql', ('data_science', 'sql'))
+        self.assertEqual(len(automaton), 2)
+        self.assertEqual(sorted(automaton.find("sql")), [('data_science', 'sql'), ('programming', 'sql')])
+
+    def test_add_after_build_rejected(self):
+        """Test the automaton is immutable once built"""
+        automaton = self._automaton('python')
+        with self.assertRaises(RuntimeError):
+            automaton.add('java', 'java')
+
+
+class TestRequirementExtraction(unittest.TestCase):
+    """Test AIJobMatcher requirement extraction"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.matcher = AIJobMatcher()
+
+    def test_extracts_skills_in_keyword_order(self):
+        """Test skills are grouped by category in keyword list order"""
+        requirements = self.matcher.extract_job_requirements(
+            "We use SQL and Python daily, plus Go. Experience with SQL Server and Node.js.")
+        skills = requirements['skills']
+        self.assertEqual(skills['programming'], ['python', 'go', 'sql'])
+        self.assertEqual(skills['databases'], ['sql server'])
+        self.assertEqual(skills['web_development'], ['node.js'])
+        self.assertEqual(requirements['skill_counts']['sql'], 2)
+
+    def test_no_substring_false_positives(self):
+        """Test words containing short skills do not count as those skills"""
+        requirements = self.matcher.extract_job_requirements(
+            "Scrum master for a growing organisation; strong communication required")
+        self.assertNotIn('r', requirements['skills']['programming'])
+        self.assertNotIn('go', requirements['skills']['programming'])
+        self.assertIn('scrum', requirements['skills']['soft_skills'])
+
+    def test_education_remote_industry_and_size(self):
+        """Test non-skill keyword groups come from the same scan"""
+        requirements = self.matcher.extract_job_requirements(
+            "Fintech startup hiring remote engineers. Bachelor degree preferred.")
+        self.assertEqual(requirements['education_required'], ['bachelor', 'degree'])
+        self.assertTrue(requirements['is_remote'])
+        self.assertIn('finance', requirements['industries'])
+        self.assertIn('startup', requirements['company_sizes'])
+
+    def test_experience_takes_largest_requirement(self):
+        """Test every experience phrasing feeds the minimum"""
+        requirements = self.matcher.extract_job_requirements(
+            "3+ years of experience in Python, 2 years in SQL and at least 5 years leading teams.")
+        self.assertEqual(requirements['min_experience'], 5)
+        requirements = self.matcher.extract_job_requirements("Minimum 7 years required.")
+        self.assertEqual(requirements['min_experience'], 7)
+
+    def test_locations_are_deduplicated(self):
+        """Test a location mentioned twice is reported once"""
+        requirements = self.matcher.extract_job_requirements(
+            "Based in Denver. Our office in Denver is near downtown.")
+        self.assertEqual(requirements['locations'].count('denver'), 1)
+
+    def test_salary_ranges_are_normalised_per_year(self):
+        """Test salary ranges in yearly, hourly and monthly form"""
+        cases = {
+            "Pay: $120k - $150k.": (120000, 150000, 'year'),
+            "$85,000 to $95,000 per year": (85000, 95000, 'year'),
+            "$45 - $60/hr depending on experience": (93600, 124800, 'hour'),
+            "$7,000 - $8,000 a month": (84000, 96000, 'month'),
+            "$40 - $50 with benefits": (83200, 104000, 'hour'),
+        }
+        for text, (low, high, period) in cases.items():
+            requirements = self.matcher.extract_job_requirements(text)
+            self.assertEqual((requirements['salary_min'], requirements['salary_max'],
+                              requirements['salary_period']), (low, high, period), text)
+
+        # The matched text keeps its earlier form, without the pay period
+        requirements = self.matcher.extract_job_requirements("$85,000 to $95,000 per year")
+        self.assertEqual(requirements['salary_range'], '$85,000 to $95,000')
+
+    def test_salary_single_amounts(self):
+        """Test labelled amounts, open-ended amounts and label priority"""
+        requirements = self.matcher.extract_job_requirements("Salary: $95,000 annually.")
+        self.assertEqual(requirements['salary_range'], 'salary: $95,000')
+        self.assertEqual((requirements['salary_min'], requirements['salary_max']), (95000, 95000))
+        self.assertEqual(requirements['salary_period'], 'year')
+
+        for text in ("Compensation $120k+ plus equity.", "Compensation $120,000+ plus equity."):
+            requirements = self.matcher.extract_job_requirements(text)
+            self.assertEqual((requirements['salary_min'], requirements['salary_max']), (120000, None), text)
+        self.assertEqual(requirements['salary_range'], 'compensation $120,000+')
+
+        requirements = self.matcher.extract_job_requirements(
+            "Compensation $80k. Salary: $100k. Team budget $5,000.")
+        self.assertEqual(requirements['salary_min'], 100000)
+
+        requirements = self.matcher.extract_job_requirements("A $5,000 signing bonus.")
+        self.assertIsNone(requirements['salary_range'])
+        self.assertIsNone(requirements['salary_min'])
+
+    def test_optimize_resume_keywords_uses_counts(self):
+        """Test missing keywords are ranked by frequency in the description"""
+        profile = UserProfile(skills=['python'], experience_years=3, education=[], certifications=[],
+                              preferred_industries=[], preferred_locations=[], salary_expectation=None,
+                              remote_preference=False, company_size_preference='medium')
+        keywords = self.matcher.optimize_resume_keywords(
+            profile, "Python and Docker. Docker, Docker and Kubernetes. Kubernetes too. AWS.")
+        self.assertEqual(keywords[:2], ['docker', 'kubernetes'])
+
+
+class TestBatchMatching(unittest.TestCase):
+    """Test AIJobMatcher.match_jobs"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.matcher = AIJobMatcher()
+        cls.profile = UserProfile(skills=['python', 'sql', 'docker'], experience_years=4,
+                                  education=['Bachelor of Science'], certifications=[],
+                                  preferred_industries=['finance'], preferred_locations=[],
+                                  salary_expectation=None, remote_preference=True,
+                                  company_size_preference='medium')
+        skills = ['python', 'java', 'sql', 'docker', 'kubernetes', 'react', 'aws']
+        cls.jobs = [{
+            'title': f"Engineer {i}",
+            'company': f"Company {i % 7}",
+            'description': f"{skills[i % 7]} and {skills[(i * 3) % 7]}, {i % 9}+ years experience, remote",
+            'job_url': f"https://www.linkedin.com/jobs/view/{1000 + i}/"
+        } for i in range(150)]
+
+    def _expected(self):
+        return [self.matcher.match_job_data(self.profile, job) for job in self.jobs]
+
+    def test_inline_matches_match_job(self):
+        """Test single-worker batches equal one match_job call per job"""
+        results = self.matcher.match_jobs(self.profile, iter(self.jobs), workers=1)
+        self.assertNotIsInstance(results, list)
+        self.assertEqual(list(results), self._expected())
+
+    def test_process_pool_preserves_order(self):
+        """Test pooled scoring returns the same results in input order"""
+        results = list(self.matcher.match_jobs(self.profile, self.jobs, workers=2, chunk_size=16))
+        self.assertEqual(results, self._expected())
+        self.assertEqual([match.job_id for match in results],
+                         [f"li:{1000 + i}" for i in range(len(self.jobs))])
+
+    def test_empty_batch(self):
+        """Test an empty batch yields nothing"""
+        self.assertEqual(list(self.matcher.match_jobs(self.profile, [], workers=2)), [])
+
+
+class TestCompiledProfile(unittest.TestCase):
+    """Test the precompiled profile used for scoring"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.matcher = AIJobMatcher()
+        cls.profile = UserProfile(skills=['Python', 'SQL', 'Docker'], experience_years=2,
+                                  education=['Bachelor of Science', 'AWS Certification'], certifications=[],
+                                  preferred_industries=['finance', 'health'],
+                                  preferred_locations=['New York', 'Boston'], salary_expectation=None,
+                                  remote_preference=False, company_size_preference='medium')
+
+    def test_compiles_lookup_fields(self):
+        """Test profile fields are lowered into sets and joined strings"""
+        compiled = CompiledProfile.from_profile(self.profile)
+        self.assertEqual(compiled.skills, {'python', 'sql', 'docker'})
+        self.assertEqual(compiled.education_text, 'bachelor of science aws certification')
+        self.assertEqual(compiled.locations, ('new york', 'boston'))
+        self.assertEqual(CompiledProfile.from_profile(
+            replace(self.profile, preferred_industries=['Finance'])).industries, ('finance',))
+        self.assertIs(CompiledProfile.from_profile(compiled), compiled)
+
+    def test_is_frozen_and_slotted(self):
+        """Test compiled profiles are immutable and carry no instance dict"""
+        compiled = CompiledProfile.from_profile(self.profile)
+        with self.assertRaises(FrozenInstanceError):
+            compiled.experience_years = 10
+        self.assertFalse(hasattr(compiled, '__dict__'))
+
+    def test_scores_match_uncompiled_profile(self):
+        """Test compiled and plain profiles score every job identically"""
+        compiled = CompiledProfile.from_profile(self.profile)
+        descriptions = [
+            "Python and SQL in a finance team located in New York. 3+ years experience. Bachelor degree.",
+            "Remote Java and Kubernetes role, phd preferred",
+            "Docker engineer based in Chicago, at least 1 years, master degree",
+            "Health care data role with SQL",
+        ]
+        for description in descriptions:
+            requirements = self.matcher.extract_job_requirements(description)
+            self.assertEqual(self.matcher.calculate_match_score(compiled, requirements),
+                             self.matcher.calculate_match_score(self.profile, requirements))
+            self.assertEqual(self.matcher.match_job(compiled, "Engineer", description, "Acme"),
+                             self.matcher.match_job(self.profile, "Engineer", description, "Acme"))
+
+
+class TestTopKSelection(unittest.TestCase):
+    """Test bounded-heap top-K job selection"""
+
+    def test_returns_best_first(self):
+        """Test the k highest scores come back in descending order"""
+        scored = [(55.0, 'a'), (91.5, 'b'), (70.0, 'c'), (88.0, 'd'), (60.0, 'e')]
+        self.assertEqual(top_k_by_score(scored, 3), ['b', 'd', 'c'])
+        self.assertEqual(top_k_by_score(scored, 10), ['b', 'd', 'c', 'e', 'a'])
+
+    def test_ties_prefer_earlier_items(self):
+        """Test equal scores keep page order"""
+        scored = [(80.0, 'first'), (80.0, 'second'), (80.0, 'third'), (75.0, 'fourth')]
+        self.assertEqual(top_k_by_score(scored, 2), ['first', 'second'])
+
+    def test_zero_budget(self):
+        """Test no jobs are selected once the budget is spent"""
+        self.assertEqual(top_k_by_score([(99.0, 'a')], 0), [])
+
+    def test_streams_unhashable_items(self):
+        """Test a generator of job dicts is consumed without comparing the dicts"""
+        jobs = ({'title': f"Job {i}", 'score': i % 7} for i in range(1000))
+        best = top_k_by_score(((job['score'], job) for job in jobs), 3)
+        self.assertEqual([job['title'] for job in best], ['Job 6', 'Job 13', 'Job 20'])
+
+
+class TestRequirementsCache(unittest.TestCase):
+    """Test memoisation of parsed job requirements"""
+
+    def setUp(self):
+        """Set up a temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_evicts_least_recently_used_by_count(self):
+        """Test the oldest untouched entry is evicted past max_entries"""
+        cache = RequirementsCache(max_entries=2)
+        cache.put('a', {'v': 1})
+        cache.put('b', {'v': 2})
+        cache.get('a')
+        cache.put('c', {'v': 3})
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), {'v': 1})
+        self.assertEqual(len(cache), 2)
+
+    def test_evicts_by_bytes(self):
+        """Test the byte bound evicts entries and skips oversized values"""
+        cache = RequirementsCache(max_entries=100, max_bytes=100)
+        cache.put('a', {'text': 'x' * 40})
+        cache.put('b', {'text': 'y' * 40})
+        self.assertIsNone(cache.get('a'))
+        self.assertLessEqual(cache.stats['bytes'], 100)
+        cache.put('huge', {'text': 'z' * 500})
+        self.assertIsNone(cache.get('huge'))
+        self.assertIsNotNone(cache.get('b'))
+
+    def test_hit_and_miss_counters(self):
+        """Test stats count hits and misses"""
+        cache = RequirementsCache()
+        calls = []
+        for _ in range(3):
+            cache.get_or_compute('k', lambda: calls.append(1) or {'v': 1})
+        self.assertEqual(len(calls), 1)
+        stats = cache.stats
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (2, 1, 1))
+
+    def test_matcher_reuses_parse(self):
+        """Test repeat descriptions are served from the cache with identical results"""
+        matcher = AIJobMatcher()
+        description = "Python and SQL, 3+ years experience, remote"
+        first = matcher.extract_job_requirements(description)
+        second = matcher.extract_job_requirements(description)
+        self.assertEqual(first, second)
+        self.assertEqual(second['full_text'], description)
+        self.assertEqual(matcher.requirements_cache.stats['hits'], 1)
+        self.assertEqual(first, matcher._parse_job_requirements(description) |
+                         {'full_text': description, 'full_text_lower': description.lower()})
+
+    def test_key_depends_on_namespace(self):
+        """Test matchers with different keyword sets do not share entries"""
+        self.assertNotEqual(RequirementsCache.key("text", "a"), RequirementsCache.key("text", "b"))
+        self.assertEqual(RequirementsCache.key("text", "a"), RequirementsCache.key("text", "a"))
+
+    def test_persists_across_restarts(self):
+        """Test parses stored in the database are reused by a new process"""
+        db_path = os.path.join(self.temp_dir, 'test.db')
+        description = "Kubernetes and Docker, bachelor degree required"
+
+        db_manager = DatabaseManager(db_path)
+        expected = AIJobMatcher(RequirementsCache(store=db_manager)).extract_job_requirements(description)
+        db_manager.close()
+
+        db_manager = DatabaseManager(db_path)
+        matcher = AIJobMatcher(RequirementsCache(store=db_manager))
+        self.assertEqual(matcher.extract_job_requirements(description), expected)
+        stats = matcher.requirements_cache.stats
+        self.assertEqual((stats['store_hits'], stats['misses']), (1, 0))
+        db_manager.close()
+
+    def test_store_writes_go_through_write_behind(self):
+        """Test parses and corpus statistics are queued, not written on the calling thread"""
+        db_manager = DatabaseManager(os.path.join(self.temp_dir, 'test.db'))
+        writer = db_manager.start_write_behind()
+        started, release = threading.Event(), threading.Event()
+        writer.submit(lambda cursor: (started.set(), release.wait(5)))
+        started.wait(5)
+
+        matcher = AIJobMatcher(RequirementsCache(store=db_manager), scoring_mode='bm25')
+        matcher.extract_job_requirements("Python and SQL")
+        conn = db_manager._get_connection()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM parsed_requirements").fetchone()[0], 0)
+        self.assertEqual(matcher.relevance_model.document_count, 0)
+
+        release.set()
+        writer.flush()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM parsed_requirements").fetchone()[0], 1)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM relevance_documents").fetchone()[0], 1)
+        self.assertEqual(matcher.relevance_model.document_count, 1)
+        db_manager.close()
+
+
+class TestBM25Relevance(unittest.TestCase):
+    """Test the BM25 relevance scoring mode"""
+
+    def setUp(self):
+        """Set up a temporary directory and a profile"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.profile = UserProfile(skills=['python'], experience_years=5, education=[], certifications=[],
+                                   preferred_industries=[], preferred_locations=[], salary_expectation=None,
+                                   remote_preference=False, company_size_preference='medium')
+
+    def tearDown(self):
+        """Clean up"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_rejects_unknown_mode(self):
+        """Test only known scoring modes are accepted"""
+        with self.assertRaises(ValueError):
+            AIJobMatcher(scoring_mode='cosine')
+
+    def test_document_frequencies_count_each_description_once(self):
+        """Test repeated descriptions do not inflate the statistics"""
+        model = BM25RelevanceModel(['python', 'java'])
+        self.assertTrue(model.add_document('a', 10, {'python': 2, 'unknown': 1}))
+        self.assertFalse(model.add_document('a', 10, {'python': 2}))
+        model.add_document('b', 30, {'java': 1, 'python': 1})
+        self.assertEqual(model.document_count, 2)
+        self.assertEqual(model.average_length, 20)
+        self.assertEqual(model.document_frequencies, [1, 2])
+        # Rarer terms weigh more
+        self.assertGreater(model.idf[model.term_index['java']], model.idf[model.term_index['python']])
+
+    def test_relevance_rewards_central_skills(self):
+        """Test a description built around a skill scores higher than one mentioning it once"""
+        weighted = AIJobMatcher()
+        relevance = AIJobMatcher(scoring_mode='bm25')
+        central = "Python developer. Python services, Python tooling and Python testing. Some Java and Docker."
+        passing = "Java developer. Java services, Java tooling and Java testing. Some Python and Docker."
+        for description in (central, passing):
+            relevance.extract_job_requirements(description)
+
+        self.assertEqual(weighted.match_job(self.profile, "Dev", central, "Acme").match_score,
+                         weighted.match_job(self.profile, "Dev", passing, "Acme").match_score)
+        central_match = relevance.match_job(self.profile, "Dev", central, "Acme")
+        passing_match = relevance.match_job(self.profile, "Dev", passing, "Acme")
+        self.assertGreater(central_match.match_score, passing_match.match_score)
+        self.assertTrue(any("BM25" in reason for reason in central_match.reasons))
+
+    def test_statistics_persist_across_restarts(self):
+        """Test corpus statistics are stored with a persistent requirements cache"""
+        db_path = os.path.join(self.temp_dir, 'test.db')
+        descriptions = ["Python and SQL", "Java and SQL", "Python and Docker"]
+
+        db_manager = DatabaseManager(db_path)
+        matcher = AIJobMatcher(RequirementsCache(store=db_manager), scoring_mode='bm25')
+        for description in descriptions + descriptions[:1]:
+            matcher.extract_job_requirements(description)
+        db_manager.close()
+
+        db_manager = DatabaseManager(db_path)
+        matcher = AIJobMatcher(RequirementsCache(store=db_manager), scoring_mode='bm25')
+        model = matcher.relevance_model
+        self.assertEqual(model.document_count, 3)
+        self.assertEqual(model.document_frequencies[model.term_index['sql']], 2)
+        matcher.extract_job_requirements(descriptions[1])
+        self.assertEqual(model.document_count, 3)
+        db_manager.close()
+
+    def test_description_counted_once_across_parser_versions(self):
+        """Test re-parsing after a parser version bump does not count a description again"""
+        matcher = AIJobMatcher(scoring_mode='bm25')
+        matcher.extract_job_requirements("Python and SQL")
+        with patch('ai_job_matcher.REQUIREMENTS_PARSER_VERSION', 'bumped'):
+            matcher.extract_job_requirements("Python and SQL")
+        self.assertEqual(matcher.requirements_cache.stats['misses'], 2)
+        self.assertEqual(matcher.relevance_model.document_count, 1)
+
+    def test_reloaded_taxonomy_terms_are_scored(self):
+        """Test skills added by a taxonomy reload join the relevance vocabulary"""
+        path = os.path.join(self.temp_dir, 'taxonomy.json')
+        taxonomy = {'skills': {'programming': ['python']}}
+        with open(path, 'w') as f:
+            json.dump(taxonomy, f)
+        source = TaxonomySource(path, check_interval=0)
+        matcher = AIJobMatcher(scoring_mode='bm25', taxonomy=source)
+        matcher.extract_job_requirements("Python services")
+        self.assertNotIn('terraform', matcher.relevance_model.term_index)
+
+        taxonomy['skills']['cloud'] = ['terraform']
+        with open(path, 'w') as f:
+            json.dump(taxonomy, f)
+        os.utime(path, ns=(0, 0))
+        requirements = matcher.extract_job_requirements("Python with Terraform modules")
+        model = matcher.relevance_model
+        self.assertEqual(model.document_frequencies[model.term_index['terraform']], 1)
+        self.assertGreater(model.term_weights(requirements['skill_counts'], requirements['word_count'])['terraform'], 0)
+
+    def test_process_pool_uses_relevance_mode(self):
+        """Test pooled batches score with a copy of the relevance statistics"""
+        matcher = AIJobMatcher(scoring_mode='bm25')
+        jobs = [{'title': f"Job {i}", 'company': "Acme",
+                 'description': f"{'Python ' * (i % 4 + 1)} and {'Java ' * (3 - i % 4)} role {i}"}
+                for i in range(40)]
+        for job in jobs:
+            matcher.extract_job_requirements(job['description'])
+        inline = list(matcher.match_jobs(self.profile, jobs, workers=1))
+        pooled = list(matcher.match_jobs(self.profile, jobs, workers=2, chunk_size=8))
+        self.assertEqual([match.match_score for match in pooled], [match.match_score for match in inline])
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+class TestVectorizedScorer(unittest.TestCase):
+    """Test corpus-wide scoring against calculate_match_score"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.matcher = AIJobMatcher()
+        cls.scorer = VectorizedScorer(cls.matcher)
+        cls.descriptions = [
+            "Python and SQL in a finance team located in New York. 3+ years experience. Bachelor degree.",
+            "Remote Java and Kubernetes role, phd preferred, at least 7 years",
+            "Docker engineer based in Boston, master degree, fintech startup",
+            "Health care data role with SQL Server and machine learning",
+            "Office manager, no technical requirements",
+            "Go and R developer, remote, 1+ years experience in retail",
+        ]
+        cls.profiles = [
+            UserProfile(skills=['Python', 'SQL', 'Docker'], experience_years=2, education=['Bachelor of Science'],
+                        certifications=[], preferred_industries=['finance'], preferred_locations=['New York'],
+                        salary_expectation=None, remote_preference=False, company_size_preference='medium'),
+            UserProfile(skills=['java', 'kubernetes', 'go'], experience_years=10, education=[],
+                        certifications=[], preferred_industries=[], preferred_locations=[],
+                        salary_expectation=None, remote_preference=True, company_size_preference='large'),
+            UserProfile(skills=['r', 'machine learning'], experience_years=0, education=['PhD Statistics'],
+                        certifications=[], preferred_industries=['health'], preferred_locations=['boston'],
+                        salary_expectation=None, remote_preference=True, company_size_preference='startup'),
+        ]
+        cls.corpus = cls.scorer.build_corpus(cls.descriptions, job_ids=[f"job-{i}" for i in range(6)])
+
+    def test_matches_calculate_match_score(self):
+        """Test every job/profile score equals the per-job implementation"""
+        scores = self.scorer.score(self.corpus, self.profiles)
+        self.assertEqual(scores.shape, (len(self.descriptions), len(self.profiles)))
+        for i, description in enumerate(self.descriptions):
+            requirements = self.matcher.extract_job_requirements(description)
+            for j, profile in enumerate(self.profiles):
+                expected = self.matcher.calculate_match_score(profile, requirements)[0]
+                self.assertAlmostEqual(scores[i, j], expected, delta=VectorizedScorer.SCORE_TOLERANCE)
+
+    def test_single_profile_shape(self):
+        """Test a single profile returns one score per job"""
+        scores = self.scorer.score(self.corpus, self.profiles[0])
+        self.assertEqual(scores.shape, (len(self.descriptions),))
+        self.assertEqual(list(scores), list(self.scorer.score(self.corpus, self.profiles)[:, 0]))
+
+    def test_rank_orders_best_first(self):
+        """Test rank returns job ids by descending score"""
+        ranking = self.scorer.rank(self.corpus, self.profiles[0], limit=3)
+        self.assertEqual(len(ranking), 3)
+        self.assertEqual(ranking[0][0], "job-0")
+        self.assertEqual([score for _, score in ranking], sorted((score for _, score in ranking), reverse=True))
+
+    def test_dense_fallback_without_scipy(self):
+        """Test dense matrices give the same scores as sparse ones"""
+        with patch('vectorized_scoring.SCIPY_AVAILABLE', False):
+            corpus = self.scorer.build_corpus(self.descriptions)
+        if SCIPY_AVAILABLE:
+            self.assertNotIsInstance(corpus.skills, type(self.corpus.skills))
+        self.assertEqual(self.scorer.score(corpus, self.profiles).tolist(),
+                         self.scorer.score(self.corpus, self.profiles).tolist())
+
+    def test_empty_corpus(self):
+        """Test an empty corpus scores to an empty array"""
+        corpus = self.scorer.build_corpus([])
+        self.assertEqual(len(self.scorer.score(corpus, self.profiles[0])), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
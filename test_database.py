@@ -0,0 +1,1060 @@
+"""
+Unit tests for the database layer
+Covers connection pooling, write paths and query behaviour of DatabaseManager
+"""
+import unittest
+import os
+import csv
+import json
+import queue
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from unittest.mock import Mock
+from datetime import datetime, timedelta
+
+from database import (DatabaseManager, JobApplication, JobSearch, canonical_job_key, PYARROW_AVAILABLE,
+                      DESCRIPTION_MINHASHER)
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test pooled connection handling"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_connection_reused_within_thread(self):
+        """Test the same thread always gets the same connection"""
+        first = self.db_manager._get_connection()
+        second = self.db_manager._get_connection()
+        self.assertIs(first, second)
+        self.assertEqual(self.db_manager.pool.size, 1)
+
+    def test_connection_per_thread(self):
+        """Test each thread gets its own connection"""
+        main_conn = self.db_manager._get_connection()
+        thread_conns, pool_sizes = [], []
+
+        def worker():
+            thread_conns.append(self.db_manager._get_connection())
+            pool_sizes.append(self.db_manager.pool.size)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(main_conn, thread_conns[0])
+        self.assertEqual(pool_sizes, [2])
+
+    def test_connection_released_when_thread_exits(self):
+        """Test short-lived threads do not leave connections behind"""
+        self.db_manager._get_connection()
+        thread_conns = []
+
+        def worker():
+            thread_conns.append(self.db_manager._get_connection())
+            self.db_manager.get_job_applications()
+
+        for _ in range(50):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(self.db_manager.pool.size, 1)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            thread_conns[0].execute("SELECT 1")
+        self.assertEqual(self.db_manager.get_job_applications(), [])
+
+    def test_wal_pragmas_applied(self):
+        """Test WAL journal mode and tuned pragmas are set"""
+        conn = self.db_manager._get_connection()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+        self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -16000)
+
+    def test_concurrent_writes_from_threads(self):
+        """Test several threads can write through the shared manager"""
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(10):
+                    self.db_manager.add_job_application(JobApplication(
+                        job_title=f"Job {n}-{i}",
+                        company="Test Company",
+                        application_date=datetime.now()
+                    ))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.db_manager.get_job_applications(limit=100)), 40)
+
+    def test_close_releases_connections(self):
+        """Test close() closes the pool and rejects further use"""
+        self.db_manager._get_connection()
+        self.db_manager.close()
+        self.assertEqual(self.db_manager.pool.size, 0)
+        with self.assertRaises(Exception):
+            self.db_manager.get_job_applications()
+
+
+class TestJobApplicationStorage(unittest.TestCase):
+    """Test job application and search session persistence"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_add_and_get_job_application(self):
+        """Test a job application round-trips through the database"""
+        job_id = self.db_manager.add_job_application(JobApplication(
+            job_title="Test Job",
+            company="Test Company",
+            job_url="https://linkedin.com/jobs/view/123",
+            application_date=datetime.now(),
+            easy_apply=True
+        ))
+
+        applications = self.db_manager.get_job_applications()
+        self.assertEqual(len(applications), 1)
+        self.assertEqual(applications[0].id, job_id)
+        self.assertEqual(applications[0].job_title, "Test Job")
+        self.assertTrue(applications[0].easy_apply)
+
+    def test_add_job_search_session(self):
+        """Test a search session can be recorded"""
+        session_id = self.db_manager.add_job_search_session(JobSearch(
+            search_date=datetime.now(),
+            keywords="Data Analyst",
+            jobs_found=10,
+            applications_sent=5
+        ))
+        self.assertIsNotNone(session_id)
+
+    def test_analytics_counts(self):
+        """Test analytics reflect stored applications"""
+        for i, status in enumerate(['applied', 'applied', 'interviewed']):
+            self.db_manager.add_job_application(JobApplication(
+                job_title=f"Job {i}", company="Acme", status=status,
+                application_date=datetime.now()
+            ))
+
+        analytics = self.db_manager.get_analytics(30)
+        self.assertEqual(analytics['total_applications'], 3)
+        self.assertEqual(analytics['status_breakdown']['applied'], 2)
+        self.assertEqual(self.db_manager.get_daily_stats()['applications_sent'], 3)
+
+
+class TestAnalyticsRollup(unittest.TestCase):
+    """Test trigger-maintained daily analytics rollups"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _add(self, company, status='applied', days_ago=0):
+        self.counter = getattr(self, 'counter', 0) + 1
+        return self.db_manager.add_job_application(JobApplication(
+            job_title=f"Job {self.counter}", company=company, status=status,
+            application_date=datetime.now() - timedelta(days=days_ago)
+        ))
+
+    def _rollup_rows(self):
+        conn = self.db_manager._get_connection()
+        return (
+            conn.execute("SELECT date, total_applications, total_interviews, total_offers, success_rate "
+                         "FROM analytics ORDER BY date").fetchall(),
+            conn.execute("SELECT * FROM analytics_status_daily ORDER BY date, status").fetchall(),
+            conn.execute("SELECT * FROM analytics_company_daily ORDER BY date, company").fetchall(),
+        )
+
+    def test_insert_updates_rollup(self):
+        """Test inserts (single and bulk) are counted in the rollup"""
+        self._add("Acme")
+        self._add("Acme", status='interviewed', days_ago=2)
+        self.db_manager.add_job_applications_bulk([
+            JobApplication(job_title="Job", company="Globex", status='accepted', application_date=datetime.now())
+        ])
+
+        analytics = self.db_manager.get_analytics(30)
+        self.assertEqual(analytics['total_applications'], 3)
+        self.assertEqual(analytics['status_breakdown'], {'applied': 1, 'interviewed': 1, 'accepted': 1})
+        self.assertEqual(analytics['success_rate'], 66.67)
+        self.assertEqual(analytics['top_companies'][0], ('Acme', 2))
+        self.assertEqual([count for _, count in analytics['daily_counts']], [1, 2])
+
+    def test_window_excludes_old_days(self):
+        """Test rows outside the window are not counted"""
+        self._add("Acme", days_ago=40)
+        self._add("Acme")
+        self.assertEqual(self.db_manager.get_analytics(30)['total_applications'], 1)
+        self.assertEqual(self.db_manager.get_analytics(60)['total_applications'], 2)
+
+    def test_update_and_delete_adjust_rollup(self):
+        """Test status changes and deletes move counts between buckets"""
+        app_id = self._add("Acme")
+        self.db_manager.update_job_application(app_id, {'status': 'interviewed'})
+
+        analytics = self.db_manager.get_analytics(30)
+        self.assertEqual(analytics['status_breakdown'], {'interviewed': 1})
+        self.assertEqual(analytics['success_rate'], 100.0)
+
+        conn = self.db_manager._get_connection()
+        with conn:
+            conn.execute("DELETE FROM job_applications WHERE id = ?", (app_id,))
+
+        analytics = self.db_manager.get_analytics(30)
+        self.assertEqual(analytics['total_applications'], 0)
+        self.assertEqual(analytics['status_breakdown'], {})
+        self.assertEqual(analytics['top_companies'], [])
+
+    def test_rebuild_matches_trigger_maintained_rollup(self):
+        """Test a full rebuild reproduces what the triggers maintained"""
+        for i in range(30):
+            app_id = self._add(f"Company {i % 4}", days_ago=i % 5)
+            if i % 3 == 0:
+                self.db_manager.update_job_application(app_id, {'status': 'rejected'})
+
+        maintained = self._rollup_rows()
+        self.db_manager.rebuild_analytics()
+        self.assertEqual(self._rollup_rows(), maintained)
+
+    def test_null_status_counted_as_unknown(self):
+        """Test rows without a status are written and rolled up under 'unknown'"""
+        app_id = self._add("Acme", status=None)
+        self._add("Acme", status='accepted')
+
+        analytics = self.db_manager.get_analytics(30)
+        self.assertEqual(analytics['total_applications'], 2)
+        self.assertEqual(analytics['status_breakdown'], {'unknown': 1, 'accepted': 1})
+        self.assertEqual(analytics['success_rate'], 50.0)
+
+        maintained = self._rollup_rows()
+        self.db_manager.rebuild_analytics()
+        self.assertEqual(self._rollup_rows(), maintained)
+
+        self.db_manager.update_job_application(app_id, {'status': 'interviewed'})
+        self.db_manager.update_job_application(app_id, {'status': None})
+        conn = self.db_manager._get_connection()
+        with conn:
+            conn.execute("DELETE FROM job_applications WHERE id = ?", (app_id,))
+        self.assertEqual(self.db_manager.get_analytics(30)['status_breakdown'], {'accepted': 1})
+
+    def test_existing_history_backfilled(self):
+        """Test upgrading a database from before the rollups backfills them"""
+        self._add("Acme")
+        conn = self.db_manager._get_connection()
+        with conn:
+            conn.execute("DELETE FROM analytics")
+        conn.execute("PRAGMA user_version = 3")
+        self.db_manager.close()
+
+        self.db_manager = DatabaseManager(self.db_path)
+        self.assertEqual(self.db_manager.get_analytics(30)['total_applications'], 1)
+
+
+class TestKeysetPagination(unittest.TestCase):
+    """Test cursor-based paging over job applications"""
+
+    def setUp(self):
+        """Set up test database with applications sharing timestamps"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        self.ids = self.db_manager.add_job_applications_bulk([
+            JobApplication(
+                job_title=f"Job {i}",
+                company="Acme" if i % 2 else "Globex",
+                status='applied' if i % 3 else 'rejected',
+                # Pairs of rows share a timestamp to exercise the id tie-break
+                application_date=base + timedelta(minutes=i // 2)
+            )
+            for i in range(25)
+        ])
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _expected_order(self, predicate=lambda app: True):
+        applications = [app for app in self.db_manager.get_job_applications(limit=1000) if predicate(app)]
+        return [app.id for app in sorted(applications, key=lambda app: (app.application_date, app.id), reverse=True)]
+
+    def test_pages_cover_everything_once(self):
+        """Test walking pages visits every row once, newest first"""
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = self.db_manager.get_job_applications_page(cursor, page_size=7)
+            self.assertLessEqual(len(page), 7)
+            seen.extend(app.id for app in page)
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, self._expected_order())
+
+    def test_iterator_matches_pages(self):
+        """Test the streaming iterator yields the same sequence"""
+        streamed = [app.id for app in self.db_manager.iter_job_applications(page_size=4)]
+        self.assertEqual(streamed, self._expected_order())
+
+    def test_iterator_resumes_after_cursor(self):
+        """Test iteration can resume from an id"""
+        expected = self._expected_order()
+        resumed = [app.id for app in self.db_manager.iter_job_applications(after_id=expected[9], page_size=5)]
+        self.assertEqual(resumed, expected[10:])
+
+    def test_filters(self):
+        """Test status and company filters are applied to every page"""
+        streamed = [
+            app.id for app in self.db_manager.iter_job_applications(
+                page_size=3, filters={'status': 'applied', 'company': 'Acme'})
+        ]
+        self.assertEqual(
+            streamed,
+            self._expected_order(lambda app: app.status == 'applied' and app.company == 'Acme')
+        )
+
+    def test_invalid_arguments(self):
+        """Test unknown filters and cursors are rejected"""
+        with self.assertRaises(ValueError):
+            self.db_manager.get_job_applications_page(filters={'job_title': 'Job 1'})
+        with self.assertRaises(ValueError):
+            self.db_manager.get_job_applications_page(after_id=999999)
+
+    def test_last_page_has_no_cursor(self):
+        """Test an exact-fit page reports no next cursor"""
+        page, cursor = self.db_manager.get_job_applications_page(page_size=25)
+        self.assertEqual(len(page), 25)
+        self.assertIsNone(cursor)
+
+
+class TestFullTextSearch(unittest.TestCase):
+    """Test the FTS5 index over job applications"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        self.k8s_id = self.db_manager.add_job_application(JobApplication(
+            job_title="Platform Engineer", company="Acme",
+            job_description="Run our Kubernetes clusters and Terraform pipelines.",
+            application_date=datetime.now()
+        ))
+        self.title_id = self.db_manager.add_job_application(JobApplication(
+            job_title="Kubernetes Administrator", company="Globex",
+            job_description="Operate production clusters.",
+            application_date=datetime.now()
+        ))
+        self.db_manager.add_job_application(JobApplication(
+            job_title="Data Analyst", company="Initech",
+            job_description="SQL, Tableau and Excel reporting.",
+            application_date=datetime.now()
+        ))
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_search_ranks_title_matches_first(self):
+        """Test bm25 weighting puts title hits ahead of description hits"""
+        if not self.db_manager.fts_enabled:
+            self.skipTest("FTS5 not available")
+
+        results = self.db_manager.search_applications("kubernetes")
+        self.assertEqual([r['id'] for r in results], [self.title_id, self.k8s_id])
+        self.assertIn('[Kubernetes]', results[1]['snippet'])
+
+    def test_search_prefix_and_multiple_terms(self):
+        """Test all terms must match and the last term is a prefix"""
+        results = self.db_manager.search_applications("kubernetes terra")
+        self.assertEqual([r['id'] for r in results], [self.k8s_id])
+
+    def test_search_handles_special_characters(self):
+        """Test FTS syntax characters in user input do not raise"""
+        self.assertEqual(self.db_manager.search_applications('"unbalanced AND ('), [])
+        self.assertEqual(self.db_manager.search_applications("   "), [])
+
+    def test_like_fallback_matches_terms_literally(self):
+        """Test without FTS5 every term must match and LIKE wildcards in input are literal"""
+        self.db_manager.fts_enabled = False
+        discount_id = self.db_manager.add_job_application(JobApplication(
+            job_title="Pricing Analyst", company="Acme",
+            job_description="Own 100% of discount_rate models.",
+            application_date=datetime.now()
+        ))
+
+        self.assertEqual([r['id'] for r in self.db_manager.search_applications("clusters terraform")],
+                         [self.k8s_id])
+        self.assertEqual([r['id'] for r in self.db_manager.search_applications("100% discount_rate")],
+                         [discount_id])
+        self.assertEqual([r['id'] for r in self.db_manager.search_applications("%")], [discount_id])
+        self.assertEqual(self.db_manager.search_applications("discount_r_te"), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test triggers keep the index in sync with the base table"""
+        self.db_manager.update_job_application(self.k8s_id, {'job_description': 'Docker only.'})
+        self.assertEqual([r['id'] for r in self.db_manager.search_applications("kubernetes")], [self.title_id])
+
+        conn = self.db_manager._get_connection()
+        with conn:
+            conn.execute("DELETE FROM job_applications WHERE id = ?", (self.title_id,))
+        self.assertEqual(self.db_manager.search_applications("kubernetes"), [])
+
+    def test_existing_rows_indexed_on_upgrade(self):
+        """Test rows written before the FTS table existed are indexed on open"""
+        if not self.db_manager.fts_enabled:
+            self.skipTest("FTS5 not available")
+
+        conn = self.db_manager._get_connection()
+        with conn:
+            conn.execute("DROP TABLE job_applications_fts")
+        conn.execute("PRAGMA user_version = 4")
+        self.db_manager.close()
+
+        self.db_manager = DatabaseManager(self.db_path)
+        self.assertTrue(self.db_manager.fts_enabled)
+        self.assertEqual(len(self.db_manager.search_applications("clusters")), 2)
+
+
+class TestJobIdentity(unittest.TestCase):
+    """Test canonical job keys, upserts and applied-job lookups"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_canonical_key_from_linkedin_urls(self):
+        """Test the numeric LinkedIn id is used whatever the URL shape"""
+        expected = "li:3712345678"
+        self.assertEqual(canonical_job_key("https://www.linkedin.com/jobs/view/3712345678/?refId=abc"), expected)
+        self.assertEqual(canonical_job_key("https://www.linkedin.com/jobs/view/data-analyst-at-acme-3712345678"), expected)
+        self.assertEqual(canonical_job_key("https://www.linkedin.com/jobs/search/?currentJobId=3712345678&keywords=x"), expected)
+
+    def test_canonical_key_fallback_is_normalised(self):
+        """Test the company/title fallback ignores case and punctuation"""
+        self.assertEqual(
+            canonical_job_key("", "Acme, Inc.", "Senior Data-Analyst"),
+            canonical_job_key("https://example.com/careers/1", "acme inc", "senior data analyst")
+        )
+        self.assertNotEqual(canonical_job_key("", "Acme", "Analyst"), canonical_job_key("", "Acme", "Engineer"))
+
+    def test_duplicate_insert_rejected(self):
+        """Test the unique index blocks a second plain insert of the same job"""
+        job = JobApplication(job_title="Analyst", company="Acme", job_url="https://www.linkedin.com/jobs/view/42")
+        self.db_manager.add_job_application(job)
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.db_manager.add_job_application(job)
+
+    def test_upsert_updates_existing_row(self):
+        """Test upserting a known job refreshes scraped fields in place"""
+        url = "https://www.linkedin.com/jobs/view/42"
+        first_id = self.db_manager.upsert_job_application(JobApplication(
+            job_title="Analyst", company="Acme", job_url=url, location="Remote"))
+        second_id = self.db_manager.upsert_job_application(JobApplication(
+            job_title="Analyst", company="Acme", job_url=url + "?refId=x", salary_range="$100k"))
+
+        self.assertEqual(first_id, second_id)
+        applications = self.db_manager.get_job_applications()
+        self.assertEqual(len(applications), 1)
+        self.assertEqual(applications[0].location, "Remote")
+        self.assertEqual(applications[0].salary_range, "$100k")
+        self.assertEqual(applications[0].job_key, "li:42")
+
+    def test_upsert_keeps_tracked_status_and_notes(self):
+        """Test re-seeing a job does not reset its status or overwrite notes, but fills missing ones"""
+        job = JobApplication(job_title="Analyst", company="Acme", job_url="https://www.linkedin.com/jobs/view/42")
+        app_id = self.db_manager.upsert_job_application(job)
+        self.db_manager.update_job_application(app_id, {'status': 'interviewed', 'notes': 'Call with Sam'})
+        self.db_manager.upsert_job_application(job)
+
+        stored = self.db_manager.get_job_applications()[0]
+        self.assertEqual((stored.status, stored.notes), ('interviewed', 'Call with Sam'))
+
+        self.db_manager.update_job_application(app_id, {'status': None, 'notes': None})
+        self.db_manager.upsert_job_application(JobApplication(
+            job_title="Analyst", company="Acme", job_url=job.job_url, notes="Referred"))
+        stored = self.db_manager.get_job_applications()[0]
+        self.assertEqual((stored.status, stored.notes), ('applied', 'Referred'))
+
+    def test_bulk_insert_merges_duplicates(self):
+        """Test a known or repeated job in a bulk insert does not fail the batch"""
+        url = "https://www.linkedin.com/jobs/view/42"
+        existing_id = self.db_manager.add_job_application(JobApplication(
+            job_title="Analyst", company="Acme", job_url=url, status='interviewed'))
+        ids = self.db_manager.add_job_applications_bulk([
+            JobApplication(job_title="Engineer", company="Globex"),
+            JobApplication(job_title="Analyst", company="Acme", job_url=url),
+            JobApplication(job_title="Engineer", company="Globex"),
+        ])
+
+        self.assertEqual(ids[1], existing_id)
+        self.assertEqual(ids[0], ids[2])
+        self.assertEqual(len(self.db_manager.get_job_applications()), 2)
+        self.assertEqual(self.db_manager.get_job_applications(status='interviewed')[0].id, existing_id)
+
+    def test_has_applied_batch_lookup(self):
+        """Test has_applied returns only known keys"""
+        self.db_manager.add_job_application(JobApplication(
+            job_title="Analyst", company="Acme", job_url="https://www.linkedin.com/jobs/view/42"))
+        unknown = [f"li:{i}" for i in range(1000, 2200)]
+
+        self.assertEqual(self.db_manager.has_applied(unknown + ["li:42", ""]), {"li:42"})
+        self.assertEqual(self.db_manager.has_applied([]), set())
+
+    def test_job_keys_backfilled_on_upgrade(self):
+        """Test databases created before job_key get the column and keys"""
+        self.db_manager.close()
+        os.remove(self.db_path)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE job_applications (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, job_title TEXT NOT NULL,
+                    company TEXT NOT NULL, job_url TEXT, application_date TIMESTAMP,
+                    status TEXT DEFAULT 'applied', easy_apply BOOLEAN, notes TEXT,
+                    salary_range TEXT, location TEXT, job_description TEXT,
+                    response_received BOOLEAN, response_date TIMESTAMP,
+                    interview_scheduled BOOLEAN, interview_date TIMESTAMP,
+                    created_at TIMESTAMP, updated_at TIMESTAMP
+                )
+            """)
+            conn.executemany(
+                "INSERT INTO job_applications (job_title, company, job_url) VALUES (?, ?, ?)",
+                [("Analyst", "Acme", "https://www.linkedin.com/jobs/view/7"),
+                 ("Analyst", "Acme", "https://www.linkedin.com/jobs/view/7"),
+                 ("Engineer", "Globex", "")]
+            )
+        conn.close()
+
+        self.db_manager = DatabaseManager(self.db_path)
+        keys = [app.job_key for app in sorted(self.db_manager.get_job_applications(), key=lambda app: app.id)]
+        self.assertEqual(keys[0], "li:7")
+        self.assertEqual(keys[1], "")
+        self.assertEqual(keys[2], canonical_job_key("", "Globex", "Engineer"))
+
+
+class TestNearDuplicateSignatures(unittest.TestCase):
+    """Test description MinHash signatures stored with applications"""
+
+    DESCRIPTION = ("We are hiring a data analyst to build dashboards in Tableau and SQL, "
+                   "partner with finance and product teams, and own weekly reporting for "
+                   "the leadership group. Three years of experience with Python preferred.")
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_signature_stored_on_insert(self):
+        """Test inserts store a signature only when there is a description"""
+        self.db_manager.add_job_application(JobApplication(
+            job_title="Analyst", company="Acme", job_description=self.DESCRIPTION))
+        self.db_manager.add_job_application(JobApplication(job_title="Engineer", company="Acme"))
+        with self.db_manager._get_connection() as conn:
+            rows = conn.execute("SELECT description_minhash FROM job_applications ORDER BY id").fetchall()
+        self.assertEqual(len(rows[0][0]), 128 * 4)
+        self.assertIsNone(rows[1][0])
+
+    def test_index_finds_reposts(self):
+        """Test a reworded repost under another title and company is found"""
+        self.db_manager.add_job_application(JobApplication(
+            job_title="Data Analyst", company="Acme", job_url="https://www.linkedin.com/jobs/view/1",
+            job_description=self.DESCRIPTION))
+        index = self.db_manager.near_duplicate_index(0.9)
+        self.assertEqual(len(index), 1)
+
+        repost = DESCRIPTION_MINHASHER.signature(self.DESCRIPTION + " Apply today.")
+        other = DESCRIPTION_MINHASHER.signature("Senior backend engineer for payments, Go and Kubernetes.")
+        self.assertEqual(index.find_duplicate(repost)[0], "li:1")
+        self.assertIsNone(index.find_duplicate(other))
+
+    def test_signatures_backfilled_on_upgrade(self):
+        """Test rows stored before signatures existed get them on migration"""
+        self.db_manager.add_job_application(JobApplication(
+            job_title="Analyst", company="Acme", job_description=self.DESCRIPTION))
+        with self.db_manager._get_connection() as conn:
+            conn.execute("UPDATE job_applications SET description_minhash = NULL")
+            conn.execute("PRAGMA user_version = 7")
+            conn.commit()
+        self.db_manager.close()
+
+        self.db_manager = DatabaseManager(self.db_path)
+        index = self.db_manager.near_duplicate_index()
+        self.assertIsNotNone(index.find_duplicate(DESCRIPTION_MINHASHER.signature(self.DESCRIPTION)))
+
+
+class TestBulkInsert(unittest.TestCase):
+    """Test bulk and buffered write paths"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _make_applications(self, count):
+        return [
+            JobApplication(job_title=f"Job {i}", company=f"Company {i}", application_date=datetime.now())
+            for i in range(count)
+        ]
+
+    def test_bulk_insert_returns_ids(self):
+        """Test bulk insert assigns and returns contiguous ids in input order"""
+        self.db_manager.add_job_application(JobApplication(job_title="First", company="Acme"))
+        ids = self.db_manager.add_job_applications_bulk(self._make_applications(20))
+
+        self.assertEqual(ids, list(range(2, 22)))
+        stored = {app.id: app.job_title for app in self.db_manager.get_job_applications(limit=100)}
+        self.assertEqual(stored[ids[0]], "Job 0")
+        self.assertEqual(stored[ids[-1]], "Job 19")
+
+    def test_bulk_insert_empty(self):
+        """Test bulk insert of nothing is a no-op"""
+        self.assertEqual(self.db_manager.add_job_applications_bulk([]), [])
+        self.assertEqual(self.db_manager.add_job_search_sessions_bulk([]), [])
+
+    def test_bulk_insert_search_sessions(self):
+        """Test bulk insert of search sessions"""
+        sessions = [JobSearch(keywords=f"kw {i}") for i in range(5)]
+        ids = self.db_manager.add_job_search_sessions_bulk(sessions)
+        self.assertEqual(len(ids), 5)
+
+    def test_buffered_writer_flushes_on_batch_size(self):
+        """Test the buffered writer flushes once batch_size rows are queued"""
+        writer = self.db_manager.buffered_writer(batch_size=5, flush_interval=0)
+        for application in self._make_applications(7):
+            writer.add(application)
+
+        self.assertEqual(writer.pending, 2)
+        self.assertEqual(len(self.db_manager.get_job_applications()), 5)
+
+        writer.close()
+        self.assertEqual(writer.pending, 0)
+        self.assertEqual(len(self.db_manager.get_job_applications()), 7)
+        self.assertEqual(len(writer.inserted_ids['applications']), 7)
+
+    def test_buffered_writer_flushes_on_interval(self):
+        """Test the buffered writer flushes after flush_interval seconds"""
+        writer = self.db_manager.buffered_writer(batch_size=100, flush_interval=0.05)
+        writer.add(self._make_applications(1)[0])
+        writer.add(JobSearch(keywords="Data Analyst"))
+
+        deadline = time.time() + 2
+        while writer.pending and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(writer.pending, 0)
+        self.assertEqual(len(self.db_manager.get_job_applications()), 1)
+        writer.close()
+
+    def test_buffered_writer_keeps_rows_when_flush_fails(self):
+        """Test rows from a failed flush stay buffered and are written by the next one"""
+        writer = self.db_manager.buffered_writer(batch_size=100, flush_interval=0)
+        applications = self._make_applications(3)
+        writer.add(applications[0])
+        writer.add(applications[1])
+        writer.add(JobSearch(keywords="Data Analyst"))
+
+        original = self.db_manager.add_job_applications_bulk
+        self.db_manager.add_job_applications_bulk = Mock(side_effect=sqlite3.OperationalError("disk I/O error"))
+        with self.assertRaises(sqlite3.OperationalError):
+            writer.flush()
+        self.assertEqual(writer.pending, 3)
+
+        self.db_manager.add_job_applications_bulk = original
+        writer.add(applications[2])
+        writer.close()
+        self.assertEqual(writer.pending, 0)
+        stored = sorted((app.id, app.job_title) for app in self.db_manager.get_job_applications())
+        self.assertEqual([title for _, title in stored], ["Job 0", "Job 1", "Job 2"])
+        self.assertEqual(len(writer.inserted_ids['sessions']), 1)
+
+    def test_buffered_writer_uses_one_flusher_thread(self):
+        """Test repeated timed flushes reuse a single thread, which close() stops"""
+        writer = self.db_manager.buffered_writer(batch_size=100, flush_interval=0.01)
+        threads_before = threading.active_count()
+        for application in self._make_applications(5):
+            writer.add(application)
+            deadline = time.time() + 2
+            while writer.pending and time.time() < deadline:
+                time.sleep(0.005)
+            self.assertEqual(threading.active_count(), threads_before + 1)
+
+        self.assertEqual(len(self.db_manager.get_job_applications()), 5)
+        writer.close()
+        self.assertEqual(threading.active_count(), threads_before)
+
+    def test_buffered_writer_rejects_unknown_records(self):
+        """Test unsupported record types are rejected"""
+        with self.db_manager.buffered_writer() as writer:
+            with self.assertRaises(TypeError):
+                writer.add({"job_title": "Job"})
+
+
+class TestQueryPlans(unittest.TestCase):
+    """Regression tests guarding index use of the hot job_applications queries"""
+
+    def setUp(self):
+        """Set up test database with enough rows for the planner to care"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        self.db_manager.add_job_applications_bulk([
+            JobApplication(
+                job_title=f"Job {i}",
+                company=f"Company {i % 25}",
+                status=['applied', 'interviewed', 'rejected'][i % 3],
+                application_date=datetime.now()
+            )
+            for i in range(500)
+        ])
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _capture_queries(self, action, table='job_applications'):
+        """Run action and return the expanded SELECTs it issued against table"""
+        conn = self.db_manager._get_connection()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            action()
+        finally:
+            conn.set_trace_callback(None)
+        return [
+            statement for statement in statements
+            if statement.lstrip().upper().startswith('SELECT') and f"FROM {table}" in ' '.join(statement.split())
+        ]
+
+    def _query_plan(self, statement):
+        conn = self.db_manager._get_connection()
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}")]
+
+    def _assert_indexed(self, action, allow_index_scan=False):
+        """Assert every query issued by action is answered from an index.
+        
+        A plain ``SCAN job_applications`` is always a failure; an ordered
+        ``SCAN ... USING INDEX`` is only accepted for unfiltered LIMIT queries.
+        """
+        statements = self._capture_queries(action)
+        self.assertTrue(statements)
+        for statement in statements:
+            plan = self._query_plan(statement)
+            self.assertNotIn('SCAN job_applications', plan, f"Full table scan for: {statement}")
+            scans = [detail for detail in plan if detail.startswith('SCAN job_applications')]
+            if not allow_index_scan:
+                self.assertEqual(scans, [], f"Expected an index search for: {statement}\nPlan: {plan}")
+
+    def test_indexes_created(self):
+        """Test the secondary indexes exist"""
+        conn = self.db_manager._get_connection()
+        indexes = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'job_applications'"
+        )}
+        self.assertIn('idx_job_applications_application_date', indexes)
+        self.assertIn('idx_job_applications_status_date', indexes)
+        self.assertIn('idx_job_applications_company_date', indexes)
+
+    def test_analytics_served_from_rollups(self):
+        """Test get_analytics never touches job_applications and searches the rollups by date"""
+        action = lambda: self.db_manager.get_analytics(30)
+        self.assertEqual(self._capture_queries(action), [])
+
+        for table in ['analytics', 'analytics_status_daily', 'analytics_company_daily']:
+            statements = self._capture_queries(action, table)
+            self.assertTrue(statements, f"No query against {table}")
+            for statement in statements:
+                plan = self._query_plan(statement)
+                self.assertTrue(
+                    any(detail.startswith(f'SEARCH {table}') for detail in plan),
+                    f"Expected an index search for: {statement}\nPlan: {plan}"
+                )
+
+    def test_daily_stats_uses_indexes(self):
+        """Test get_daily_stats uses a sargable date range"""
+        self._assert_indexed(self.db_manager.get_daily_stats)
+
+    def test_job_listing_uses_indexes(self):
+        """Test status-filtered and unfiltered listings are index driven"""
+        self._assert_indexed(lambda: self.db_manager.get_job_applications(status='applied'))
+        self._assert_indexed(lambda: self.db_manager.get_job_applications(), allow_index_scan=True)
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+    """Test the background write-behind queue"""
+
+    def setUp(self):
+        """Set up test database and writer"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _application(self, i):
+        return JobApplication(job_title=f"Job {i}", company="Acme", application_date=datetime.now())
+
+    def _block_writer(self, writer):
+        """Occupy the writer thread until the returned event is set"""
+        started, release = threading.Event(), threading.Event()
+
+        def blocking(cursor):
+            started.set()
+            release.wait(5)
+
+        writer.submit(blocking)
+        started.wait(5)
+        return release
+
+    def test_writes_resolve_futures(self):
+        """Test queued writes commit and resolve to row ids"""
+        writer = self.db_manager.start_write_behind()
+        future = writer.upsert_job_application(self._application(1))
+        session_future = writer.add_job_search_session(JobSearch(keywords="Data Analyst"))
+
+        app_id = future.result(timeout=5)
+        self.assertIsNotNone(session_future.result(timeout=5))
+        self.assertEqual([app.id for app in self.db_manager.get_job_applications()], [app_id])
+
+        writer.update_job_application(app_id, {'status': 'interviewed'}).result(timeout=5)
+        self.assertEqual(self.db_manager.get_job_applications()[0].status, 'interviewed')
+
+    def test_writes_are_batched(self):
+        """Test writes queued while the writer is busy share a transaction"""
+        writer = self.db_manager.start_write_behind(batch_size=50)
+        release = self._block_writer(writer)
+        futures = [writer.add_job_application(self._application(i)) for i in range(40)]
+        release.set()
+        writer.flush()
+
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(writer.stats['largest_batch'], 40)
+        self.assertEqual(len(self.db_manager.get_job_applications()), 40)
+
+    def test_backpressure_when_full(self):
+        """Test producers are pushed back once max_pending writes are queued"""
+        writer = self.db_manager.start_write_behind(max_pending=2, put_timeout=0.05)
+        release = self._block_writer(writer)
+        writer.add_job_application(self._application(1))
+        writer.add_job_application(self._application(2))
+        with self.assertRaises(queue.Full):
+            writer.add_job_application(self._application(3))
+        release.set()
+        writer.flush()
+        self.assertEqual(len(self.db_manager.get_job_applications()), 2)
+
+    def test_failed_write_is_isolated(self):
+        """Test one failing write does not roll back its batch neighbours"""
+        writer = self.db_manager.start_write_behind()
+        release = self._block_writer(writer)
+        first = writer.add_job_application(self._application(1))
+        duplicate = writer.add_job_application(self._application(1))
+        second = writer.add_job_application(self._application(2))
+        release.set()
+
+        self.assertIsNotNone(first.result(timeout=5))
+        self.assertIsNotNone(second.result(timeout=5))
+        with self.assertRaises(sqlite3.IntegrityError):
+            duplicate.result(timeout=5)
+        self.assertEqual(writer.stats['failed'], 1)
+
+    def test_cancelled_future_does_not_stop_writer(self):
+        """Test a write cancelled while queued still commits and later writes go through"""
+        writer = self.db_manager.start_write_behind()
+        release = self._block_writer(writer)
+        cancelled = writer.add_job_application(self._application(1))
+        self.assertTrue(cancelled.cancel())
+        release.set()
+
+        self.assertIsNotNone(writer.add_job_application(self._application(2)).result(timeout=5))
+        self.assertTrue(writer.is_running)
+        self.assertEqual(len(self.db_manager.get_job_applications()), 2)
+
+    def test_close_flushes_pending_writes(self):
+        """Test shutting down writes everything still queued"""
+        writer = self.db_manager.start_write_behind()
+        release = self._block_writer(writer)
+        for i in range(100):
+            writer.add_job_application(self._application(i))
+        release.set()
+        self.db_manager.close()
+
+        self.db_manager = DatabaseManager(self.db_path)
+        self.assertEqual(len(self.db_manager.get_job_applications(limit=200)), 100)
+        with self.assertRaises(RuntimeError):
+            writer.add_job_application(self._application(101))
+
+    def test_readers_not_blocked_by_writer(self):
+        """Test concurrent readers never hit 'database is locked'"""
+        writer = self.db_manager.start_write_behind(batch_size=20)
+        errors = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                try:
+                    self.db_manager.get_analytics(30)
+                    self.db_manager.get_job_applications(limit=10)
+                except Exception as e:
+                    errors.append(e)
+
+        readers = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in readers:
+            thread.start()
+        for i in range(300):
+            writer.add_job_application(self._application(i))
+        writer.flush()
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.db_manager.get_analytics(30)['total_applications'], 300)
+
+
+class TestExport(unittest.TestCase):
+    """Test streaming export of application history"""
+
+    def setUp(self):
+        """Set up test database with history"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        base = datetime(2025, 1, 1, 9, 30)
+        self.db_manager.add_job_applications_bulk([
+            JobApplication(
+                job_title=f"Job {i}", company="Acme, Inc.", easy_apply=bool(i % 2),
+                job_description='Line one\n"quoted"', application_date=base + timedelta(days=i)
+            )
+            for i in range(25)
+        ])
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_csv_export(self):
+        """Test CSV export round-trips every row in chunks"""
+        path = os.path.join(self.temp_dir, 'out.csv')
+        self.assertEqual(self.db_manager.export(path, 'csv', chunk_size=7), 25)
+
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[0]['company'], "Acme, Inc.")
+        self.assertEqual(rows[0]['job_description'], 'Line one\n"quoted"')
+
+    def test_jsonl_export_since(self):
+        """Test JSON Lines export honours the since filter"""
+        path = os.path.join(self.temp_dir, 'out.jsonl')
+        rows = self.db_manager.export(path, 'jsonl', since=datetime(2025, 1, 21))
+        self.assertEqual(rows, 5)
+
+        with open(path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record['job_title'] for record in records], [f"Job {i}" for i in range(20, 25)])
+
+    def test_parquet_export(self):
+        """Test Parquet export writes typed columns"""
+        if not PYARROW_AVAILABLE:
+            self.skipTest("pyarrow not available")
+        import pyarrow.parquet as pq
+
+        path = os.path.join(self.temp_dir, 'out.parquet')
+        self.assertEqual(self.db_manager.export(path, 'parquet', chunk_size=10), 25)
+
+        table = pq.read_table(path)
+        self.assertEqual(table.num_rows, 25)
+        self.assertEqual(str(table.schema.field('application_date').type), 'timestamp[us]')
+        self.assertEqual(table.column('easy_apply').to_pylist()[:2], [False, True])
+        self.assertEqual(table.column('application_date').to_pylist()[0], datetime(2025, 1, 1, 9, 30))
+
+    def test_arrow_export(self):
+        """Test Arrow IPC export"""
+        if not PYARROW_AVAILABLE:
+            self.skipTest("pyarrow not available")
+        import pyarrow as pa
+
+        path = os.path.join(self.temp_dir, 'out.arrow')
+        self.db_manager.export(path, 'arrow', chunk_size=10)
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            self.assertEqual(reader.num_record_batches, 3)
+            self.assertEqual(reader.read_all().num_rows, 25)
+
+    def test_invalid_format(self):
+        """Test unknown formats are rejected"""
+        with self.assertRaises(ValueError):
+            self.db_manager.export(os.path.join(self.temp_dir, 'out.xlsx'), 'xlsx')
+
+    def test_cli_export(self):
+        """Test the command line entry point infers the format"""
+        from export_applications import main
+
+        path = os.path.join(self.temp_dir, 'cli.jsonl')
+        self.assertEqual(main([path, '--db', self.db_path]), 0)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
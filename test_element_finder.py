@@ -0,0 +1,92 @@
+"""
+Unit tests for element lookups without implicit waits
+Covers probes, explicit waits and lookup timings
+"""
+import unittest
+from unittest.mock import Mock
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+from element_finder import ElementFinder
+from job_card_extractor import LXML_AVAILABLE
+
+
+def element(displayed=True, enabled=True):
+    found = Mock()
+    found.is_displayed.return_value = displayed
+    found.is_enabled.return_value = enabled
+    return found
+
+
+class TestElementFinder(unittest.TestCase):
+    """Test probing and waiting for elements"""
+
+    def setUp(self):
+        """Set up a finder with a short timeout and a mock driver"""
+        self.finder = ElementFinder(timeout=0.2, poll_interval=0.01)
+        self.driver = Mock()
+
+    def test_probe_uses_find_elements(self):
+        """Test probes return the first match, or None for an empty result, without find_element"""
+        first, second = element(), element()
+        self.driver.find_elements.return_value = [first, second]
+        self.assertIs(self.finder.probe(self.driver, "//h3"), first)
+        self.driver.find_elements.assert_called_once_with(By.XPATH, "//h3")
+
+        self.driver.find_elements.return_value = []
+        self.assertIsNone(self.finder.probe(self.driver, "//h4"))
+        self.driver.find_element.assert_not_called()
+
+    def test_require_times_out(self):
+        """Test a required element that never appears raises after the timeout"""
+        self.driver.find_element.side_effect = NoSuchElementException("username")
+        with self.assertRaises(TimeoutException):
+            self.finder.require(self.driver, "username", by=By.ID)
+
+    def test_wait_for_any_returns_first_matching_selector(self):
+        """Test the wait ends on whichever selector matches, in the given order"""
+        button = element()
+        self.driver.find_elements.side_effect = lambda by, selector: [button] if selector == "//b" else []
+        self.assertEqual(self.finder.wait_for_any(self.driver, ["//a", "//b", "//c"]), ("//b", button))
+
+    def test_wait_for_any_clickable(self):
+        """Test disabled or hidden elements do not end a clickable wait"""
+        hidden, disabled = element(displayed=False), element(enabled=False)
+        self.driver.find_elements.return_value = [hidden, disabled]
+        self.assertEqual(self.finder.wait_for_any(self.driver, ["//button"]), ("//button", hidden))
+        self.assertEqual(self.finder.wait_for_any(self.driver, ["//button"], clickable=True), (None, None))
+
+    def test_stats(self):
+        """Test lookups and timed blocks are counted, with hits counted separately"""
+        self.driver.find_elements.side_effect = [[element()], [], []]
+        with self.finder.timed('card'):
+            self.finder.probe(self.driver, "//a")
+            self.finder.probe(self.driver, "//b")
+        self.finder.wait_for_any(self.driver, ["//c"], timeout=0)
+        stats = self.finder.stats
+        self.assertEqual(stats['probe']['count'], 2)
+        self.assertEqual(stats['probe_hit']['count'], 1)
+        self.assertEqual(stats['card']['count'], 1)
+        self.assertEqual(stats['wait']['count'], 1)
+        self.assertNotIn('wait_hit', stats)
+
+
+@unittest.skipUnless(LXML_AVAILABLE, "lxml not installed")
+class TestPerCardCost(unittest.TestCase):
+    """Test the simulated cost of reading cards element by element"""
+
+    def test_misses_cost_nothing_without_implicit_wait(self):
+        """Test only the implicit wait differs, and it dominates the per-card cost"""
+        from benchmark_job_cards import synthetic_page, element_path_cost
+        page = synthetic_page(5)
+        cards, requests, waiting = element_path_cost(page, latency=0.005, implicit_wait=10)
+        _, same_requests, probing = element_path_cost(page, latency=0.005, implicit_wait=0)
+        self.assertEqual(cards, 5)
+        self.assertEqual(requests, same_requests)
+        self.assertAlmostEqual(probing, requests * 0.005)
+        self.assertGreater(waiting / cards, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
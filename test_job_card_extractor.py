@@ -0,0 +1,60 @@
+"""
+Unit tests for single-call job card extraction
+"""
+import unittest
+import os
+import shutil
+import subprocess
+import tempfile
+from unittest.mock import Mock
+
+from selenium.common.exceptions import WebDriverException
+
+from job_card_extractor import (JobCardExtractor, EXTRACT_CARDS_SCRIPT, BASIC_CARD_SELECTORS,
+                                BASIC_FIELD_SELECTORS, BASIC_MIN_LENGTHS, LOCATION_KEYWORDS, SALARY_KEYWORDS)
+
+
+class TestJobCardExtractor(unittest.TestCase):
+    """Test the Python side of the card extraction script"""
+
+    def setUp(self):
+        """Set up an extractor with the basic selectors"""
+        self.extractor = JobCardExtractor(BASIC_CARD_SELECTORS, BASIC_FIELD_SELECTORS, BASIC_MIN_LENGTHS)
+
+    def test_single_script_call(self):
+        """Test all cards come from one execute_script call with the selector lists"""
+        driver = Mock()
+        cards = [{'element': Mock(), 'title': "Data Analyst", 'company': "Acme", 'location': "",
+                  'salary': "", 'url': "", 'easy_apply': True}]
+        driver.execute_script.return_value = {'selector': BASIC_CARD_SELECTORS[0], 'cards': cards}
+
+        selector, result = self.extractor.extract(driver, 10)
+
+        self.assertEqual(selector, BASIC_CARD_SELECTORS[0])
+        self.assertEqual(result, cards)
+        driver.execute_script.assert_called_once_with(
+            EXTRACT_CARDS_SCRIPT, BASIC_CARD_SELECTORS, BASIC_FIELD_SELECTORS, BASIC_MIN_LENGTHS,
+            LOCATION_KEYWORDS, SALARY_KEYWORDS, 10)
+
+    def test_unusable_result_raises(self):
+        """Test a missing or malformed result is reported so callers can fall back"""
+        driver = Mock()
+        for result in (None, {'selector': None}, Mock()):
+            driver.execute_script.return_value = result
+            with self.assertRaises(WebDriverException):
+                self.extractor.extract(driver, 10)
+
+    @unittest.skipUnless(shutil.which('node'), "node not installed")
+    def test_script_is_valid_javascript(self):
+        """Test the script parses as a function body, as execute_script runs it"""
+        with tempfile.NamedTemporaryFile('w', suffix='.js', delete=False) as f:
+            f.write(f"(function() {{{EXTRACT_CARDS_SCRIPT}}});\n")
+        try:
+            result = subprocess.run(['node', '--check', f.name], capture_output=True, text=True)
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
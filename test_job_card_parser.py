@@ -0,0 +1,92 @@
+"""
+Unit tests for offline job card parsing
+Parses saved search result pages from test_data/
+"""
+import unittest
+import os
+import pickle
+from unittest.mock import Mock
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
+
+from job_card_extractor import (JobCardParser, LXML_AVAILABLE, BASIC_CARD_SELECTORS, BASIC_FIELD_SELECTORS,
+                                BASIC_MIN_LENGTHS, ENHANCED_CARD_SELECTORS)
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_data')
+
+
+def _fixture(name: str) -> str:
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+@unittest.skipUnless(LXML_AVAILABLE, "lxml not installed")
+class TestJobCardParser(unittest.TestCase):
+    """Test JobCardParser against saved pages"""
+
+    def setUp(self):
+        """Set up a parser with the enhanced selectors"""
+        self.parser = JobCardParser()
+
+    def test_signed_in_results_page(self):
+        """Test every field of the signed-in card layout"""
+        selector, cards = self.parser.parse(_fixture('job_search_results.html'))
+        self.assertEqual(selector, ENHANCED_CARD_SELECTORS[0])
+        self.assertEqual(len(cards), 3)
+        self.assertEqual(cards[0], {
+            'index': 0,
+            'title': "Senior Data Analyst",
+            'company': "Acme Analytics",
+            'location': "San Francisco, CA (Remote)",
+            'salary': "$120K/yr - $150K/yr",
+            'url': "https://www.linkedin.com/jobs/view/3901234567/?eBP=abc&refId=xyz&trackingId=t1",
+            'easy_apply': True
+        })
+        self.assertEqual((cards[1]['company'], cards[1]['salary'], cards[1]['easy_apply']),
+                         ("Globex Corporation", "", False))
+        self.assertEqual((cards[2]['company'], cards[2]['salary']), ("", "Salary: $95,000"))
+
+    def test_guest_results_page_falls_back(self):
+        """Test later card and field selectors are used when earlier ones miss"""
+        selector, cards = self.parser.parse(_fixture('job_search_results_guest.html'))
+        self.assertEqual(selector, "//div[contains(@class, 'base-card')]")
+        self.assertEqual([(card['title'], card['company']) for card in cards],
+                         [("Data Analyst", "Initech"), ("Reporting Analyst", "Umbrella Health")])
+        self.assertTrue(cards[0]['url'].startswith("https://www.linkedin.com/jobs/view/data-analyst"))
+
+    def test_basic_selectors_and_limits(self):
+        """Test the basic automation's selectors, minimum lengths and card limit"""
+        parser = JobCardParser(BASIC_CARD_SELECTORS, BASIC_FIELD_SELECTORS, BASIC_MIN_LENGTHS)
+        _, cards = parser.parse(_fixture('job_search_results.html'), max_cards=2)
+        self.assertEqual([card['title'] for card in cards], ["Senior Data Analyst", "Business Intelligence Analyst"])
+        self.assertEqual(cards[0]['location'], "")
+        self.assertEqual(parser.parse(_fixture('job_search_results_guest.html')), (None, []))
+        self.assertEqual(parser.parse(""), (None, []))
+
+    def test_extract_pairs_cards_with_live_elements(self):
+        """Test extract parses the page source and attaches the matching elements"""
+        driver = Mock()
+        driver.page_source = _fixture('job_search_results.html')
+        elements = [Mock(), Mock(), Mock()]
+        driver.find_elements.return_value = elements
+
+        selector, cards = self.parser.extract(driver, 2)
+
+        driver.find_elements.assert_called_once_with(By.XPATH, selector)
+        self.assertEqual([card['element'] for card in cards], elements[:2])
+
+        driver.find_elements.return_value = elements[:1]
+        with self.assertRaises(WebDriverException):
+            self.parser.extract(driver, 2)
+
+    def test_pickles_for_worker_processes(self):
+        """Test a parser survives pickling with its selectors recompiled"""
+        parser = pickle.loads(pickle.dumps(self.parser))
+        page = _fixture('job_search_results.html')
+        self.assertEqual(parser.parse(page), self.parser.parse(page))
+
+
+if __name__ == '__main__':
+    unittest.main()
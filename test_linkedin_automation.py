@@ -1,12 +1,14 @@
 """
 Unit tests for LinkedIn automation functionality
 """
+import os
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
 from linkedin_automation import LinkedInAutomation
+from job_card_extractor import EXTRACT_CARDS_SCRIPT, LXML_AVAILABLE
 from config import LinkedInConfig, JobApplicationConfig
 
 
@@ -68,7 +70,7 @@ class TestLinkedInAutomation:
         mock_service.assert_called_once_with("/path/to/chromedriver")
         mock_chrome.assert_called_once()
         mock_driver_instance.execute_script.assert_called()
-        mock_driver_instance.implicitly_wait.assert_called_with(10)
+        mock_driver_instance.implicitly_wait.assert_called_with(0)
         mock_driver_instance.set_page_load_timeout.assert_called_with(30)
     
     @patch('linkedin_automation.webdriver.Chrome')
@@ -222,10 +224,10 @@ class TestLinkedInAutomation:
         mock_title_element.text = "Data Analyst"
         mock_company_element.text = "Test Company"
         
-        mock_job_element.find_element.side_effect = [
-            mock_title_element,  # Title element
-            mock_company_element,  # Company element
-            Mock()  # Easy Apply button (exists)
+        mock_job_element.find_elements.side_effect = [
+            [mock_title_element],  # Title element
+            [mock_company_element],  # Company element
+            [Mock()]  # Easy Apply button (exists)
         ]
         
         mock_driver.find_elements.return_value = [mock_job_element]
@@ -236,6 +238,56 @@ class TestLinkedInAutomation:
         assert result[0]['title'] == "Data Analyst"
         assert result[0]['company'] == "Test Company"
         assert result[0]['has_easy_apply'] is True
+        # Field lookups are probes, so the finder times them
+        assert automation.finder.stats['probe_hit']['count'] == 3
+    
+    @patch('linkedin_automation.time.sleep')
+    def test_get_job_listings_script_mode(self, mock_sleep, automation):
+        """Test job cards are read with one extraction script call"""
+        mock_driver = Mock()
+        automation.driver = mock_driver
+        card_element = Mock()
+        
+        def execute_script(script, *args):
+            if script == EXTRACT_CARDS_SCRIPT:
+                return {'selector': "//div[contains(@class, 'job-card-container')]", 'cards': [
+                    {'element': card_element, 'title': "Data Analyst", 'company': "Test Company",
+                     'location': "", 'salary': "", 'url': "", 'easy_apply': True},
+                    {'element': Mock(), 'title': "", 'company': "Other Company",
+                     'location': "", 'salary': "", 'url': "", 'easy_apply': False}
+                ]}
+            return None
+        mock_driver.execute_script.side_effect = execute_script
+        
+        result = automation.get_job_listings(max_jobs=2)
+        
+        assert len(result) == 1
+        assert result[0]['title'] == "Data Analyst"
+        assert result[0]['has_easy_apply'] is True
+        assert result[0]['element'] is card_element
+        card_element.find_element.assert_not_called()
+        mock_driver.find_elements.assert_not_called()
+    
+    @pytest.mark.skipif(not LXML_AVAILABLE, reason="lxml not installed")
+    @patch('linkedin_automation.time.sleep')
+    def test_get_job_listings_html_mode(self, mock_sleep, automation):
+        """Test job cards are parsed from the page source and paired with live elements"""
+        with open(os.path.join(os.path.dirname(__file__), 'test_data', 'job_search_results.html')) as f:
+            page_source = f.read()
+        mock_driver = Mock()
+        mock_driver.page_source = page_source
+        card_elements = [Mock(), Mock(), Mock()]
+        mock_driver.find_elements.return_value = card_elements
+        automation.driver = mock_driver
+        automation.card_extraction_mode = 'html'
+        
+        result = automation.get_job_listings(max_jobs=3)
+        
+        # The third card has no company
+        assert [job['title'] for job in result] == ["Senior Data Analyst", "Business Intelligence Analyst"]
+        assert [job['element'] for job in result] == card_elements[:2]
+        assert mock_driver.find_elements.call_count == 1
+        card_elements[0].find_element.assert_not_called()
     
     def test_apply_to_job_without_driver(self, automation):
         """Test applying to job without driver"""
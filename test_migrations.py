@@ -0,0 +1,191 @@
+"""
+Unit tests for the schema migration engine
+Covers version tracking, dry runs, batched backfills and upgrades of existing databases
+"""
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+from migrations import Migration, MigrationRunner
+from database import DatabaseManager, MIGRATIONS
+
+
+def _create_items(cursor):
+    cursor.execute("CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, value INTEGER)")
+
+
+def _add_doubled_column(cursor):
+    cursor.execute("PRAGMA table_info(items)")
+    if not any(column[1] == 'doubled' for column in cursor.fetchall()):
+        cursor.execute("ALTER TABLE items ADD COLUMN doubled INTEGER")
+
+
+def _backfill_doubled(cursor, batch_size):
+    while True:
+        cursor.execute("SELECT id FROM items WHERE doubled IS NULL ORDER BY id LIMIT ?", (batch_size,))
+        ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return
+        cursor.executemany("UPDATE items SET doubled = value * 2 WHERE id = ?", [(i,) for i in ids])
+        yield len(ids)
+
+
+class TestMigrationRunner(unittest.TestCase):
+    """Test the generic migration runner"""
+
+    def setUp(self):
+        """Set up an in-memory database"""
+        self.conn = sqlite3.connect(':memory:')
+        self.migrations = [
+            Migration(1, "Create items", _create_items),
+            Migration(2, "Add doubled column", _add_doubled_column, backfill=_backfill_doubled),
+        ]
+
+    def tearDown(self):
+        """Close the database"""
+        self.conn.close()
+
+    def test_rejects_unordered_versions(self):
+        """Test migration lists must be strictly ascending"""
+        with self.assertRaises(ValueError):
+            MigrationRunner(self.conn, list(reversed(self.migrations)))
+        with self.assertRaises(ValueError):
+            MigrationRunner(self.conn, [self.migrations[0], self.migrations[0]])
+
+    def test_applies_in_order_and_records_version(self):
+        """Test pending migrations run and user_version advances"""
+        runner = MigrationRunner(self.conn, self.migrations)
+        report = runner.run()
+
+        self.assertEqual([entry['version'] for entry in report], [1, 2])
+        self.assertTrue(all(entry['applied'] for entry in report))
+        self.assertEqual(runner.current_version, 2)
+        self.assertEqual(runner.run(), [])
+
+    def test_dry_run_changes_nothing(self):
+        """Test a dry run only reports the plan"""
+        runner = MigrationRunner(self.conn, self.migrations)
+        report = runner.run(dry_run=True)
+
+        self.assertEqual([entry['version'] for entry in report], [1, 2])
+        self.assertFalse(any(entry['applied'] for entry in report))
+        self.assertTrue(report[1]['has_backfill'])
+        self.assertEqual(runner.current_version, 0)
+        self.assertIsNone(self.conn.execute("SELECT name FROM sqlite_master WHERE name = 'items'").fetchone())
+
+    def test_backfill_runs_in_committed_chunks(self):
+        """Test backfills are chunked and committed between chunks"""
+        MigrationRunner(self.conn, self.migrations[:1]).run()
+        self.conn.executemany("INSERT INTO items (value) VALUES (?)", [(i,) for i in range(25)])
+        self.conn.commit()
+
+        commits = []
+        self.conn.set_trace_callback(lambda sql: sql == 'COMMIT' and commits.append(sql))
+        report = MigrationRunner(self.conn, self.migrations, batch_size=10).run()
+        self.conn.set_trace_callback(None)
+
+        self.assertEqual(report[0]['rows_backfilled'], 25)
+        self.assertGreaterEqual(len(commits), 3)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM items WHERE doubled = value * 2").fetchone()[0], 25)
+
+    def test_failed_migration_keeps_version(self):
+        """Test a failing required migration stops the run at the last good version"""
+        def broken(cursor):
+            cursor.execute("CREATE TABLE broken (")
+
+        runner = MigrationRunner(self.conn, self.migrations[:1] + [Migration(2, "Broken", broken)])
+        with self.assertRaises(sqlite3.Error):
+            runner.run()
+        self.assertEqual(runner.current_version, 1)
+
+    def test_optional_migration_failure_is_skipped(self):
+        """Test optional migrations log and move on"""
+        def unsupported(cursor):
+            cursor.execute("CREATE VIRTUAL TABLE t USING no_such_module (a)")
+
+        migrations = [self.migrations[0], Migration(2, "Optional", unsupported, optional=True),
+                      Migration(3, "After optional", _add_doubled_column)]
+        runner = MigrationRunner(self.conn, migrations)
+        report = runner.run()
+
+        self.assertEqual([entry['applied'] for entry in report], [True, False, True])
+        self.assertEqual(runner.current_version, 3)
+
+
+class TestDatabaseMigrations(unittest.TestCase):
+    """Test DatabaseManager schema versioning"""
+
+    def setUp(self):
+        """Set up a temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+
+    def tearDown(self):
+        """Clean up"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _create_unversioned_database(self, rows):
+        """Write a job_applications table as created before schema versioning"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE job_applications (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, job_title TEXT NOT NULL,
+                    company TEXT NOT NULL, job_url TEXT,
+                    application_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    status TEXT DEFAULT 'applied', easy_apply BOOLEAN, notes TEXT,
+                    salary_range TEXT, location TEXT, job_description TEXT,
+                    response_received BOOLEAN, response_date TIMESTAMP,
+                    interview_scheduled BOOLEAN, interview_date TIMESTAMP,
+                    created_at TIMESTAMP, updated_at TIMESTAMP
+                )
+            """)
+            start = datetime.now() - timedelta(days=100)
+            conn.executemany(
+                "INSERT INTO job_applications (job_title, company, application_date, job_description) "
+                "VALUES (?, ?, ?, ?)",
+                [(f"Job {i}", "Acme", start + timedelta(days=i % 100), "python role") for i in range(rows)]
+            )
+        conn.close()
+
+    def test_new_database_is_at_latest_version(self):
+        """Test a fresh database ends up at the newest schema version"""
+        db_manager = DatabaseManager(self.db_path)
+        self.assertEqual(db_manager.schema_version, MIGRATIONS[-1].version)
+        db_manager.close()
+
+    def test_dry_run_of_unmigrated_database(self):
+        """Test a manager opened without auto_migrate lists pending steps and changes nothing"""
+        self._create_unversioned_database(10)
+
+        db_manager = DatabaseManager(self.db_path, auto_migrate=False)
+        report = db_manager.migrate(dry_run=True)
+        self.assertEqual([entry['version'] for entry in report], [m.version for m in MIGRATIONS])
+        self.assertFalse(any(entry['applied'] for entry in report))
+        self.assertEqual(db_manager.schema_version, 0)
+        self.assertFalse(db_manager.fts_enabled)
+
+        db_manager.migrate()
+        self.assertEqual(db_manager.schema_version, MIGRATIONS[-1].version)
+        self.assertEqual(db_manager.get_analytics(200)['total_applications'], 10)
+        self.assertEqual(db_manager.migrate(dry_run=True), [])
+        db_manager.close()
+
+    def test_upgrade_unversioned_database(self):
+        """Test a database created before versioning is upgraded in batches"""
+        self._create_unversioned_database(250)
+
+        db_manager = DatabaseManager(self.db_path)
+        self.assertEqual(db_manager.schema_version, MIGRATIONS[-1].version)
+        self.assertEqual(db_manager.get_analytics(200)['total_applications'], 250)
+        self.assertEqual(db_manager.get_analytics(200)['top_companies'], [('Acme', 250)])
+        self.assertEqual(len(db_manager.has_applied(
+            [app.job_key for app in db_manager.iter_job_applications()])), 250)
+        self.assertEqual(len(db_manager.search_applications("python", limit=500)), 250)
+        db_manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Unit tests for near-duplicate posting detection
+Covers MinHash signatures, their storage form and the LSH index
+"""
+import unittest
+import random
+from unittest.mock import patch
+
+import near_duplicates
+from near_duplicates import MinHasher, NearDuplicateIndex, estimated_similarity, optimal_bands
+
+
+def _description(rng, words=150):
+    vocabulary = [f"word{i}" for i in range(2000)]
+    return ' '.join(rng.choice(vocabulary) for _ in range(words))
+
+
+class TestMinHasher(unittest.TestCase):
+    """Test MinHash signatures"""
+
+    def setUp(self):
+        """Set up a hasher and sample descriptions"""
+        self.hasher = MinHasher()
+        self.rng = random.Random(7)
+
+    def test_similarity_tracks_overlap(self):
+        """Test near-identical texts agree on most slots and unrelated ones on few"""
+        base = _description(self.rng)
+        edited = base.replace(base.split()[10], "changed", 1)
+        unrelated = _description(self.rng)
+        signature = self.hasher.signature(base)
+
+        self.assertGreater(estimated_similarity(signature, self.hasher.signature(edited)), 0.85)
+        self.assertLess(estimated_similarity(signature, self.hasher.signature(unrelated)), 0.1)
+        self.assertEqual(self.hasher.signature(base.upper()), signature)
+
+    def test_empty_text_has_no_signature(self):
+        """Test texts without words produce no signature"""
+        self.assertIsNone(self.hasher.signature(""))
+        self.assertIsNone(self.hasher.signature_bytes(" ... "))
+        self.assertIsNotNone(self.hasher.signature("python"))
+
+    def test_bytes_round_trip(self):
+        """Test the storage form is compact and lossless"""
+        signature = self.hasher.signature(_description(self.rng))
+        data = self.hasher.to_bytes(signature)
+        self.assertEqual(len(data), 4 * self.hasher.num_perm)
+        self.assertEqual(self.hasher.from_bytes(data), signature)
+
+    @unittest.skipUnless(near_duplicates.NUMPY_AVAILABLE, "numpy not installed")
+    def test_pure_python_matches_numpy(self):
+        """Test stored signatures do not depend on whether numpy was available"""
+        text = _description(self.rng)
+        expected = self.hasher.signature(text)
+        with patch('near_duplicates.NUMPY_AVAILABLE', False):
+            self.assertEqual(MinHasher().signature(text), expected)
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """Test the LSH index"""
+
+    def setUp(self):
+        """Index a corpus of unrelated descriptions"""
+        self.hasher = MinHasher()
+        rng = random.Random(11)
+        self.descriptions = [_description(rng) for _ in range(300)]
+        self.index = NearDuplicateIndex(threshold=0.9)
+        for i, description in enumerate(self.descriptions):
+            self.index.add(f"job-{i}", self.hasher.signature(description))
+
+    def test_band_layout_fits_signature(self):
+        """Test the chosen bands and rows use at most num_perm slots"""
+        bands, rows = optimal_bands(0.9, 128)
+        self.assertLessEqual(bands * rows, 128)
+        self.assertEqual((self.index.bands, self.index.rows), (bands, rows))
+
+    def test_finds_near_duplicate(self):
+        """Test a lightly edited repost is matched to its original"""
+        repost = self.descriptions[42] + " apply through our recruiting agency"
+        key, similarity = self.index.find_duplicate(self.hasher.signature(repost))
+        self.assertEqual(key, "job-42")
+        self.assertGreaterEqual(similarity, 0.9)
+
+    def test_same_job_seen_again_is_not_its_own_duplicate(self):
+        """Test excluding the job's own key skips its earlier entry but still finds other reposts"""
+        signature = self.hasher.signature(self.descriptions[42])
+        self.assertIsNone(self.index.find_duplicate(signature, exclude="job-42"))
+
+        self.index.add("repost-42", self.hasher.signature(self.descriptions[42] + " apply today"))
+        self.assertEqual(self.index.find_duplicate(signature, exclude="job-42")[0], "repost-42")
+
+    def test_ignores_unrelated_postings(self):
+        """Test distinct descriptions are not reported"""
+        fresh = _description(random.Random(99))
+        self.assertEqual(self.index.query(self.hasher.signature(fresh)), [])
+
+    def test_readding_key_is_noop(self):
+        """Test keys are indexed once"""
+        self.index.add("job-0", self.hasher.signature(self.descriptions[1]))
+        self.assertEqual(len(self.index), 300)
+        self.assertIn("job-0", self.index)
+
+    def test_rejects_invalid_threshold(self):
+        """Test thresholds must be a similarity"""
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(threshold=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
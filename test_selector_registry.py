@@ -0,0 +1,125 @@
+"""
+Unit tests for the selector registry
+Covers hit-rate ordering, recording searches and persisting statistics
+"""
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import Mock
+
+from selector_registry import SelectorRegistry
+from database import DatabaseManager
+
+
+SELECTORS = ["//h3[@class='title']", "//a[@class='title']", "//span[@class='title']"]
+
+
+class TestSelectorRegistry(unittest.TestCase):
+    """Test selector ordering and statistics"""
+
+    def test_unseen_selectors_keep_given_order(self):
+        """Test a lookup with no history is tried in the caller's order"""
+        self.assertEqual(SelectorRegistry().ordered('card.title', SELECTORS), SELECTORS)
+
+    def test_matching_selector_moves_first(self):
+        """Test the selector that keeps matching is tried first and misses sink"""
+        registry = SelectorRegistry()
+        probe = lambda selector: "Engineer" if selector == SELECTORS[2] else ""
+        self.assertEqual(registry.first_match('card.title', SELECTORS, probe), "Engineer")
+        self.assertEqual(registry.ordered('card.title', SELECTORS), [SELECTORS[2], SELECTORS[0], SELECTORS[1]])
+
+        calls = []
+        registry.first_match('card.title', SELECTORS, lambda selector: calls.append(selector) or probe(selector))
+        self.assertEqual(calls, [SELECTORS[2]])
+
+    def test_recent_hits_outweigh_old_ones(self):
+        """Test a selector that stops matching is overtaken after a few misses"""
+        registry = SelectorRegistry()
+        for _ in range(20):
+            registry.record_result('card.title', SELECTORS, SELECTORS[0])
+        for _ in range(5):
+            registry.record_result('card.title', registry.ordered('card.title', SELECTORS), SELECTORS[1])
+        self.assertEqual(registry.ordered('card.title', SELECTORS)[0], SELECTORS[1])
+        stats = registry.statistics('card.title')['card.title']
+        self.assertEqual(stats[SELECTORS[0]]['hits'], 20)
+        # Once overtaken it is no longer tried, so it stops collecting misses
+        self.assertLess(stats[SELECTORS[0]]['attempts'], 25)
+
+    def test_last_resort_never_promoted(self):
+        """Test last resort selectors stay at the end however often they match"""
+        registry = SelectorRegistry()
+        for _ in range(10):
+            registry.record_result('form.next_button', SELECTORS, SELECTORS[2])
+        self.assertEqual(registry.ordered('form.next_button', SELECTORS, last_resort=SELECTORS[2:]), SELECTORS)
+
+    def test_no_match_records_every_miss(self):
+        """Test a search where nothing matches counts a miss for every selector"""
+        registry = SelectorRegistry()
+        self.assertIsNone(registry.first_match('card.title', SELECTORS, lambda selector: None))
+        stats = registry.statistics()['card.title']
+        self.assertEqual([stats[selector]['attempts'] for selector in SELECTORS], [1, 1, 1])
+        self.assertTrue(all(entry['hits'] == 0 for entry in stats.values()))
+
+    def test_saves_every_n_attempts(self):
+        """Test changed statistics are written to the store in batches"""
+        store = Mock()
+        store.load_selector_statistics.return_value = []
+        registry = SelectorRegistry(store=store, save_every=3)
+        registry.record_result('card.title', SELECTORS, SELECTORS[1])
+        store.save_selector_statistics.assert_not_called()
+        registry.record('card.company', SELECTORS[0], True)
+        self.assertEqual(len(store.save_selector_statistics.call_args[0][0]), 3)
+        registry.save()
+        self.assertEqual(store.save_selector_statistics.call_count, 1)
+
+
+class TestSelectorStatisticsStorage(unittest.TestCase):
+    """Test selector statistics survive a restart"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_order_restored_from_database(self):
+        """Test a new registry starts with the order a previous run learned"""
+        registry = SelectorRegistry(store=self.db_manager)
+        for _ in range(3):
+            registry.record_result('card.title', registry.ordered('card.title', SELECTORS), SELECTORS[1])
+        registry.save()
+        registry.record('card.title', SELECTORS[1], True)
+        registry.save()
+
+        reopened = DatabaseManager(self.db_path)
+        self.addCleanup(reopened.close)
+        restored = SelectorRegistry(store=reopened)
+        self.assertEqual(restored.ordered('card.title', SELECTORS)[0], SELECTORS[1])
+        self.assertEqual(restored.statistics(), registry.statistics())
+
+
+    def test_save_goes_through_write_behind(self):
+        """Test saved statistics are queued behind other writes and stored once the queue is flushed"""
+        writer = self.db_manager.start_write_behind()
+        started, release = threading.Event(), threading.Event()
+        writer.submit(lambda cursor: (started.set(), release.wait(5)))
+        started.wait(5)
+
+        registry = SelectorRegistry(store=self.db_manager)
+        registry.record('card.title', SELECTORS[0], True)
+        registry.save()
+        self.assertEqual(self.db_manager.load_selector_statistics(), [])
+
+        release.set()
+        writer.flush()
+        self.assertEqual(len(self.db_manager.load_selector_statistics()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Unit tests for the skill taxonomy
+Covers loading, aliases, the compiled cache and hot reloading
+"""
+import unittest
+import os
+import json
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from skill_taxonomy import (SkillTaxonomy, TaxonomySource, TaxonomyError, DEFAULT_TAXONOMY_PATH,
+                            YAML_AVAILABLE)
+from ai_job_matcher import AIJobMatcher
+
+
+TAXONOMY = {
+    'skills': {'cloud': ['kubernetes', 'aws'], 'programming': ['python', 'go']},
+    'industries': {'finance': ['fintech']},
+    'company_sizes': {'startup': ['startup']},
+    'education': ['degree'],
+    'remote': ['remote'],
+    'aliases': {'kubernetes': ['k8s'], 'go': ['golang']}
+}
+
+
+class TestSkillTaxonomy(unittest.TestCase):
+    """Test taxonomy loading and compilation"""
+
+    def setUp(self):
+        """Set up a temporary taxonomy file"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'taxonomy.json')
+        self._write(TAXONOMY)
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, data):
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+
+    def test_aliases_report_canonical_terms(self):
+        """Test aliases are found in the same pass and reported as their canonical term"""
+        taxonomy = SkillTaxonomy.load(self.path)
+        counts = taxonomy.keyword_automaton.count("Golang services on K8s and kubernetes, remote")
+        self.assertEqual(counts[('skills', 'cloud', 'kubernetes')], 2)
+        self.assertEqual(counts[('skills', 'programming', 'go')], 1)
+        self.assertEqual(counts[('remote', None, 'remote')], 1)
+
+    def test_matcher_uses_aliases(self):
+        """Test a matcher built on the taxonomy extracts aliased skills"""
+        matcher = AIJobMatcher(taxonomy=SkillTaxonomy.load(self.path))
+        requirements = matcher.extract_job_requirements("We deploy to k8s on AWS.")
+        self.assertEqual(requirements['skills']['cloud'], ['kubernetes', 'aws'])
+
+    def test_compiled_taxonomy_is_cached_by_file_hash(self):
+        """Test an unchanged file is loaded from the cache without recompiling"""
+        first = SkillTaxonomy.load(self.path)
+        self.assertEqual(len(os.listdir(os.path.join(self.temp_dir, '.taxonomy_cache'))), 1)
+        with patch.object(SkillTaxonomy, 'from_dict') as from_dict:
+            second = SkillTaxonomy.load(self.path)
+        from_dict.assert_not_called()
+        self.assertEqual(second.fingerprint, first.fingerprint)
+
+    def test_cache_is_json_matching_a_fresh_compile(self):
+        """Test the cache file is plain JSON and a cached load finds what a fresh compile does"""
+        fresh = SkillTaxonomy.load(self.path)
+        cache_dir = os.path.join(self.temp_dir, '.taxonomy_cache')
+        cache_file = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+        self.assertTrue(cache_file.endswith('.json'))
+        with open(cache_file) as f:
+            self.assertEqual(json.load(f)['fingerprint'], fresh.fingerprint)
+
+        cached = SkillTaxonomy.load(self.path)
+        text = "Golang on K8s with AWS, remote friendly fintech startup; degree optional"
+        self.assertEqual(cached.keyword_automaton.count(text), fresh.keyword_automaton.count(text))
+
+    def test_tampered_cache_is_ignored(self):
+        """Test a cache file that does not match its fingerprint is recompiled instead of used"""
+        SkillTaxonomy.load(self.path)
+        cache_dir = os.path.join(self.temp_dir, '.taxonomy_cache')
+        cache_file = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+        with open(cache_file) as f:
+            data = json.load(f)
+        data['taxonomy']['skills']['cloud'].append('terraform')
+        with open(cache_file, 'w') as f:
+            json.dump(data, f)
+
+        taxonomy = SkillTaxonomy.load(self.path)
+        self.assertNotIn('terraform', taxonomy.skill_keywords['cloud'])
+        self.assertEqual(taxonomy.keyword_automaton.count("kubernetes")[('skills', 'cloud', 'kubernetes')], 1)
+
+    def test_invalid_aliases_rejected(self):
+        """Test aliases must point at known terms and not shadow or contain them"""
+        for aliases in ({'terraform': ['tf']}, {'kubernetes': ['aws']}, {'go': ['go lang']}):
+            with self.assertRaises(TaxonomyError):
+                SkillTaxonomy.from_dict(dict(TAXONOMY, aliases=aliases))
+        with self.assertRaises(TaxonomyError):
+            SkillTaxonomy.from_dict(dict(TAXONOMY, education='degree'))
+
+    @unittest.skipUnless(YAML_AVAILABLE, "PyYAML not installed")
+    def test_yaml_file(self):
+        """Test YAML files load like JSON ones"""
+        import yaml
+        yaml_path = os.path.join(self.temp_dir, 'taxonomy.yaml')
+        with open(yaml_path, 'w') as f:
+            yaml.safe_dump(TAXONOMY, f)
+        self.assertEqual(SkillTaxonomy.load(yaml_path).fingerprint, SkillTaxonomy.load(self.path).fingerprint)
+
+    def test_default_taxonomy_loads(self):
+        """Test the bundled taxonomy file is valid"""
+        taxonomy = SkillTaxonomy.load(DEFAULT_TAXONOMY_PATH, cache_dir=self.temp_dir)
+        self.assertIn('python', taxonomy.skill_keywords['programming'])
+        self.assertIn('k8s', taxonomy.aliases['kubernetes'])
+
+    def test_default_taxonomy_matches_inflected_stems(self):
+        """Test plural and longer forms of stem keywords still match as whole words"""
+        matcher = AIJobMatcher(taxonomy=SkillTaxonomy.load(DEFAULT_TAXONOMY_PATH, cache_dir=self.temp_dir))
+        requirements = matcher.extract_job_requirements(
+            "Bachelors or Masters degrees welcome. Work remotely for a healthcare technology startups fund.")
+        self.assertEqual(requirements['education_required'], ['bachelor', 'master', 'degree'])
+        self.assertTrue(requirements['is_remote'])
+        self.assertEqual(requirements['industries'], ['technology', 'healthcare'])
+        self.assertEqual(requirements['company_sizes'], ['startup'])
+
+        # Stems still do not match inside unrelated words
+        requirements = matcher.extract_job_requirements("Itemised remotes of mastery at the technician desk")
+        self.assertEqual(requirements['education_required'], [])
+        self.assertFalse(requirements['is_remote'])
+        self.assertEqual(requirements['industries'], [])
+
+
+class TestTaxonomySource(unittest.TestCase):
+    """Test reloading a taxonomy file on change"""
+
+    def setUp(self):
+        """Set up a temporary taxonomy file and a source that checks on every access"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'taxonomy.json')
+        self._write(TAXONOMY)
+        self.source = TaxonomySource(self.path, check_interval=0)
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, data):
+        with open(self.path, 'w') as f:
+            f.write(data if isinstance(data, str) else json.dumps(data))
+        # Make the change visible even on filesystems with coarse timestamps
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def test_reloads_changed_file(self):
+        """Test matchers see an edited taxonomy without being rebuilt"""
+        matcher = AIJobMatcher(taxonomy=self.source)
+        description = "Terraform and AWS"
+        self.assertEqual(matcher.extract_job_requirements(description)['skills']['cloud'], ['aws'])
+        namespace = matcher.cache_namespace
+
+        updated = json.loads(json.dumps(TAXONOMY))
+        updated['skills']['cloud'].append('terraform')
+        self._write(updated)
+
+        self.assertEqual(matcher.extract_job_requirements(description)['skills']['cloud'], ['aws', 'terraform'])
+        self.assertNotEqual(matcher.cache_namespace, namespace)
+        self.assertEqual(self.source.reloads, 1)
+
+    def test_broken_file_keeps_previous_taxonomy(self):
+        """Test a file that fails to load leaves the last good taxonomy in use"""
+        fingerprint = self.source.current().fingerprint
+        self._write("{not json")
+        with self.assertLogs('skill_taxonomy', level='ERROR'):
+            self.assertEqual(self.source.current().fingerprint, fingerprint)
+
+    def test_unchanged_file_not_reloaded(self):
+        """Test checks of an unchanged file do not reload it"""
+        taxonomy = self.source.current()
+        self.assertFalse(self.source.reload_if_changed())
+        self.assertIs(self.source.current(), taxonomy)
+
+    def test_shared_source_per_path(self):
+        """Test matchers share one source per taxonomy file"""
+        self.assertIs(TaxonomySource.shared(self.path), TaxonomySource.shared(self.path))
+        first, second = AIJobMatcher(taxonomy=self.path), AIJobMatcher(taxonomy=self.path)
+        self.assertIs(first.taxonomy, second.taxonomy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Unit tests for the wait policy
+Covers pacing, network idle detection and settling after actions
+"""
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import subprocess
+from unittest.mock import Mock, patch
+
+from element_finder import ElementFinder
+from wait_policy import WaitPolicy, Pacing, NetworkMonitor, DOM_SETTLED_SCRIPT
+
+
+def network_event(method, request_id):
+    return {'message': json.dumps({'message': {'method': method, 'params': {'requestId': request_id}}})}
+
+
+class TestPacing(unittest.TestCase):
+    """Test human-like pauses"""
+
+    @patch('wait_policy.time.sleep')
+    def test_time_spent_waiting_counts_towards_pause(self, mock_sleep):
+        """Test only the rest of the pause is slept, and nothing once the page took longer"""
+        pacing = Pacing(1.0, 1.0)
+        self.assertAlmostEqual(pacing.pause('click', elapsed=0.25), 0.75)
+        mock_sleep.assert_called_once_with(0.75)
+        self.assertEqual(pacing.pause('click', elapsed=3.0), 0.0)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    def test_action_weights(self):
+        """Test pauses scale with the kind of action and zero delays turn pacing off"""
+        pacing = Pacing(1.0, 1.0)
+        self.assertEqual(pacing.delay('navigate'), 2.0)
+        self.assertEqual(pacing.delay('type'), 0.5)
+        self.assertEqual(Pacing(0, 0).delay('navigate'), 0.0)
+
+
+class TestNetworkMonitor(unittest.TestCase):
+    """Test tracking requests from the performance log"""
+
+    def test_tracks_requests_in_flight(self):
+        """Test requests are open from requestWillBeSent until they finish or fail"""
+        driver = Mock()
+        driver.get_log.return_value = [
+            network_event('Network.requestWillBeSent', '1'),
+            network_event('Network.requestWillBeSent', '2'),
+            network_event('Network.responseReceived', '1'),
+            network_event('Network.loadingFinished', '1'),
+            {'message': 'not json'}
+        ]
+        monitor = NetworkMonitor()
+        self.assertTrue(monitor.poll(driver))
+        self.assertEqual(monitor.inflight, {'2'})
+        driver.get_log.assert_called_once_with('performance')
+
+        driver.get_log.return_value = [network_event('Network.loadingFailed', '2')]
+        monitor.poll(driver)
+        self.assertEqual(monitor.inflight, set())
+
+    @patch('wait_policy.time.monotonic')
+    def test_requests_that_never_finish_expire(self, mock_monotonic):
+        """Test a request whose end is never logged stops counting once older than max_age"""
+        driver = Mock()
+        driver.get_log.return_value = [network_event('Network.requestWillBeSent', '1')]
+        mock_monotonic.return_value = 100.0
+        monitor = NetworkMonitor()
+        monitor.poll(driver)
+        driver.get_log.return_value = [network_event('Network.requestWillBeSent', '2')]
+        mock_monotonic.return_value = 108.0
+        monitor.poll(driver)
+
+        mock_monotonic.return_value = 111.0
+        self.assertEqual(monitor.expire(10.0), 1)
+        self.assertEqual(monitor.inflight, {'2'})
+
+    def test_unavailable_log(self):
+        """Test a driver without performance logging is detected once"""
+        driver = Mock()
+        driver.get_log.side_effect = Exception("log type 'performance' not found")
+        monitor = NetworkMonitor()
+        self.assertFalse(monitor.poll(driver))
+        self.assertFalse(monitor.poll(driver))
+        self.assertEqual(driver.get_log.call_count, 1)
+
+
+class TestWaitPolicy(unittest.TestCase):
+    """Test waiting for the page after actions"""
+
+    def setUp(self):
+        """Set up a policy with short quiet periods and no pacing"""
+        self.finder = ElementFinder(timeout=1, poll_interval=0.01)
+        self.policy = WaitPolicy(self.finder, Pacing(0, 0), timeout=1, quiet_period=0.05, max_inflight=0)
+        self.driver = Mock()
+        self.driver.get_log.return_value = []
+        self.driver.execute_async_script.return_value = True
+
+    def test_settles_when_page_is_quiet(self):
+        """Test a quiet page settles after the quiet period, not the timeout"""
+        self.assertTrue(self.policy.settle(self.driver, 'click'))
+        stats = self.finder.stats
+        self.assertLess(stats['settle_click']['total_seconds'], 0.5)
+        self.assertEqual(stats['settle_click_hit']['count'], 1)
+
+    def test_waits_for_open_requests(self):
+        """Test the network is not idle while a request is open"""
+        self.driver.get_log.return_value = [network_event('Network.requestWillBeSent', '1')]
+        self.assertFalse(self.policy.settle(self.driver, 'scroll', dom=False, timeout=0.2))
+
+        # The log returns each entry once
+        entries = iter([[network_event('Network.loadingFinished', '1')]])
+        self.driver.get_log.side_effect = lambda log_type: next(entries, [])
+        self.assertTrue(self.policy.settle(self.driver, 'scroll', dom=False))
+
+    def test_stale_request_does_not_block_later_settles(self):
+        """Test a request left open by an earlier page is dropped after the settle timeout"""
+        self.driver.get_log.return_value = [network_event('Network.requestWillBeSent', '1')]
+        self.assertFalse(self.policy.settle(self.driver, 'scroll', dom=False))
+
+        self.driver.get_log.return_value = []
+        self.assertTrue(self.policy.settle(self.driver, 'scroll', dom=False))
+        self.assertLess(self.finder.stats['settle_scroll']['total_seconds'], 1.5)
+
+    def test_resource_timing_fallback(self):
+        """Test pages without the performance log count completed resources instead"""
+        self.driver.get_log.side_effect = Exception("no performance log")
+        counts = iter([3, 5, 6])
+        self.driver.execute_script.side_effect = lambda script: next(counts, 6)
+        self.assertTrue(self.policy.settle(self.driver, 'scroll', dom=False))
+        self.assertGreaterEqual(self.driver.execute_script.call_count, 4)
+
+    def test_waits_for_target_element(self):
+        """Test settling waits for one of the selectors to be present"""
+        self.driver.find_elements.side_effect = [[], [], [Mock()]]
+        self.assertTrue(self.policy.settle(self.driver, 'click', selectors=["//div[@role='dialog']"]))
+        self.assertEqual(self.driver.find_elements.call_count, 3)
+
+    def test_unobservable_page_does_not_block(self):
+        """Test a page that reports nothing falls through to pacing instead of waiting out the timeout"""
+        driver = Mock()
+        with patch.object(self.policy.pacing, 'pause') as pause:
+            self.assertFalse(self.policy.settle(driver, 'navigate', timeout=5))
+        self.assertLess(self.finder.stats['settle_navigate']['total_seconds'], 1)
+        pause.assert_called_once()
+        self.assertEqual(pause.call_args[0][0], 'navigate')
+
+    @unittest.skipUnless(shutil.which('node'), "node not installed")
+    def test_dom_settled_script(self):
+        """Test the script resolves once mutations stop, and false when they never do"""
+        harness = """
+        let callback = null;
+        globalThis.document = {readyState: 'complete'};
+        globalThis.MutationObserver = class {
+            constructor(cb) { callback = cb; }
+            observe() {}
+            disconnect() { callback = null; }
+        };
+        const settle = function() { %s };
+        const started = Date.now();
+        const mutate = setInterval(() => callback && callback([]), 10);
+        setTimeout(() => clearInterval(mutate), 60);
+        settle(50, 1000, (settled) => {
+            const elapsed = Date.now() - started;
+            const busy = setInterval(() => callback && callback([]), 10);
+            settle(50, 100, (never) => {
+                clearInterval(busy);
+                console.log(JSON.stringify({settled, elapsed, never}));
+            });
+        });
+        """ % DOM_SETTLED_SCRIPT
+        with tempfile.NamedTemporaryFile('w', suffix='.js', delete=False) as f:
+            f.write(harness)
+        try:
+            result = subprocess.run(['node', f.name], capture_output=True, text=True, timeout=10)
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        outcome = json.loads(result.stdout)
+        self.assertTrue(outcome['settled'])
+        self.assertGreaterEqual(outcome['elapsed'], 100)
+        self.assertFalse(outcome['never'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+"""
+Vectorised job scoring for large job corpora
+Scores many jobs against one or more profiles with NumPy/SciPy array operations
+"""
+import logging
+from typing import List, Dict, Any, Optional, Iterable, Sequence, Union
+
+from ai_job_matcher import AIJobMatcher, UserProfile, CompiledProfile
+
+# Optional dependencies for vectorised scoring
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+# Same weights as AIJobMatcher.calculate_match_score
+SCORE_WEIGHTS = {
+    'skills': 0.4,
+    'experience': 0.25,
+    'education': 0.15,
+    'location': 0.1,
+    'industry': 0.1
+}
+
+
+class JobCorpus:
+    """Feature matrices for a fixed set of jobs, built by VectorizedScorer.build_corpus.
+
+    ``skills`` has one column per (category, skill) pair of the matcher's
+    vocabulary (sparse CSR when SciPy is installed), ``education`` one column
+    per education keyword. Location and industry checks are free-text
+    substring tests in calculate_match_score, so the lower-cased location
+    text and description of each job are kept and matched per profile term,
+    with each term's result memoised.
+    """
+
+    def __init__(self, skills, education, min_experience, is_remote,
+                 location_texts: List[str], descriptions: List[str], job_ids: Optional[List[Any]] = None):
+        self.skills = skills
+        self.education = education
+        self.min_experience = min_experience
+        self.is_remote = is_remote
+        self.location_texts = location_texts
+        self.descriptions = descriptions
+        self.job_ids = job_ids if job_ids is not None else list(range(len(descriptions)))
+        # Required (category, skill) pairs per job
+        self.skill_totals = np.asarray(skills.sum(axis=1)).ravel()
+        self.has_education = np.asarray(education.sum(axis=1)).ravel() > 0
+        self._term_masks: Dict[tuple, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.descriptions)
+
+    def contains(self, field: str, term: str):
+        """Boolean mask of jobs whose location text or description contains term"""
+        key = (field, term)
+        mask = self._term_masks.get(key)
+        if mask is None:
+            texts = self.location_texts if field == 'location' else self.descriptions
+            mask = np.fromiter((term in text for text in texts), dtype=bool, count=len(texts))
+            self._term_masks[key] = mask
+        return mask
+
+
+class VectorizedScorer:
+    """Computes calculate_match_score for whole corpora at once.
+
+    Results equal ``AIJobMatcher.calculate_match_score`` in the 'weighted'
+    scoring mode to within floating point rounding (``SCORE_TOLERANCE``);
+    reasons and missing skills are not produced, use match_job for a single
+    job's explanation.
+    """
+
+    SCORE_TOLERANCE = 0.01
+
+    def __init__(self, matcher: Optional[AIJobMatcher] = None):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for vectorised scoring (pip install numpy)")
+
+        self.logger = logging.getLogger(__name__)
+        self.matcher = matcher or AIJobMatcher()
+        if self.matcher.scoring_mode != 'weighted':
+            raise ValueError("Vectorised scoring only supports the 'weighted' scoring mode")
+        self.skill_columns = [(category, skill)
+                              for category, skills in self.matcher.skill_keywords.items()
+                              for skill in skills]
+        self.skill_index = {pair: column for column, pair in enumerate(self.skill_columns)}
+        self.education_columns = list(self.matcher.education_keywords)
+        self.education_index = {keyword: column for column, keyword in enumerate(self.education_columns)}
+
+    def build_corpus(self, descriptions: Iterable[str], job_ids: Optional[Sequence[Any]] = None) -> JobCorpus:
+        """Parse descriptions and build their feature matrices"""
+        descriptions = list(descriptions)
+        requirements = (self.matcher.extract_job_requirements(description) for description in descriptions)
+        return self.build_corpus_from_requirements(requirements, job_ids)
+
+    def build_corpus_from_requirements(self, requirements: Iterable[Dict[str, Any]],
+                                       job_ids: Optional[Sequence[Any]] = None) -> JobCorpus:
+        """Build feature matrices from extract_job_requirements results"""
+        skill_rows, skill_cols = [], []
+        education_rows, education_cols = [], []
+        min_experience, is_remote, location_texts, descriptions = [], [], [], []
+
+        for row, job in enumerate(requirements):
+            for category, skills in job['skills'].items():
+                for skill in skills:
+                    column = self.skill_index.get((category, skill))
+                    if column is not None:
+                        skill_rows.append(row)
+                        skill_cols.append(column)
+            for keyword in job['education_required']:
+                column = self.education_index.get(keyword)
+                if column is not None:
+                    education_rows.append(row)
+                    education_cols.append(column)
+            min_experience.append(job['min_experience'])
+            is_remote.append(job['is_remote'])
+            location_texts.append(' '.join(job['locations']).lower())
+            descriptions.append(job['full_text_lower'])
+
+        n_jobs = len(descriptions)
+        return JobCorpus(
+            skills=self._matrix(skill_rows, skill_cols, (n_jobs, len(self.skill_columns))),
+            education=self._matrix(education_rows, education_cols, (n_jobs, len(self.education_columns))),
+            min_experience=np.asarray(min_experience, dtype=np.float64),
+            is_remote=np.asarray(is_remote, dtype=bool),
+            location_texts=location_texts,
+            descriptions=descriptions,
+            job_ids=list(job_ids) if job_ids is not None else None
+        )
+
+    @staticmethod
+    def _matrix(rows: List[int], cols: List[int], shape: tuple):
+        data = np.ones(len(rows), dtype=np.float64)
+        if SCIPY_AVAILABLE:
+            return sparse.csr_matrix((data, (rows, cols)), shape=shape)
+        matrix = np.zeros(shape, dtype=np.float64)
+        matrix[rows, cols] = 1.0
+        return matrix
+
+    def _profile_vectors(self, profiles: List[CompiledProfile]):
+        skills = np.zeros((len(self.skill_columns), len(profiles)), dtype=np.float64)
+        education = np.zeros((len(self.education_columns), len(profiles)), dtype=np.float64)
+        for j, profile in enumerate(profiles):
+            for column, (_, skill) in enumerate(self.skill_columns):
+                if skill in profile.skills:
+                    skills[column, j] = 1.0
+            for column, keyword in enumerate(self.education_columns):
+                if keyword in profile.education_text:
+                    education[column, j] = 1.0
+        return skills, education
+
+    def score(self, corpus: JobCorpus,
+              profiles: Union[UserProfile, CompiledProfile, Sequence[Union[UserProfile, CompiledProfile]]]):
+        """Weighted match scores for every job in corpus.
+
+        A single profile gives an array of shape (jobs,); a list of profiles
+        gives (jobs, profiles).
+        """
+        single = isinstance(profiles, (UserProfile, CompiledProfile))
+        compiled = [CompiledProfile.from_profile(profile) for profile in ([profiles] if single else profiles)]
+        n_jobs, n_profiles = len(corpus), len(compiled)
+        if n_jobs == 0 or n_profiles == 0:
+            empty = np.zeros((n_jobs, n_profiles))
+            return empty[:, 0] if single and n_profiles else empty
+
+        skill_vectors, education_vectors = self._profile_vectors(compiled)
+
+        # Skills: matched required (category, skill) pairs over required pairs
+        matched = np.asarray(corpus.skills @ skill_vectors)
+        totals = corpus.skill_totals[:, None]
+        skill_scores = np.divide(matched * 100, totals, out=np.zeros_like(matched), where=totals > 0)
+
+        # Experience: full marks when met, otherwise proportional
+        years = np.array([profile.experience_years for profile in compiled], dtype=np.float64)[None, :]
+        min_years = corpus.min_experience[:, None]
+        experience_scores = np.where(
+            years >= min_years, 100.0,
+            np.divide(years * 100, min_years, out=np.full((n_jobs, n_profiles), 100.0), where=min_years > 0)
+        )
+
+        # Education: 100 with no requirement, else 100 if any requirement met, else 50
+        education_met = np.asarray(corpus.education @ education_vectors) > 0
+        education_scores = np.where(~corpus.has_education[:, None] | education_met, 100.0, 50.0)
+
+        # Location and industry: per-profile free-text checks
+        location_scores = np.empty((n_jobs, n_profiles))
+        industry_scores = np.empty((n_jobs, n_profiles))
+        for j, profile in enumerate(compiled):
+            location_scores[:, j] = 75.0
+            if profile.remote_preference:
+                location_scores[corpus.is_remote, j] = 100.0
+            if profile.locations:
+                location_match = self._any_contains(corpus, 'location', profile.locations)
+                location_scores[~corpus.is_remote, j] = np.where(location_match, 100.0, 50.0)[~corpus.is_remote]
+
+            if profile.industries:
+                industry_match = self._any_contains(corpus, 'description', profile.industries)
+                industry_scores[:, j] = np.where(industry_match, 100.0, 50.0)
+            else:
+                industry_scores[:, j] = 75.0
+
+        scores = np.round(
+            skill_scores * SCORE_WEIGHTS['skills'] +
+            experience_scores * SCORE_WEIGHTS['experience'] +
+            education_scores * SCORE_WEIGHTS['education'] +
+            location_scores * SCORE_WEIGHTS['location'] +
+            industry_scores * SCORE_WEIGHTS['industry'],
+            2
+        )
+        return scores[:, 0] if single else scores
+
+    @staticmethod
+    def _any_contains(corpus: JobCorpus, field: str, terms: Sequence[str]):
+        mask = np.zeros(len(corpus), dtype=bool)
+        for term in terms:
+            mask |= corpus.contains(field, term)
+        return mask
+
+    def rank(self, corpus: JobCorpus, profile: Union[UserProfile, CompiledProfile],
+             limit: Optional[int] = None) -> List[tuple]:
+        """(job_id, score) pairs for one profile, best first"""
+        scores = self.score(corpus, profile)
+        order = np.argsort(-scores, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return [(corpus.job_ids[i], float(scores[i])) for i in order]
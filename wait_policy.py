@@ -0,0 +1,222 @@
+"""
+Waiting for the page after browser actions
+Waits end on concrete conditions (target element present, network idle, DOM settled); human-like pacing is a separate minimum
+"""
+import json
+import time
+import random
+import logging
+from typing import Dict, Optional, Sequence
+
+from element_finder import ElementFinder
+
+# Relative length of the human-like pause after each kind of action; the
+# configured delay range is scaled by these
+ACTION_PACING_WEIGHTS = {
+    'navigate': 2.0,
+    'submit': 2.0,
+    'click': 1.0,
+    'scroll': 0.5,
+    'type': 0.5,
+}
+# Seconds without DOM mutations or network activity before the page counts as settled
+DEFAULT_QUIET_PERIOD = 0.5
+# Requests that may stay open while the network counts as idle (long polling, beacons)
+DEFAULT_MAX_INFLIGHT = 2
+
+# Resolves true once the document has loaded and quietMs pass without a
+# mutation, or false when timeoutMs runs out first
+DOM_SETTLED_SCRIPT = """
+const quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+let quietTimer = null;
+const finish = (settled) => {
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(deadline);
+    done(settled);
+};
+const arm = () => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => document.readyState === 'complete' ? finish(true) : arm(), quietMs);
+};
+const observer = new MutationObserver(arm);
+const deadline = setTimeout(() => finish(false), timeoutMs);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+arm();
+"""
+
+# Completed resource fetches, for pages where the performance log is not available
+RESOURCE_COUNT_SCRIPT = "return performance.getEntriesByType('resource').length;"
+
+
+class Pacing:
+    """Human-like minimum pause after each browser action.
+
+    The pause for an action is a uniform draw from ``[min_delay,
+    max_delay]`` scaled by its ACTION_PACING_WEIGHTS entry. Time already
+    spent waiting for the page counts towards it, so pacing only adds delay
+    when the page was faster than a person would be. ``max_delay=0`` turns
+    pacing off.
+    """
+
+    def __init__(self, min_delay: float = 0.5, max_delay: float = 1.5,
+                 weights: Optional[Dict[str, float]] = None, rng: Optional[random.Random] = None):
+        self.min_delay = max(0.0, min(min_delay, max_delay))
+        self.max_delay = max(0.0, max_delay)
+        self.weights = dict(ACTION_PACING_WEIGHTS, **(weights or {}))
+        self.rng = rng or random.Random()
+
+    def delay(self, action: str) -> float:
+        """A pause length for action"""
+        return self.rng.uniform(self.min_delay, self.max_delay) * self.weights.get(action, 1.0)
+
+    def pause(self, action: str, elapsed: float = 0.0) -> float:
+        """Sleep for what is left of action's pause after elapsed seconds; returns the seconds slept"""
+        remaining = self.delay(action) - elapsed
+        if remaining <= 0:
+            return 0.0
+        time.sleep(remaining)
+        return remaining
+
+
+class NetworkMonitor:
+    """Requests in flight, from the Network events in Chrome's performance log.
+
+    Requires a driver started with the ``goog:loggingPrefs`` capability
+    ``{'performance': 'ALL'}``; ``available`` turns False when the log cannot
+    be read. Requests whose end is never logged (streams, cancelled loads)
+    are dropped by ``expire`` so they cannot hold every later wait open.
+    """
+
+    def __init__(self):
+        self.inflight = set()
+        # requestId -> monotonic time its start was seen
+        self._started: Dict[str, float] = {}
+        self.last_activity = time.monotonic()
+        self.available = True
+
+    def poll(self, driver) -> bool:
+        """Apply log entries recorded since the last poll; False if the log is unavailable"""
+        if not self.available:
+            return False
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            entries = None
+        if not isinstance(entries, list):
+            self.available = False
+            return False
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+                method, request_id = message['method'], message['params'].get('requestId')
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+            now = time.monotonic()
+            if method == 'Network.requestWillBeSent':
+                self.inflight.add(request_id)
+                self._started.setdefault(request_id, now)
+            elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+                self.inflight.discard(request_id)
+                self._started.pop(request_id, None)
+            else:
+                continue
+            self.last_activity = now
+        return True
+
+    def expire(self, max_age: float) -> int:
+        """Stop tracking requests open for longer than max_age seconds; returns how many were dropped"""
+        cutoff = time.monotonic() - max_age
+        stale = [request_id for request_id, started in self._started.items() if started < cutoff]
+        for request_id in stale:
+            self.inflight.discard(request_id)
+            del self._started[request_id]
+        return len(stale)
+
+
+class WaitPolicy:
+    """How long to wait after a browser action before carrying on.
+
+    ``settle()`` waits until the page is ready, whichever of these is asked
+    for: one of ``selectors`` is present, the network is idle (no more than
+    ``max_inflight`` requests open for ``quiet_period``, read from the CDP
+    Network events in the performance log, or from the Resource Timing API
+    when that log is unavailable), and the DOM has had no mutations for
+    ``quiet_period``. It gives up after ``timeout`` and carries on
+    regardless. It then applies the ``pacing`` pause for the action, so a run
+    moves as fast as the page allows but never faster than the pacing
+    policy.
+
+    Each settle is timed through ``finder`` as 'settle_<action>', with
+    'settle_<action>_hit' counting those whose conditions were met.
+    """
+
+    def __init__(self, finder: ElementFinder, pacing: Optional[Pacing] = None, timeout: float = 10.0,
+                 quiet_period: float = DEFAULT_QUIET_PERIOD, max_inflight: int = DEFAULT_MAX_INFLIGHT):
+        self.finder = finder
+        self.pacing = pacing or Pacing()
+        self.timeout = timeout
+        self.quiet_period = quiet_period
+        self.max_inflight = max_inflight
+        self.network = NetworkMonitor()
+        self.logger = logging.getLogger(__name__)
+
+    def settle(self, driver, action: str, selectors: Sequence[str] = (), network: bool = True,
+               dom: bool = True, timeout: Optional[float] = None) -> bool:
+        """Wait for the page after action, then pace; True if every condition was met in time"""
+        start = time.monotonic()
+        deadline = start + (self.timeout if timeout is None else timeout)
+        with self.finder.timed(f'settle_{action}') as timing:
+            ready = True
+            if selectors:
+                found, _ = self.finder.wait_for_any(driver, selectors, timeout=max(0.0, deadline - time.monotonic()))
+                ready = found is not None
+            if network:
+                ready = self.network_idle(driver, start, deadline) and ready
+            if dom:
+                ready = self.dom_settled(driver, deadline) and ready
+            timing['hit'] = ready
+        self.pacing.pause(action, time.monotonic() - start)
+        return ready
+
+    def pace(self, action: str):
+        """Only the human-like pause for action, for steps with nothing on the page to wait for"""
+        self.pacing.pause(action)
+
+    def network_idle(self, driver, since: float, deadline: float) -> bool:
+        """Poll until the network has been quiet for quiet_period after since; False on timeout"""
+        # Requests an action triggers may start a moment after it, so quiet time counts from since
+        self.network.last_activity = max(self.network.last_activity, since)
+        resource_count, resource_changed = None, since
+        while True:
+            now = time.monotonic()
+            if self.network.poll(driver):
+                # A request open longer than a whole settle is not one this page is waiting on
+                self.network.expire(self.timeout)
+                if (len(self.network.inflight) <= self.max_inflight
+                        and now - self.network.last_activity >= self.quiet_period):
+                    return True
+            else:
+                try:
+                    count = driver.execute_script(RESOURCE_COUNT_SCRIPT)
+                except Exception as e:
+                    self.logger.debug(f"Cannot observe network activity: {e}")
+                    return False
+                if not isinstance(count, int):
+                    return False
+                if count != resource_count:
+                    resource_count, resource_changed = count, now
+                elif now - resource_changed >= self.quiet_period:
+                    return True
+            if now >= deadline:
+                return False
+            time.sleep(min(self.finder.poll_interval, max(0.0, deadline - now)))
+
+    def dom_settled(self, driver, deadline: float) -> bool:
+        """Wait in the page until the DOM stops changing; False on timeout or if it cannot be observed"""
+        timeout_ms = int(max(0.0, deadline - time.monotonic()) * 1000)
+        try:
+            return driver.execute_async_script(DOM_SETTLED_SCRIPT, int(self.quiet_period * 1000), timeout_ms) is True
+        except Exception as e:
+            self.logger.debug(f"Cannot observe DOM mutations: {e}")
+            return False